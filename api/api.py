@@ -1,15 +1,22 @@
 # api.py
 import logging
 import os
-import tempfile
 import base64
 import shutil
 from config import ConfigManager
 from core.text_translator import TextTranslator
 from services.file_handler import FileTranslationHandler
+from services.temp_storage import TempStorageManager
+from api.daemon_client import DaemonClient
 
 logger = logging.getLogger("API")
 
+MAX_UPLOAD_CHUNK = 4 * 1024 * 1024 # Decoded bytes accepted per append_upload_chunk call
+
+def file_dialog_filter(description: str, extensions) -> str:
+    """pywebview file_types entry: 'Description (*.a;*.b)' (space-separated patterns are rejected)"""
+    return f"{description} ({';'.join(f'*{ext}' for ext in extensions)})"
+
 class TranslationAPI:
     def __init__(self):
         self.config_manager = ConfigManager()
@@ -22,7 +29,9 @@ class TranslationAPI:
             
         self.translator = TextTranslator()
         self.file_handler = FileTranslationHandler(self.translator.translation_service)
-        self.temp_files = {}
+        self.temp_storage = TempStorageManager()
+        self.daemon = DaemonClient.from_env() # Optional shared translation daemon (cli.py serve)
+        self.uploads = {} # upload_id -> {'path', 'size', 'received'}
         logger.info("Translation API initialized")
         
         import atexit
@@ -35,6 +44,11 @@ class TranslationAPI:
     def translate_text(self, text: str, source_lang: str, target_lang: str):
         """Called from JavaScript to perform translation"""
         logger.info(f"Starting translation: {source_lang} -> {target_lang}")
+        if self.daemon:
+            try:
+                return self.daemon.translate(text, source_lang, target_lang)
+            except Exception as e:
+                logger.warning(f"Daemon unavailable, translating locally: {e}")
         try:
             translated = self.translator.translation_service.translate(
                 text=text,
@@ -48,22 +62,26 @@ class TranslationAPI:
             return str(e)
 
     def translate_file(self, file_path: str, source_lang: str, target_lang: str) -> dict:
-        """Handle file translation"""
+        """Handle file translation. The source is read in place; outputs go to the temp session."""
         try:
             if not os.path.exists(file_path):
                 raise FileNotFoundError("File not found")
+            self.temp_storage.touch(file_path)
+            output_dir = self.temp_storage.new_output_dir()
             
             # Using the improved handler with chunking
             result = self.file_handler.process_uploaded_file(
                 file_path=file_path,
                 source_lang=source_lang,
-                target_lang=target_lang
+                target_lang=target_lang,
+                output_dir=output_dir
             )
+            self.temp_storage.release_output_dir(output_dir)
             
             if result['status'] == 'success':
-                file_id = str(len(self.temp_files))
-                self.temp_files[file_id] = result['translated_file']
-                result['file_id'] = file_id
+                result['file_id'] = self.temp_storage.register(result['translated_file'])
+                if result['metadata'].get('sidecar_file'):
+                    self.temp_storage.register(result['metadata']['sidecar_file'])
             
             return result
         except Exception as e:
@@ -73,7 +91,7 @@ class TranslationAPI:
     def download_file(self, file_id: str) -> dict:
         """Handle file download requests"""
         try:
-            file_path = self.temp_files.get(file_id)
+            file_path = self.temp_storage.get_path(file_id)
             if not file_path or not os.path.exists(file_path):
                 raise FileNotFoundError("File no longer available")
             
@@ -87,29 +105,14 @@ class TranslationAPI:
             return {'status': 'error', 'message': str(e)}
 
     def cleanup_temp_files(self):
-        """Clean up temporary files and their parent directories if they are empty"""
-        temp_root = tempfile.gettempdir().lower()
-        for file_path in self.temp_files.values():
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    dir_path = os.path.normpath(os.path.dirname(file_path))
-                    # Only try to remove if it's a subdirectory of temp_root
-                    if os.path.exists(dir_path) and dir_path.lower() != temp_root:
-                        try:
-                            if not os.listdir(dir_path):
-                                os.rmdir(dir_path)
-                        except (OSError, PermissionError):
-                            pass 
-            except Exception as e:
-                logger.warning(f"Could not delete temp file {file_path}: {str(e)}")
-        self.temp_files.clear()
+        """Delete every upload and output of this session"""
+        for upload_id in list(self.uploads):
+            self.abort_upload(upload_id)
+        self.temp_storage.cleanup()
 
     def save_temp_file(self, file_data) -> str:
         """Save uploaded file to temp location and return path"""
         try:
-            temp_dir = tempfile.mkdtemp()
-            
             # Handle dictionary from JS
             if isinstance(file_data, dict):
                 file_name = file_data.get('name', 'uploaded_file')
@@ -122,10 +125,7 @@ class TranslationAPI:
                 if isinstance(file_content, str) and ',' in file_content:
                     file_content = file_content.split(',')[1]
                     
-                file_path = os.path.join(temp_dir, file_name)
-                
-                with open(file_path, 'wb') as f:
-                    f.write(base64.b64decode(file_content))
+                file_path = self.temp_storage.store_bytes(file_name, base64.b64decode(file_content))
                     
             else:
                 raise ValueError(f"Unsupported file data format: {type(file_data)}")
@@ -135,6 +135,71 @@ class TranslationAPI:
             logger.error(f"Failed to save temp file: {str(e)}")
             raise
 
+    def select_file(self) -> dict:
+        """Native open dialog: hands the real path to the backend, nothing is copied"""
+        try:
+            import webview
+            selection = webview.windows[0].create_file_dialog(
+                webview.OPEN_DIALOG,
+                directory=os.path.expanduser("~"),
+                file_types=(file_dialog_filter("Supported files", self.file_handler.supported_formats),)
+            )
+            if not selection:
+                return {'status': 'cancelled'}
+
+            file_path = selection[0] if isinstance(selection, (tuple, list)) else selection
+            return {
+                'status': 'success',
+                'path': file_path,
+                'name': os.path.basename(file_path),
+                'size': os.path.getsize(file_path)
+            }
+        except Exception as e:
+            logger.error(f"File selection failed: {str(e)}")
+            return {'status': 'error', 'message': str(e)}
+
+    def begin_upload(self, file_name: str, file_size: int) -> str:
+        """Start a chunked upload (used for drag & drop, where no native path exists)"""
+        upload_id, file_path = self.temp_storage.new_upload(file_name)
+        self.uploads[upload_id] = {'path': file_path, 'size': int(file_size), 'received': 0}
+        logger.debug(f"Upload {upload_id} started for {file_name} ({file_size} bytes)")
+        return upload_id
+
+    def append_upload_chunk(self, upload_id: str, chunk: str) -> int:
+        """Append one base64 chunk to disk; returns the number of bytes received so far"""
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            raise ValueError(f"Unknown upload: {upload_id}")
+
+        data = base64.b64decode(chunk)
+        if len(data) > MAX_UPLOAD_CHUNK:
+            raise ValueError(f"Upload chunk too large ({len(data)} bytes)")
+        if upload['received'] + len(data) > upload['size']:
+            raise ValueError("Upload exceeds the announced file size")
+
+        with open(upload['path'], 'ab') as f:
+            f.write(data)
+        upload['received'] += len(data)
+        return upload['received']
+
+    def finish_upload(self, upload_id: str) -> str:
+        """Complete a chunked upload and return the path of the file on disk"""
+        upload = self.uploads.pop(upload_id, None)
+        if upload is None:
+            raise ValueError(f"Unknown upload: {upload_id}")
+        if upload['received'] != upload['size']:
+            self.temp_storage.discard_upload(upload_id)
+            raise ValueError(f"Upload incomplete: {upload['received']} of {upload['size']} bytes")
+        # Identical content uploaded earlier comes back as the existing path
+        return self.temp_storage.commit_upload(upload_id)
+
+    def abort_upload(self, upload_id: str) -> bool:
+        """Drop a partial upload"""
+        upload = self.uploads.pop(upload_id, None)
+        if upload:
+            self.temp_storage.discard_upload(upload_id)
+        return upload is not None
+
     def open_file_dialog(self):
         """Open file dialog and return selected file path"""
         try:
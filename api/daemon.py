@@ -0,0 +1,303 @@
+# daemon.py
+import os
+import json
+import time
+import hmac
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from api.headless import HeadlessTranslator
+from api.daemon_client import token_file_path, write_token
+
+logger = logging.getLogger("Daemon")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY = 16 * 1024 * 1024
+MAX_FINISHED_JOBS = 1000
+
+STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+               404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+               415: "Unsupported Media Type", 500: "Internal Server Error"}
+
+
+class MemoryCache:
+    """Small LRU in front of the SQLite text cache, shared by every client."""
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value: str):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class TranslationDaemon:
+    """
+    Long-running local service holding one warm HeadlessTranslator: the API
+    client and its connection pool, the caches and a single rate limiter shared
+    by every tool that talks to it. Requests are handled on an asyncio loop;
+    blocking translation work runs in thread pools.
+
+    Every request needs `Authorization: Bearer <token>`, the random token the
+    daemon writes to a 0600 file at startup (see daemon_client.token_file_path).
+    Requests with an Origin header (browsers) or a non-JSON body are refused,
+    so web pages cannot reach it with "simple" cross-origin requests.
+
+    Endpoints (JSON in, JSON out):
+        GET  /health          uptime, cache and quota counters
+        POST /translate       {text, source_lang, target_lang}
+        POST /batch           {texts, source_lang, target_lang}
+        POST /jobs            {file_path, source_lang, target_lang, output_format?, preserve_format?}
+        GET  /jobs[/<job_id>] file job status and result
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+                 translator: Optional[HeadlessTranslator] = None, max_workers: int = 8, max_file_jobs: int = 2,
+                 token_file: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.token_file = token_file or token_file_path()
+        self.token = write_token(self.token_file)
+        self.translator = translator or HeadlessTranslator()
+        self.cache = MemoryCache()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate")
+        self.job_executor = ThreadPoolExecutor(max_workers=max_file_jobs, thread_name_prefix="file-job")
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self.started = time.time()
+
+        # Pay the startup cost once, here, instead of in every client
+        self.translator.service
+        self.translator.file_handler
+
+    # --- Server ---
+
+    async def serve(self):
+        if self.socket_path:
+            if not hasattr(asyncio, 'start_unix_server'):
+                raise RuntimeError("Unix sockets are not supported on this platform")
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+            logger.info(f"Translation daemon listening on unix:{self.socket_path}")
+        else:
+            server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            logger.info(f"Translation daemon listening on http://{self.host}:{self.port}")
+        logger.info(f"Access token written to {self.token_file}")
+
+        async with server:
+            await server.serve_forever()
+
+    def run(self):
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            logger.info("Translation daemon stopped")
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.job_executor.shutdown(wait=False, cancel_futures=True)
+            if self.socket_path and os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            if os.path.exists(self.token_file):
+                os.remove(self.token_file)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.1 with keep-alive, enough for JSON requests from local clients."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY:
+                    await self._send(writer, 413, {'status': 'error', 'message': "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                rejection = self._check_request(headers, body)
+                if rejection:
+                    status, payload = rejection
+                else:
+                    status, payload = await self._dispatch(method, target.split('?', 1)[0], body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _check_request(self, headers: Dict[str, str], body: bytes) -> Optional[Tuple[int, Dict]]:
+        """(status, payload) to refuse the request with, or None when it may proceed."""
+        if 'origin' in headers:
+            return 403, {'status': 'error', 'message': "Browser requests are not accepted"}
+        scheme, _, token = headers.get('authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip().encode(), self.token.encode()):
+            return 401, {'status': 'error', 'message': f"Missing or wrong token (see {self.token_file})"}
+        if body and headers.get('content-type', '').split(';')[0].strip().lower() != 'application/json':
+            return 415, {'status': 'error', 'message': "Body must be application/json"}
+        return None
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        try:
+            data = json.loads(body) if body else {}
+            if path == '/health' and method == 'GET':
+                return 200, self.health()
+            if path == '/translate' and method == 'POST':
+                translation = await self.translate(data['text'], data.get('source_lang', 'auto'),
+                                                   data.get('target_lang', 'msa'))
+                return 200, {'status': 'success', 'translation': translation}
+            if path == '/batch' and method == 'POST':
+                translations = await self.translate_batch(data['texts'], data.get('source_lang', 'auto'),
+                                                          data.get('target_lang', 'msa'))
+                return 200, {'status': 'success', 'translations': translations}
+            if path == '/jobs' and method == 'POST':
+                return 202, self.submit_job(data)
+            if path == '/jobs' and method == 'GET':
+                return 200, {'status': 'success', 'jobs': list(self.jobs.values())}
+            if path.startswith('/jobs/') and method == 'GET':
+                job = self.jobs.get(path[len('/jobs/'):])
+                if job is None:
+                    return 404, {'status': 'error', 'message': "Unknown job"}
+                return 200, job
+            if path in ('/health', '/translate', '/batch', '/jobs') or path.startswith('/jobs/'):
+                return 405, {'status': 'error', 'message': f"{method} not allowed on {path}"}
+            return 404, {'status': 'error', 'message': f"Unknown endpoint {path}"}
+        except (KeyError, TypeError, json.JSONDecodeError) as e:
+            return 400, {'status': 'error', 'message': f"Bad request: {e}"}
+        except Exception as e:
+            logger.error(f"{method} {path} failed: {e}")
+            return 500, {'status': 'error', 'message': str(e)}
+
+    # --- Work ---
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Memory cache -> identical in-flight request -> HeadlessTranslator (DB cache, API)."""
+        key = (text, source_lang, target_lang)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self.translator.translate_text, text, source_lang, target_lang)
+        self._inflight[key] = future
+        try:
+            translation = await future
+        finally:
+            self._inflight.pop(key, None)
+        self.cache.put(key, translation)
+        return translation
+
+    async def translate_batch(self, texts, source_lang: str, target_lang: str):
+        """Serves what it can from memory; the rest goes out as batched requests."""
+        results = [self.cache.get((text, source_lang, target_lang)) for text in texts]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            loop = asyncio.get_running_loop()
+            translations = await loop.run_in_executor(
+                self.executor, self.translator.translate_texts,
+                [texts[i] for i in missing], source_lang, target_lang
+            )
+            for i, translation in zip(missing, translations):
+                results[i] = translation
+                self.cache.put((texts[i], source_lang, target_lang), translation)
+        return results
+
+    def submit_job(self, data: Dict) -> Dict:
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'status': 'queued',
+            'file_path': data['file_path'],
+            'submitted': time.time(),
+            'result': None
+        }
+        self.jobs[job['job_id']] = job
+        self._trim_jobs()
+
+        def run():
+            job['status'] = 'running'
+            try:
+                result = self.translator.translate_file(
+                    data['file_path'], data.get('source_lang', 'auto'), data.get('target_lang', 'msa'),
+                    output_format=data.get('output_format'), preserve_format=data.get('preserve_format', True)
+                )
+            except Exception as e:
+                logger.error(f"File job {job['job_id']} failed: {e}")
+                result = {'status': 'error', 'message': str(e)}
+            job['result'] = result
+            job['status'] = result['status']
+            job['finished'] = time.time()
+
+        self.job_executor.submit(run)
+        return {'status': 'accepted', 'job_id': job['job_id']}
+
+    def _trim_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ('success', 'error')]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def health(self) -> Dict:
+        service = self.translator.service
+        limiter = self.translator.rate_limiter
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'cache': self.cache.stats(),
+            'api': {'requests': service.requests, 'tokens': service.tokens,
+                    'requests_per_minute': limiter.requests_per_minute,
+                    'tokens_per_minute': limiter.tokens_per_minute},
+            'jobs': {status: sum(1 for job in self.jobs.values() if job['status'] == status)
+                     for status in ('queued', 'running', 'success', 'error')},
+            'inflight': len(self._inflight)
+        }
@@ -0,0 +1,165 @@
+# daemon_client.py
+import os
+import json
+import time
+import socket
+import secrets
+import threading
+import http.client
+from typing import Dict, List, Optional
+
+DAEMON_ENV = "FNTRANSLATE_DAEMON" # "127.0.0.1:8765" or "unix:/path/to/socket"
+TOKEN_FILE_ENV = "FNTRANSLATE_DAEMON_TOKEN_FILE"
+
+
+def token_file_path() -> str:
+    """Where the daemon writes its access token (same app data folder as config.py, no crypto import)."""
+    path = os.environ.get(TOKEN_FILE_ENV)
+    if path:
+        return path
+    return os.path.join(os.getenv('APPDATA') or os.path.expanduser('~'), 'FnTranslate', 'daemon.token')
+
+
+def write_token(path: Optional[str] = None) -> str:
+    """Creates a fresh random token, readable by the current user only (0600)."""
+    path = path or token_file_path()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+    os.chmod(path, 0o600) # O_CREAT's mode does not apply to an existing file
+    return token
+
+
+def read_token(path: Optional[str] = None) -> Optional[str]:
+    try:
+        with open(path or token_file_path()) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DaemonError(Exception):
+    pass
+
+
+class DaemonClient:
+    """
+    Talks to a running TranslationDaemon over one kept-alive connection (stdlib only).
+    Safe to share between threads: requests on the connection are serialized.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, socket_path: Optional[str] = None,
+                 timeout: float = 300.0, token: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.token = token # Read from the daemon's token file when not given
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["DaemonClient"]:
+        """Client for FNTRANSLATE_DAEMON, or None when it is not set."""
+        address = os.environ.get(DAEMON_ENV)
+        if not address:
+            return None
+        if address.startswith("unix:"):
+            return cls(socket_path=address[len("unix:"):])
+        host, _, port = address.rpartition(":")
+        return cls(host=host or "127.0.0.1", port=int(port))
+
+    def _connection(self):
+        if self._conn is None:
+            if self.socket_path:
+                self._conn = _UnixHTTPConnection(self.socket_path, self.timeout)
+            else:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        with self._lock:
+            for attempt in range(2):
+                token = self.token or read_token()
+                headers = {'Content-Type': 'application/json'} if body else {}
+                if token:
+                    headers['Authorization'] = f"Bearer {token}"
+                conn = self._connection()
+                sent = False
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    sent = True
+                    response = conn.getresponse()
+                    data = json.loads(response.read() or b'{}')
+                    break
+                except (ConnectionError, http.client.HTTPException, OSError):
+                    # Stale kept-alive connection: reconnect once. A POST the daemon
+                    # may already have accepted (e.g. timed out waiting) is not re-sent.
+                    self._close()
+                    if attempt or (sent and method != "GET"):
+                        raise
+        if response.status >= 400:
+            raise DaemonError(data.get('message', f"HTTP {response.status}"))
+        return data
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def is_running(self) -> bool:
+        try:
+            return self.health().get('status') == 'ok'
+        except (DaemonError, OSError, http.client.HTTPException):
+            return False
+
+    def health(self) -> Dict:
+        return self._request("GET", "/health")
+
+    def translate(self, text: str, source_lang: str = "auto", target_lang: str = "msa") -> str:
+        return self._request("POST", "/translate", {'text': text, 'source_lang': source_lang,
+                                                    'target_lang': target_lang})['translation']
+
+    def translate_batch(self, texts: List[str], source_lang: str = "auto", target_lang: str = "msa") -> List[str]:
+        return self._request("POST", "/batch", {'texts': texts, 'source_lang': source_lang,
+                                                'target_lang': target_lang})['translations']
+
+    def submit_file(self, file_path: str, source_lang: str = "auto", target_lang: str = "msa",
+                    output_format: Optional[str] = None, preserve_format: bool = True) -> str:
+        """Queues a file job and returns its id. The path must be readable by the daemon."""
+        return self._request("POST", "/jobs", {
+            'file_path': os.path.abspath(file_path), 'source_lang': source_lang, 'target_lang': target_lang,
+            'output_format': output_format, 'preserve_format': preserve_format
+        })['job_id']
+
+    def job(self, job_id: str) -> Dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def wait(self, job_id: str, poll_interval: float = 0.5, timeout: Optional[float] = None) -> Dict:
+        """Polls a file job until it finishes and returns the translation result dict."""
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            job = self.job(job_id)
+            if job['status'] in ('success', 'error'):
+                return job['result']
+            if deadline and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} still {job['status']}")
+            time.sleep(poll_interval)
@@ -0,0 +1,103 @@
+# headless.py
+import os
+import logging
+from typing import Dict, List, Optional
+
+from core.rate_limiter import RateLimiter, RateLimitedTranslator
+
+# TranslationService (openai), DBManager and the file handlers - Lazy loaded on first use,
+# so importing this module stays cheap for scripts that call the CLI thousands of times
+
+logger = logging.getLogger("Headless")
+
+class HeadlessTranslator:
+    """
+    GUI-free entry point to the translation stack: the same TranslationService,
+    DBManager caches and file handlers the desktop app uses, without Qt or pywebview.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, requests_per_minute: int = 60,
+                 tokens_per_minute: int = 0):
+        """
+        Args:
+            api_key: Overrides DEEPSEEK_API_KEY / the key saved from the GUI settings.
+            requests_per_minute: Shared API quota for text, file and batch calls.
+            tokens_per_minute: Optional token quota (0 = unlimited).
+        """
+        if api_key:
+            os.environ["DEEPSEEK_API_KEY"] = api_key
+        elif not os.environ.get("DEEPSEEK_API_KEY"):
+            self._load_saved_key()
+
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self._service = None
+        self._db = None
+        self._file_handler = None
+
+    def _load_saved_key(self):
+        """Falls back to the encrypted key saved by the GUI (imports cryptography)."""
+        try:
+            from config import ConfigManager
+            saved_key = ConfigManager().get_api_key()
+            if saved_key:
+                os.environ["DEEPSEEK_API_KEY"] = saved_key
+                logger.info("Loaded API key from Config File")
+        except Exception as e:
+            logger.warning(f"Could not load saved API key: {e}")
+
+    @property
+    def service(self):
+        """Rate-limited TranslationService, built on first use."""
+        if self._service is None:
+            from core.translate_core import TranslationService
+            self._service = RateLimitedTranslator(TranslationService(), self.rate_limiter)
+        return self._service
+
+    @property
+    def db(self):
+        if self._db is None:
+            from core.dbmanager import get_db_manager
+            self._db = get_db_manager()
+        return self._db
+
+    @property
+    def file_handler(self):
+        if self._file_handler is None:
+            from services.file_handler import FileTranslationHandler
+            self._file_handler = FileTranslationHandler(self.service)
+        return self._file_handler
+
+    def translate_text(self, text: str, source_lang: str = "auto", target_lang: str = "msa") -> str:
+        """Translates one text, going through the shared translation cache."""
+        cached = self.db.get_cached_text(text, source_lang, target_lang)
+        if cached:
+            return cached
+        translated = self.service.translate(text, target_lang=target_lang, source_lang=source_lang)
+        self.db.cache_text_translation(text, source_lang, target_lang, translated)
+        return translated
+
+    def translate_texts(self, texts: List[str], source_lang: str = "auto", target_lang: str = "msa") -> List[str]:
+        """Translates many short texts in order, batching cache misses into few requests."""
+        return self.file_handler._translate_segments(texts, source_lang, target_lang)
+
+    def translate_file(self, file_path: str, source_lang: str = "auto", target_lang: str = "msa",
+                       output_format: Optional[str] = None, preserve_format: bool = True) -> Dict:
+        """Same pipeline as the GUI upload. Returns the handler's result dict."""
+        return self.file_handler.process_uploaded_file(
+            file_path, source_lang, target_lang,
+            output_format=output_format, preserve_format=preserve_format
+        )
+
+    def translate_batch(self, source: str, source_lang: str = "auto", target_lang: str = "msa",
+                        output_format: Optional[str] = None, max_translation_workers: int = 8,
+                        preserve_format: bool = True) -> Dict:
+        """Translates every supported file in a folder or glob (see BatchTranslationHandler)."""
+        from services.batch_handler import BatchTranslationHandler
+        # Own file handler so its request/token counters cover exactly this batch
+        handler = BatchTranslationHandler(
+            self.service.translator,
+            max_translation_workers=max_translation_workers,
+            rate_limiter=self.rate_limiter
+        )
+        return handler.process_batch(source, source_lang, target_lang, output_format=output_format,
+                                     preserve_format=preserve_format)
@@ -0,0 +1,108 @@
+# benchmarks/bench_docx_extract.py
+"""
+Compares the streaming DOCX extractor against the python-docx DOM path.
+
+Usage:
+    python benchmarks/bench_docx_extract.py --size-mb 120
+    python benchmarks/bench_docx_extract.py --file path/to/big.docx
+
+Each method runs in its own subprocess so peak RSS is measured separately.
+"""
+import os
+import sys
+import time
+import random
+import zipfile
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.docx_stream import CONTENT_TYPES_XML, PACKAGE_RELS_XML
+
+WORDS = [''.join(random.Random(i).choices('abcdefghijklmnopqrstuvwxyz', k=random.Random(i).randint(2, 10)))
+         for i in range(5000)]
+
+
+def generate_docx(path: str, size_mb: int):
+    """Writes a synthetic DOCX whose compressed size is roughly `size_mb`."""
+    rng = random.Random(42)
+    target = size_mb * 1024 * 1024
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', CONTENT_TYPES_XML)
+        zf.writestr('_rels/.rels', PACKAGE_RELS_XML)
+        with zf.open('word/document.xml', 'w', force_zip64=True) as doc:
+            doc.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                      b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+            written = 0
+            while written < target * 3: # Random words deflate roughly 3:1
+                runs = ''.join(
+                    f'<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">{" ".join(rng.choices(WORDS, k=12))} </w:t></w:r>'
+                    for _ in range(4)
+                )
+                para = f'<w:p><w:pPr><w:pStyle w:val="Normal"/></w:pPr>{runs}</w:p>'.encode()
+                doc.write(para)
+                written += len(para)
+            doc.write(b'</w:body></w:document>')
+
+
+def _run_method(method: str, path: str):
+    """Child process: extracts the file and prints elapsed seconds, chars and peak RSS."""
+    start = time.perf_counter()
+    if method == 'stream':
+        from services.docx_stream import iter_docx_paragraphs
+        chars = sum(len(p) for p in iter_docx_paragraphs(path))
+    else:
+        from docx import Document
+        doc = Document(path)
+        chars = sum(len(p.text) for p in doc.paragraphs if p.text.strip())
+    elapsed = time.perf_counter() - start
+
+    peak_mb = -1.0
+    try:
+        import resource
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak_kb / (1024 * 1024) if sys.platform == 'darwin' else peak_kb / 1024
+    except ImportError:
+        pass # Windows: no resource module
+    print(f"{elapsed:.3f} {chars} {peak_mb:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file', help="Existing DOCX to benchmark")
+    parser.add_argument('--size-mb', type=int, default=100, help="Size of the generated DOCX")
+    parser.add_argument('--method', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.method:
+        return _run_method(args.method, args.file)
+
+    path = args.file
+    if not path:
+        path = os.path.join(tempfile.gettempdir(), f"fntranslate_bench_{args.size_mb}mb.docx")
+        if not os.path.exists(path):
+            print(f"Generating {args.size_mb} MB document at {path} ...")
+            generate_docx(path, args.size_mb)
+    print(f"File: {path} ({os.path.getsize(path) / (1024 * 1024):.1f} MB)")
+
+    results = {}
+    for method in ('stream', 'python-docx'):
+        proc = subprocess.run(
+            [sys.executable, __file__, '--method', method, '--file', path],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(f"{method:12s} failed: {proc.stderr.strip().splitlines()[-1:]}")
+            continue
+        elapsed, chars, peak_mb = proc.stdout.split()
+        results[method] = float(elapsed)
+        print(f"{method:12s} {float(elapsed):8.2f}s  {int(chars):>12,} chars  peak RSS {peak_mb} MB")
+
+    if len(results) == 2 and results['stream'] > 0:
+        print(f"Speedup: {results['python-docx'] / results['stream']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
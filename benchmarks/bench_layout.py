@@ -0,0 +1,112 @@
+# benchmarks/bench_layout.py
+"""
+Layout detection cost at full resolution against the pyramid path
+(downscaled analysis + full-resolution edge refinement), and how far the
+pyramid rects land from the full-resolution ones.
+
+Usage:
+    python benchmarks/bench_layout.py --width 3840 --height 2160 --runs 5
+    python benchmarks/bench_layout.py --image screenshot.png
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.layout import get_layout_boxes, pyramid_factor
+
+FONTS = ["DejaVuSans.ttf", "arial.ttf"]
+
+
+def load_font(size: int):
+    for name in FONTS:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def make_screen(width: int, height: int):
+    """A UI-like capture: text columns in several sizes, buttons, and a photo panel."""
+    rng = np.random.default_rng(0)
+    image = Image.new("RGB", (width, height), (248, 248, 248))
+    draw = ImageDraw.Draw(image)
+    column_w = width // 3
+    for col in range(2):
+        y = 40
+        for i, size in enumerate([14, 16, 20, 28, 14, 12] * 20):
+            if y + size * 4 > height:
+                break
+            font = load_font(size)
+            for line in range(1 + i % 3):
+                draw.text((40 + col * column_w, y), f"Section {i} line {line}: settings and account options",
+                          font=font, fill=(25, 25, 25))
+                y += int(size * 1.4)
+            y += size * 2
+    for i in range(6):
+        x, y = 40 + i * 140, height - 80
+        draw.rectangle((x, y, x + 120, y + 36), outline=(120, 120, 120))
+        draw.text((x + 20, y + 9), f"Button {i}", font=load_font(14), fill=(0, 0, 0))
+    photo = rng.integers(0, 255, (height // 3, column_w, 3), dtype=np.uint8)
+    image.paste(Image.fromarray(photo), (2 * column_w, 40))
+    return image
+
+
+def timed(runs, fn):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def match(reference, candidate):
+    """Pairs rects by best IoU; returns (matched, worst edge offset in px)."""
+    worst = 0
+    matched = 0
+    for rx, ry, rw, rh in reference:
+        best_iou, best = 0.0, None
+        for cx, cy, cw, ch in candidate:
+            ix = max(0, min(rx + rw, cx + cw) - max(rx, cx))
+            iy = max(0, min(ry + rh, cy + ch) - max(ry, cy))
+            inter = ix * iy
+            iou = inter / (rw * rh + cw * ch - inter) if inter else 0.0
+            if iou > best_iou:
+                best_iou, best = iou, (cx, cy, cw, ch)
+        if best and best_iou > 0.5:
+            matched += 1
+            cx, cy, cw, ch = best
+            worst = max(worst, abs(cx - rx), abs(cy - ry), abs(cx + cw - rx - rw), abs(cy + ch - ry - rh))
+    return matched, worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--image", help="Screenshot to use instead of the synthetic screen")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    image = Image.open(args.image).convert("RGB") if args.image else make_screen(args.width, args.height)
+    factor = pyramid_factor(*image.size)
+    full_ms, full = timed(args.runs, lambda: get_layout_boxes(image, text_only=False, max_side=1 << 30))
+    pyr_ms, pyramid = timed(args.runs, lambda: get_layout_boxes(image, text_only=False))
+    matched, worst = match([b['rect'] for b in full], [b['rect'] for b in pyramid])
+
+    print(f"{image.size[0]}x{image.size[1]}, pyramid level 1/{factor}, best of {args.runs}")
+    print(f"Full resolution: {full_ms:8.1f} ms  {len(full)} boxes")
+    print(f"Pyramid:         {pyr_ms:8.1f} ms  {len(pyramid)} boxes  ({full_ms / pyr_ms:.1f}x)")
+    print(f"Matched {matched}/{len(full)} boxes, worst edge offset {worst} px")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_motion_diff.py
+"""
+Per-frame motion detection cost: the old PIL path (frombytes, full-size copies,
+ImageDraw masks, resize + convert) against MotionDetector on the raw buffer.
+
+Usage:
+    python benchmarks/bench_motion_diff.py --width 1920 --height 1080 --frames 50
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from component.motion_detector import MotionDetector
+
+MASKS = [(100, 100, 400, 60), (100, 300, 800, 120), (900, 700, 300, 40)]
+
+
+def make_frames(width: int, height: int, count: int):
+    """BGRA buffers like mss returns: static noise plus a moving bright bar."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (height, width, 4), dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        frame = base.copy()
+        y = (i * 17) % (height - 40)
+        frame[y:y + 40, :, :3] = 255
+        frames.append(bytearray(frame.tobytes()))
+    return frames
+
+
+def old_diff(img1, img2, ignore_rects):
+    i1 = img1.copy()
+    i2 = img2.copy()
+    if ignore_rects:
+        draw1 = ImageDraw.Draw(i1)
+        draw2 = ImageDraw.Draw(i2)
+        for (x, y, w, h) in ignore_rects:
+            draw1.rectangle([x, y, x + w, y + h], fill=(0, 0, 0))
+            draw2.rectangle([x, y, x + w, y + h], fill=(0, 0, 0))
+    thumb1 = i1.resize((64, 64), Image.Resampling.NEAREST).convert('L')
+    thumb2 = i2.resize((64, 64), Image.Resampling.NEAREST).convert('L')
+    return np.mean((np.array(thumb1) - np.array(thumb2)) ** 2)
+
+
+def bench_old(frames, size):
+    start = time.perf_counter()
+    last = anchor = None
+    for raw in frames:
+        img = Image.frombytes("RGB", size, bytes(raw), "raw", "BGRX")
+        if last is not None:
+            old_diff(last, img, MASKS)
+        if anchor is not None:
+            old_diff(anchor, img, MASKS)
+        last = img.copy()
+        anchor = anchor or img.copy()
+    return (time.perf_counter() - start) * 1000 / len(frames)
+
+
+def bench_new(frames, size):
+    motion = MotionDetector(*size)
+    start = time.perf_counter()
+    last = anchor = None
+    for raw in frames:
+        thumb = motion.thumbnail(raw)
+        if last is not None:
+            motion.diff(last, thumb, MASKS)
+        if anchor is not None:
+            motion.diff(anchor, thumb, MASKS)
+        last = thumb
+        anchor = anchor if anchor is not None else thumb
+    return (time.perf_counter() - start) * 1000 / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    size = (args.width, args.height)
+    frames = make_frames(args.width, args.height, args.frames)
+    old_ms = bench_old(frames, size)
+    new_ms = bench_new(frames, size)
+    print(f"{args.width}x{args.height}, {args.frames} frames, diff vs previous + anchor")
+    print(f"PIL path:        {old_ms:8.3f} ms/frame")
+    print(f"MotionDetector:  {new_ms:8.3f} ms/frame  ({old_ms / new_ms:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/bench_ocr_preprocess.py
+"""
+Per-block OCR planning (x-height rescale + PSM from geometry) against the old
+native-scale `--psm 6` path: time per block and character accuracy on a
+fixture set.
+
+Fixtures are image files with a same-named .txt holding the expected text.
+Without --fixtures a synthetic set is rendered (UI labels, buttons, lines,
+paragraphs and headings, 10-96px, light and dark); --save writes it out so it
+can be checked in or hand-corrected.
+
+Usage:
+    python benchmarks/bench_ocr_preprocess.py
+    python benchmarks/bench_ocr_preprocess.py --fixtures tests/ocr_fixtures --lang eng
+"""
+import os
+import sys
+import time
+import difflib
+import argparse
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.ocr import configure_tesseract, get_ocr_backend, ocr_image
+from core.ocr_planner import plan_block, prepare_block
+
+FONTS = ["DejaVuSans.ttf", "arial.ttf"]
+FIXTURES = [
+    # (category, text, font size, lines)
+    ("word", "Settings", 11, 1), ("word", "Cancel", 13, 1), ("word", "Download", 16, 1),
+    ("line", "Save changes before closing", 12, 1), ("line", "Welcome back, Alice", 14, 1),
+    ("line", "Your session expires in five minutes", 18, 1),
+    ("paragraph", "The quick brown fox jumps over the lazy dog", 12, 3),
+    ("paragraph", "Terms and conditions apply to all purchases", 15, 4),
+    ("heading", "Account overview", 48, 1), ("heading", "Dashboard", 72, 1), ("heading", "Welcome", 96, 1),
+]
+
+
+def load_font(size: int):
+    for name in FONTS:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def render(text: str, size: int, lines: int, dark: bool):
+    """A padded crop like get_layout_boxes produces."""
+    font = load_font(size)
+    probe = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    width = int(probe.textlength(text, font=font)) + 40
+    height = int(size * 1.4 * lines) + 30
+    image = Image.new("RGB", (width, height), (32, 32, 36) if dark else (248, 248, 248))
+    draw = ImageDraw.Draw(image)
+    for line in range(lines):
+        draw.text((20, 15 + line * size * 1.4), text, font=font, fill=(230, 230, 230) if dark else (20, 20, 20))
+    return image, "\n".join([text] * lines)
+
+
+def synthetic_fixtures():
+    for category, text, size, lines in FIXTURES:
+        for dark in (False, True):
+            image, expected = render(text, size, lines, dark)
+            yield f"{category}-{size}px{'-dark' if dark else ''}", category, image, expected
+
+
+def load_fixtures(folder: str):
+    for path in sorted(Path(folder).iterdir()):
+        if path.suffix.lower() in (".png", ".jpg", ".jpeg") and path.with_suffix(".txt").exists():
+            expected = path.with_suffix(".txt").read_text(encoding="utf-8").strip()
+            yield path.stem, path.stem.split("-")[0], Image.open(path).convert("RGB"), expected
+
+
+def accuracy(expected: str, actual: str) -> float:
+    return difflib.SequenceMatcher(None, " ".join(expected.split()), " ".join(actual.split())).ratio()
+
+
+def timed(runs, fn):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="Folder of images with .txt ground truth")
+    parser.add_argument("--save", help="Write the synthetic fixtures to this folder and exit")
+    parser.add_argument("--lang", default="eng")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+        for name, _, image, expected in synthetic_fixtures():
+            image.save(os.path.join(args.save, f"{name}.png"))
+            Path(args.save, f"{name}.txt").write_text(expected, encoding="utf-8")
+        print(f"Fixtures written to {args.save}")
+        return
+
+    fixtures = list(load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures())
+    configure_tesseract()
+    print(f"Backend: {get_ocr_backend().name}, {len(fixtures)} fixtures, best of {args.runs}\n")
+    print(f"{'fixture':<26}{'base ms':>9}{'base acc':>10}{'plan ms':>9}{'plan acc':>10}{'psm':>5}{'scale':>7}")
+
+    totals = {}
+    for name, category, image, expected in fixtures:
+        base_ms, base_text = timed(args.runs, lambda: ocr_image(image, lang=args.lang, psm=6))
+
+        def planned():
+            plan = plan_block(image)
+            return plan, ocr_image(prepare_block(image, plan), lang=args.lang, psm=plan['psm'])
+
+        plan_ms, (plan, plan_text) = timed(args.runs, planned)
+        base_acc, plan_acc = accuracy(expected, base_text), accuracy(expected, plan_text)
+        print(f"{name[:25]:<26}{base_ms:>9.1f}{base_acc:>10.1%}{plan_ms:>9.1f}{plan_acc:>10.1%}"
+              f"{plan['psm']:>5}{plan['scale']:>7.2f}")
+        for key in (category, "all"):
+            bucket = totals.setdefault(key, [0, 0.0, 0.0, 0.0, 0.0])
+            bucket[0] += 1
+            for i, value in enumerate((base_ms, base_acc, plan_ms, plan_acc), 1):
+                bucket[i] += value
+
+    print(f"\n{'mean per block':<26}{'base ms':>9}{'base acc':>10}{'plan ms':>9}{'plan acc':>10}")
+    for key in sorted(totals, key=lambda k: k == "all"):
+        count, base_ms, base_acc, plan_ms, plan_acc = totals[key]
+        print(f"{key:<26}{base_ms / count:>9.1f}{base_acc / count:>10.1%}{plan_ms / count:>9.1f}{plan_acc / count:>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
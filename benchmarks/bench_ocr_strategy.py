@@ -0,0 +1,114 @@
+# benchmarks/bench_ocr_strategy.py
+"""
+Per-crop OCR against one pass over the region the crops span and one pass over
+a mosaic of the crops, on real screens.
+For every screenshot it runs the live layout analysis, times each strategy,
+and shows what OcrPlanner would have picked. It then fits the planner's cost
+constants (ms per call, ms per Mpx) for the active OCR backend from the timings.
+
+Usage:
+    python benchmarks/bench_ocr_strategy.py shot1.png shot2.png --lang eng
+    python benchmarks/bench_ocr_strategy.py --screen --runs 3
+
+FNTRANSLATE_OCR_BACKEND selects the backend being measured.
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.layout import get_layout_boxes
+from core.ocr import configure_tesseract, create_ocr_pool, get_ocr_backend, ocr_image, ocr_images, ocr_page
+from core.ocr_mosaic import ocr_mosaic
+from core.ocr_planner import OcrPlanner, bounding_region
+
+
+def grab_screen():
+    from mss import mss
+    with mss() as sct:
+        shot = sct.grab(sct.monitors[1])
+        return Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX")
+
+
+def best_of(runs, fn):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*", help="Screenshots to OCR")
+    parser.add_argument("--screen", action="store_true", help="Also grab the primary monitor")
+    parser.add_argument("--lang", default="eng")
+    parser.add_argument("--runs", type=int, default=3, help="Best-of runs per measurement")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    shots = [(path, Image.open(path).convert("RGB")) for path in args.images]
+    if args.screen:
+        shots.append(("<screen>", grab_screen()))
+    if not shots:
+        parser.error("give screenshots or --screen")
+
+    configure_tesseract()
+    backend = get_ocr_backend()
+    pool = create_ocr_pool(args.workers)
+    planner = OcrPlanner.for_backend(backend.name, args.workers)
+    ocr_image(shots[0][1].crop((0, 0, 32, 32)), lang=args.lang) # Warm-up (engine / model load)
+
+    crop_samples = [] # (Mpx, ms) per single crop
+    page_samples = [] # (Mpx, ms) per region pass
+    print(f"Backend: {backend.name}, {args.workers} OCR workers, best of {args.runs}\n")
+    print(f"{'image':<28}{'blocks':>7}{'crop Mpx':>10}{'page Mpx':>10}{'crops ms':>10}{'page ms':>10}"
+          f"{'mosaic ms':>11}{'fastest':>9}{'planner':>9}")
+
+    for name, image in shots:
+        blocks = get_layout_boxes(image)
+        if not blocks:
+            print(f"{name[-27:]:<28}{0:>7}  no text blocks")
+            continue
+        crops = [b['crop'] for b in blocks]
+        for crop in crops:
+            ms, _ = best_of(args.runs, lambda: ocr_image(crop, lang=args.lang))
+            crop_samples.append((crop.width * crop.height / 1e6, ms))
+
+        region = bounding_region([b['rect'] for b in blocks], image.size)
+        x, y, w, h = region
+        page_image = image.crop((x, y, x + w, y + h))
+        crops_ms, _ = best_of(args.runs, lambda: ocr_images(crops, lang=args.lang, executor=pool))
+        page_ms, page_blocks = best_of(args.runs, lambda: ocr_page(page_image, lang=args.lang, offset=(x, y)))
+        mosaic_ms, mosaic_results = best_of(args.runs, lambda: ocr_mosaic(crops, lang=args.lang))
+        page_samples.append((w * h / 1e6, page_ms))
+
+        crop_mpx = sum(c.width * c.height for c in crops) / 1e6
+        timings = {'crops': crops_ms, 'page': page_ms, 'mosaic': mosaic_ms}
+        fastest = min(timings, key=timings.get)
+        planned = planner.plan([c.size for c in crops], region)
+        print(f"{name[-27:]:<28}{len(blocks):>7}{crop_mpx:>10.2f}{w * h / 1e6:>10.2f}{crops_ms:>10.0f}"
+              f"{page_ms:>10.0f}{mosaic_ms:>11.0f}{fastest:>9}{planned:>9}")
+        print(f"{'':<28}page pass found {len(page_blocks)} paragraphs, "
+              f"mosaic read text in {sum(1 for r in mosaic_results if r and r[0])}/{len(crops)} crops")
+
+    pool.shutdown()
+    if len(crop_samples) >= 2:
+        mpx, ms = np.array(crop_samples).T
+        crop_rate, call_ms = np.polyfit(mpx, ms, 1)
+        call_ms = max(0.0, call_ms)
+        page_rate = np.mean([(p_ms - call_ms) / p_mpx for p_mpx, p_ms in page_samples if p_mpx])
+        print(f"\nFitted costs for '{backend.name}': {call_ms:.1f} ms/call, "
+              f"{crop_rate:.0f} ms/Mpx per crop, {page_rate:.0f} ms/Mpx per page")
+        print(f"BACKEND_COSTS['{backend.name}'] = ({call_ms:.1f}, {crop_rate:.1f}, {page_rate:.1f})")
+
+
+if __name__ == '__main__':
+    main()
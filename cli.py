@@ -0,0 +1,187 @@
+# cli.py
+import os
+import sys
+import json
+import glob
+import shutil
+import logging
+import argparse
+import statistics
+import subprocess
+import time
+
+# api.headless and everything behind it - Lazy loaded per command, keeps `--help` and startup fast
+
+logger = logging.getLogger("CLI")
+
+
+def _translator(args):
+    from api.headless import HeadlessTranslator
+    return HeadlessTranslator(api_key=args.api_key, requests_per_minute=args.rpm)
+
+
+def _copy_outputs(result: dict, output_dir: str):
+    """Copies the translated file (and image sidecar) into output_dir, updating the result."""
+    os.makedirs(output_dir, exist_ok=True)
+    result['translated_file'] = shutil.copy2(result['translated_file'], output_dir)
+    sidecar = result.get('metadata', {}).get('sidecar_file')
+    if sidecar:
+        result['metadata']['sidecar_file'] = shutil.copy2(sidecar, output_dir)
+
+
+def cmd_translate_file(args) -> int:
+    translator = _translator(args)
+    failed = 0
+    for source in args.paths:
+        if os.path.isdir(source) or glob.has_magic(source):
+            summary = translator.translate_batch(source, args.source, args.target, output_format=args.format,
+                                                 max_translation_workers=args.workers,
+                                                 preserve_format=not args.no_preserve)
+            results = summary.get('results', [])
+            if summary['status'] != 'success':
+                results = results or [summary]
+            else:
+                print(f"{source}: {json.dumps(summary['stats'])}", file=sys.stderr)
+        else:
+            results = [translator.translate_file(source, args.source, args.target, output_format=args.format,
+                                                 preserve_format=not args.no_preserve)]
+
+        for result in results:
+            if result.get('status') == 'success' and args.output_dir:
+                _copy_outputs(result, args.output_dir)
+            if args.json:
+                print(json.dumps(result, ensure_ascii=False))
+            elif result.get('status') == 'success':
+                print(result['translated_file'])
+            else:
+                print(f"error: {result.get('file', source)}: {result.get('message')}", file=sys.stderr)
+            failed += result.get('status') != 'success'
+    return 1 if failed else 0
+
+
+def cmd_translate_text(args) -> int:
+    from api.daemon_client import DaemonClient
+    # A running daemon (FNTRANSLATE_DAEMON) answers without this process building a client
+    daemon = DaemonClient.from_env()
+    if daemon is not None and not daemon.is_running():
+        logger.warning("Daemon not reachable, translating in-process")
+        daemon = None
+    translator = daemon or _translator(args)
+
+    if args.text:
+        texts = [" ".join(args.text)]
+    else:
+        # One segment per non-empty stdin line; batched into few requests
+        texts = [line.rstrip("\n") for line in sys.stdin if line.strip()]
+    if not texts:
+        print("error: no text given", file=sys.stderr)
+        return 1
+
+    try:
+        if daemon is not None:
+            translations = daemon.translate_batch(texts, args.source, args.target)
+        elif len(texts) == 1:
+            translations = [translator.translate_text(texts[0], args.source, args.target)]
+        else:
+            translations = translator.translate_texts(texts, args.source, args.target)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    for original, translated in zip(texts, translations):
+        if args.json:
+            print(json.dumps({'text': original, 'translation': translated}, ensure_ascii=False))
+        else:
+            print(translated)
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from api.headless import HeadlessTranslator
+    from api.daemon import TranslationDaemon
+    translator = HeadlessTranslator(api_key=args.api_key, requests_per_minute=args.rpm,
+                                    tokens_per_minute=args.tpm)
+    TranslationDaemon(args.host, args.port, socket_path=args.socket, translator=translator,
+                      max_workers=args.workers, max_file_jobs=args.file_jobs).run()
+    return 0
+
+
+BENCH_CASES = [
+    ("python", ["-c", "pass"]),
+    ("cli --help", [os.path.abspath(__file__), "--help"]),
+    ("import api.headless", ["-c", "import api.headless"]),
+    # A cached translate-text never builds the API client (openai is the bulk of the import cost)
+    ("cache lookup ready", ["-c", "from api.headless import HeadlessTranslator as H; H(api_key='sk-bench').db"]),
+    ("api client ready", ["-c", "from api.headless import HeadlessTranslator as H; H(api_key='sk-bench').service"]),
+    ("file pipeline ready", ["-c", "from api.headless import HeadlessTranslator as H; H(api_key='sk-bench').file_handler"]),
+]
+
+
+def cmd_bench(args) -> int:
+    """Measures cold start: each case runs in a fresh interpreter."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'case':<22}{'min ms':>10}{'median ms':>12}")
+    for name, argv in BENCH_CASES:
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + argv, cwd=root, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<22}{min(timings):>10.1f}{statistics.median(timings):>12.1f}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="fntranslate", description="F(n)Translate without the GUI")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="-v for INFO, -vv for DEBUG logs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_translation_options(sub):
+        sub.add_argument("-s", "--source", default="auto", help="source language (default: auto)")
+        sub.add_argument("-t", "--target", default="msa", help="target language (default: msa)")
+        sub.add_argument("--api-key", help="overrides DEEPSEEK_API_KEY and the saved key")
+        sub.add_argument("--rpm", type=int, default=60, help="max API requests per minute")
+        sub.add_argument("--json", action="store_true", help="print one JSON result per line")
+
+    sub = commands.add_parser("translate-file", help="translate files, folders or glob patterns")
+    sub.add_argument("paths", nargs="+")
+    add_translation_options(sub)
+    sub.add_argument("-f", "--format", help="output format (docx, txt, srt, vtt...)")
+    sub.add_argument("-o", "--output-dir", help="copy translated files here")
+    sub.add_argument("--no-preserve", action="store_true", help="rebuild DOCX instead of translating in place")
+    sub.add_argument("--workers", type=int, default=8, help="concurrent requests for folders/globs")
+    sub.set_defaults(func=cmd_translate_file)
+
+    sub = commands.add_parser("translate-text", help="translate text arguments or stdin lines")
+    sub.add_argument("text", nargs="*")
+    add_translation_options(sub)
+    sub.set_defaults(func=cmd_translate_text)
+
+    sub = commands.add_parser("serve", help="run the local translation daemon")
+    sub.add_argument("--host", default="127.0.0.1")
+    sub.add_argument("--port", type=int, default=8765)
+    sub.add_argument("--socket", help="listen on this unix socket instead of TCP")
+    sub.add_argument("--api-key", help="overrides DEEPSEEK_API_KEY and the saved key")
+    sub.add_argument("--rpm", type=int, default=60, help="max API requests per minute, shared by all clients")
+    sub.add_argument("--tpm", type=int, default=0, help="max estimated tokens per minute (0 = unlimited)")
+    sub.add_argument("--workers", type=int, default=8, help="concurrent translation requests")
+    sub.add_argument("--file-jobs", type=int, default=2, help="file jobs processed at once")
+    sub.set_defaults(func=cmd_serve)
+
+    sub = commands.add_parser("bench", help="measure cold start times")
+    sub.add_argument("--runs", type=int, default=10)
+    sub.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    level = [logging.WARNING, logging.INFO, logging.DEBUG][min(args.verbose, 2)]
+    logging.basicConfig(level=level, stream=sys.stderr,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
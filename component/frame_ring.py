@@ -0,0 +1,76 @@
+# frame_ring.py
+import threading
+import numpy as np
+
+class FrameRing:
+    """
+    Preallocated frame storage for the capture loop.
+    A small ring of luma thumbnails backs motion detection every frame; a couple
+    of full-resolution BGRA slots hold the frames that actually get OCR'd.
+    The current and previous frames are slot indices, so steady state
+    only writes into existing buffers and never allocates. Snapshots handed to
+    another thread are held until released, so they are never overwritten in use.
+    """
+
+    def __init__(self, motion, history: int = 2, frame_slots: int = 2):
+        """
+        Args:
+            motion: MotionDetector that defines frame and thumbnail geometry.
+            history: Thumbnail slots (needs room for current and previous).
+            frame_slots: Full-resolution slots (current snapshot and held ones).
+        """
+        self.motion = motion
+        self.thumbs = np.zeros((max(2, history),) + motion.thumb_shape, dtype=np.float32)
+        self.frames = np.zeros((max(2, frame_slots), motion.height, motion.width, 4), dtype=np.uint8)
+        self.current = None
+        self.previous = None
+        self.frame_current = None
+        self.held = set()
+        self._lock = threading.Lock() # Held slots are released from other threads
+
+    @staticmethod
+    def _free_slot(count: int, taken) -> int:
+        for slot in range(count):
+            if slot not in taken:
+                return slot
+        raise RuntimeError("No free frame slot")
+
+    def _thumb(self, index):
+        return None if index is None else self.thumbs[index]
+
+    @property
+    def current_thumb(self):
+        return self._thumb(self.current)
+
+    @property
+    def previous_thumb(self):
+        return self._thumb(self.previous)
+
+    def push(self, raw) -> np.ndarray:
+        """Thumbnails a new BGRA buffer into a slot not held as previous."""
+        slot = self._free_slot(len(self.thumbs), (self.previous,))
+        self.motion.thumbnail(raw, out=self.thumbs[slot])
+        self.current = slot
+        return self.thumbs[slot]
+
+    def keep_current_as_previous(self):
+        """The current frame becomes the reference for the next motion diff."""
+        self.previous = self.current
+
+    def snapshot(self, raw) -> np.ndarray:
+        """Copies the full-resolution frame into a slot no job holds."""
+        with self._lock:
+            slot = self._free_slot(len(self.frames), self.held)
+        np.copyto(self.frames[slot], self.motion.frame_view(raw))
+        self.frame_current = slot
+        return self.frames[slot]
+
+    def hold(self) -> int:
+        """Keeps the current snapshot out of reuse until release(); returns its slot."""
+        with self._lock:
+            self.held.add(self.frame_current)
+        return self.frame_current
+
+    def release(self, slot: int):
+        with self._lock:
+            self.held.discard(slot)
@@ -0,0 +1,86 @@
+# live_pipeline.py
+import threading
+from collections import deque
+
+class DropStaleQueue:
+    """
+    Bounded hand-off between live pipeline stages. Putting into a full queue
+    drops the oldest item instead of blocking, so a slow stage never stalls
+    the one feeding it and always picks up the newest work next.
+    `on_drop(item)` runs for every item evicted or cleared without being taken.
+    """
+
+    def __init__(self, maxsize: int = 1, on_drop=None):
+        self._items = deque()
+        self._maxsize = maxsize
+        self._cond = threading.Condition()
+        self.on_drop = on_drop
+        self.dropped = 0
+
+    def put(self, item):
+        evicted = []
+        with self._cond:
+            while len(self._items) >= self._maxsize:
+                evicted.append(self._items.popleft())
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+        self._dropped(evicted)
+
+    def get(self, timeout: float = None):
+        """The oldest item, or None if nothing arrived within `timeout`."""
+        with self._cond:
+            if not self._items and not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+    def clear(self) -> int:
+        with self._cond:
+            evicted = list(self._items)
+            self._items.clear()
+        self._dropped(evicted)
+        return len(evicted)
+
+    def _dropped(self, items):
+        if self.on_drop:
+            for item in items:
+                self.on_drop(item)
+
+    def __len__(self):
+        return len(self._items)
+
+class PipelineStage(threading.Thread):
+    """
+    One live pipeline stage: pulls jobs from `inbox`, skips the ones `is_current`
+    rejects (invalidated while queued) and hands the rest to `handler`, which
+    forwards its output to the next stage's queue itself. `on_done(job)` runs
+    whenever a job leaves the stage, handled, failed or stale.
+    """
+
+    def __init__(self, name: str, inbox: DropStaleQueue, handler, is_current, stop_event, logger, on_done=None):
+        super().__init__(name=name, daemon=True)
+        self.inbox = inbox
+        self.handler = handler
+        self.is_current = is_current
+        self.on_done = on_done
+        self.stop_event = stop_event
+        self.logger = logger
+        self.handled = 0
+        self.stale = 0
+
+    def run(self):
+        while not self.stop_event.is_set():
+            job = self.inbox.get(timeout=0.1)
+            if job is None:
+                continue
+            try:
+                if self.is_current(job):
+                    self.handler(job)
+                    self.handled += 1
+                else:
+                    self.stale += 1
+            except Exception as e:
+                self.logger.error(f"{self.name} stage error: {e}")
+            finally:
+                if self.on_done:
+                    self.on_done(job)
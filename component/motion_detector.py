@@ -0,0 +1,59 @@
+# motion_detector.py
+import numpy as np
+
+# ITU-R 601 luma weights, same as PIL's convert('L'), in BGRA channel order
+LUMA_WEIGHTS = (0.114, 0.587, 0.299)
+
+class MotionDetector:
+    """
+    Frame differencing straight on the mss BGRA buffer.
+    The raw bytes are viewed (not copied) as an (h, w, 4) array, sampled with
+    strides into a small luma thumbnail, and compared in preallocated buffers.
+    Masked regions are zeroed by slice assignment in thumbnail coordinates.
+    """
+
+    def __init__(self, width: int, height: int, thumb_size: int = 64):
+        self.width = width
+        self.height = height
+        self.step_x = max(1, width // thumb_size)
+        self.step_y = max(1, height // thumb_size)
+        self.thumb_shape = (-(-height // self.step_y), -(-width // self.step_x))
+        self._scratch = np.empty(self.thumb_shape, dtype=np.float32)
+        self._diff = np.empty(self.thumb_shape, dtype=np.float32)
+
+    def frame_view(self, raw) -> np.ndarray:
+        """Zero-copy (h, w, 4) uint8 view of a BGRA buffer (sct_img.raw)."""
+        return np.frombuffer(raw, dtype=np.uint8).reshape(self.height, self.width, 4)
+
+    def new_thumbnail(self) -> np.ndarray:
+        return np.empty(self.thumb_shape, dtype=np.float32)
+
+    def thumbnail(self, raw, out: np.ndarray = None) -> np.ndarray:
+        """Strided nearest-neighbour downsample + luma, written into `out`."""
+        if out is None:
+            out = self.new_thumbnail()
+        sampled = self.frame_view(raw)[::self.step_y, ::self.step_x]
+        np.multiply(sampled[..., 0], LUMA_WEIGHTS[0], out=out)
+        for channel in (1, 2):
+            np.multiply(sampled[..., channel], LUMA_WEIGHTS[channel], out=self._scratch)
+            out += self._scratch
+        return out
+
+    def to_thumb_rect(self, rect):
+        """Maps a full-resolution (x, y, w, h) to thumbnail row/column slices."""
+        x, y, w, h = rect
+        return (slice(-(-y // self.step_y), -(-(y + h) // self.step_y)),
+                slice(-(-x // self.step_x), -(-(x + w) // self.step_x)))
+
+    def diff(self, thumb1: np.ndarray, thumb2: np.ndarray, ignore_rects=()) -> float:
+        """
+        Mean absolute luma difference (0-255) between two thumbnails,
+        with `ignore_rects` (full-resolution coordinates) counted as unchanged.
+        """
+        if thumb1 is None or thumb2 is None:
+            return 100.0
+        np.subtract(thumb1, thumb2, out=self._diff)
+        np.abs(self._diff, out=self._diff)
+        for rect in ignore_rects:
+            self._diff[self.to_thumb_rect(rect)] = 0.0
+        return float(self._diff.mean())
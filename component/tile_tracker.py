@@ -0,0 +1,114 @@
+# tile_tracker.py
+import numpy as np
+
+from component.motion_detector import LUMA_WEIGHTS
+
+class TileTracker:
+    """
+    Splits the capture into a grid of tiles and tracks, per tile, whether it
+    changed since the last OCR (dirty) and when it last changed (settled).
+    Works on a mid-resolution luma sample of the raw BGRA buffer held in
+    preallocated buffers, so a blinking cursor or a clock only dirties the
+    tiles it touches instead of the whole ROI.
+    """
+
+    def __init__(self, width: int, height: int, tile_size: int = 96, step: int = 4,
+                 pixel_threshold: float = 40.0, min_changed: int = 6):
+        """
+        Args:
+            tile_size: Tile edge in screen pixels (rounded to a multiple of step).
+            step: Sampling stride; 4 keeps thin strokes while sampling 1/16 of the pixels.
+            pixel_threshold: Luma change (0-255) for a sample to count as changed.
+            min_changed: Changed samples needed to mark a tile; 6 ignores a
+                blinking 20px text cursor (at most 5 samples) but not a changed word.
+        """
+        self.width = width
+        self.height = height
+        self.step = step
+        self.cell = max(1, tile_size // step) # Tile edge in samples
+        self.tile_size = self.cell * step
+        self.pixel_threshold = pixel_threshold
+        self.min_changed = min_changed
+
+        self.sample_shape = (-(-height // step), -(-width // step))
+        self.grid_shape = (-(-self.sample_shape[0] // self.cell), -(-self.sample_shape[1] // self.cell))
+        padded = (self.grid_shape[0] * self.cell, self.grid_shape[1] * self.cell)
+
+        # Padding stays zero in every buffer, so it never counts as a change
+        self._samples = np.zeros((2,) + padded, dtype=np.float32) # latest / previous, swapped by index
+        self._latest = 0
+        self.anchor = np.zeros(padded, dtype=np.float32)
+        self._scratch = np.empty(self.sample_shape, dtype=np.float32)
+        self._diff = np.empty(padded, dtype=np.float32)
+        self._changed = np.empty(padded, dtype=bool)
+        self._counts = np.empty(self.grid_shape, dtype=np.int64)
+        self.last_change = np.zeros(self.grid_shape, dtype=np.float64)
+
+    @property
+    def latest(self) -> np.ndarray:
+        return self._samples[self._latest]
+
+    @property
+    def previous(self) -> np.ndarray:
+        return self._samples[1 - self._latest]
+
+    def _sample(self, raw, out: np.ndarray):
+        view = np.frombuffer(raw, dtype=np.uint8).reshape(self.height, self.width, 4)[::self.step, ::self.step]
+        target = out[:self.sample_shape[0], :self.sample_shape[1]]
+        np.multiply(view[..., 0], LUMA_WEIGHTS[0], out=target)
+        for channel in (1, 2):
+            np.multiply(view[..., channel], LUMA_WEIGHTS[channel], out=self._scratch)
+            target += self._scratch
+
+    def _changed_tiles(self, a: np.ndarray, b: np.ndarray, ignore_rects=()) -> np.ndarray:
+        np.subtract(a, b, out=self._diff)
+        np.abs(self._diff, out=self._diff)
+        for rect in ignore_rects:
+            rows, cols = self._sample_slices(rect)
+            self._diff[rows, cols] = 0.0
+        np.greater(self._diff, self.pixel_threshold, out=self._changed)
+        self._changed.reshape(self.grid_shape[0], self.cell, self.grid_shape[1], self.cell).sum(
+            axis=(1, 3), out=self._counts)
+        return self._counts >= self.min_changed
+
+    def _sample_slices(self, rect):
+        x, y, w, h = rect
+        return (slice(y // self.step, -(-(y + h) // self.step)),
+                slice(x // self.step, -(-(x + w) // self.step)))
+
+    def update(self, raw, now: float, ignore_rects=()):
+        """Samples a new frame and stamps the tiles that changed since the previous one."""
+        self._latest = 1 - self._latest
+        self._sample(raw, self.latest)
+        moving = self._changed_tiles(self.latest, self.previous, ignore_rects)
+        self.last_change[moving] = now
+
+    def dirty(self, ignore_rects=()) -> np.ndarray:
+        """(rows, cols) bool grid of tiles that differ from the anchor."""
+        return self._changed_tiles(self.latest, self.anchor, ignore_rects).copy()
+
+    def settled(self, now: float, settle_time: float) -> np.ndarray:
+        return self.last_change <= now - settle_time
+
+    def set_anchor(self, tiles: np.ndarray = None):
+        """Makes the latest frame the OCR reference, for all tiles or only `tiles`."""
+        if tiles is None:
+            np.copyto(self.anchor, self.latest)
+            return
+        shape = (self.grid_shape[0], self.cell, self.grid_shape[1], self.cell)
+        np.copyto(self.anchor.reshape(shape), self.latest.reshape(shape), where=tiles[:, None, :, None])
+
+    def set_anchor_rects(self, rects):
+        """Makes the latest frame the reference inside `rects` only, leaving the rest of their tiles alone."""
+        for rect in rects:
+            rows, cols = self._sample_slices(rect)
+            self.anchor[rows, cols] = self.latest[rows, cols]
+
+    def tile_slices(self, rect):
+        """Grid row/column slices covered by a screen-space (x, y, w, h)."""
+        x, y, w, h = rect
+        return (slice(max(0, y) // self.tile_size, -(-(y + h) // self.tile_size)),
+                slice(max(0, x) // self.tile_size, -(-(x + w) // self.tile_size)))
+
+    def intersects(self, rect, tiles: np.ndarray) -> bool:
+        return bool(tiles[self.tile_slices(rect)].any())
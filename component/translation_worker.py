@@ -1,10 +1,10 @@
 import sys
 import time
 import logging
+import threading
 import numpy as np
 from PyQt5.QtCore import QThread, pyqtSignal
 from PIL import Image
-import pytesseract
 
 # Adjust imports based on project structure
 import os
@@ -14,6 +14,26 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.translate_core import TranslationService
 from core.dbmanager import get_db_manager
+from core.ocr import configure_tesseract, create_ocr_pool, get_ocr_backend, ocr_images, ocr_page_rects
+from core.ocr_cache import OcrCache
+from core.ocr_filter import OcrQualityFilter
+from core.ocr_mosaic import ocr_mosaic
+from core.ocr_planner import OcrPlanner, MOSAIC, PAGE, bounding_region, plan_block, prepare_block, prepared_size
+from core.layout import get_layout_boxes
+from component.motion_detector import MotionDetector
+from component.frame_ring import FrameRing
+from component.tile_tracker import TileTracker
+from component.live_pipeline import DropStaleQueue, PipelineStage
+
+TILE_SETTLE_SECONDS = 1.0 # A dirty tile must be still this long before it is re-OCR'd
+FULL_REFRESH_FRACTION = 0.5 # Above this share of dirty tiles, clear everything (scene change)
+OVERLAY_SETTLE_SECONDS = 0.3 # A new overlay block's tiles must be still this long before it is re-anchored
+
+JOB_FULL = "full" # OCR the whole frame (through the stabilizer)
+JOB_TILES = "tiles" # Re-OCR only the blocks touching settled dirty tiles
+
+def rects_overlap(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
 
 class TextStabilizer:
     def __init__(self, history_size=5, stability_threshold=2):
@@ -56,7 +76,18 @@ class TextStabilizer:
         self.history = []
 
 class TranslationWorker(QThread):
-    result_ready = pyqtSignal(list)
+    """
+    Live translation as a pipeline. This thread captures and diffs frames;
+    layout + OCR, translation-cache lookup and API translation each run on their
+    own stage thread, connected by one-slot drop-stale queues. Every job carries
+    the overlay generation it was captured in: an invalidation (movement, scroll,
+    navigation key) bumps the generation, so queued and in-flight work for the
+    old screen is dropped at the next stage boundary instead of finishing first.
+    Cached translations go on screen as soon as the lookup is done and every API
+    translation is merged in as it arrives, so no block waits for the slowest one.
+    """
+    result_ready = pyqtSignal(list) # Replaces everything the overlay shows
+    result_merged = pyqtSignal(list, list) # (entries to add, entries they replace)
     request_hide = pyqtSignal(bool)
     
     def __init__(self, monitor, source_lang, target_lang, logger, stop_event):
@@ -69,15 +100,32 @@ class TranslationWorker(QThread):
         self.translator = None
         self.db_manager = None
         self.stabilizer = TextStabilizer(history_size=5, stability_threshold=2)
+        self.ocr_cache = OcrCache()
+        self.ocr_filter = OcrQualityFilter() # Noise blocks never reach the stabilizer / API
+        self.ocr_pool = None # Sized to the CPU count, created in run()
+        self.ocr_planner = None # Per-crop vs single-pass OCR, created in run() for the active backend
         
-        self.last_raw_img = None
+        self.motion = None # MotionDetector, created on the first frame
+        self.frames = None # FrameRing: preallocated current / previous frames plus snapshots held by jobs
+        self.tiles = None # TileTracker: per-tile dirty state against the last OCR
+        self.translations = [] # What the overlay currently shows: [(text, rect), ...]
+        self.pending_tiles = None # Dirty tiles waiting to settle before re-OCR
+        self.unanchored = [] # (rect, shown_at) of overlay blocks whose paint is not in the tile anchor yet
+
+        # Pipeline: capture/diff (this thread) -> OCR -> cache lookup -> translation
+        self.state_lock = threading.RLock() # Overlay state is shared by the capture, stage and listener threads
+        self.generation = 0 # Bumped by every invalidation; jobs from older generations are dropped
+        self.ocr_job = None # Job queued for / inside the OCR stage (one at a time)
+        self.translate_job = None # Full-frame job past the stabilizer, not yet on screen
+        self.ocr_queue = DropStaleQueue(1, on_drop=self.drop_job)
+        self.lookup_queue = DropStaleQueue(1, on_drop=self.drop_job)
+        self.translate_queue = DropStaleQueue(1, on_drop=self.drop_job)
+        self.stages = []
         
-        # State Variables
         # State Variables
         self.last_movement_time = 0
         self.is_translated = False
-        self.masked_regions = [] # Regions to ignore during diff (Digital Masking)
-        self.anchor_frame = None # Reference frame for the current translation
+        self.masked_regions = [] # Regions the motion diff ignores (Digital Masking)
 
         # Input Listeners for Active Detection
         self.mouse_listener = mouse.Listener(on_scroll=self.on_scroll)
@@ -96,89 +144,330 @@ class TranslationWorker(QThread):
         except:
             pass
 
+    def has_overlay_work(self):
+        """Something is on screen, being stabilized or in the pipeline."""
+        return (self.is_translated or len(self.stabilizer.history) > 0
+                or self.ocr_job is not None or self.translate_job is not None)
+
     def force_clear(self, reason):
         # Thread-safe clear trigger (called from listener threads)
-        if self.is_translated or len(self.stabilizer.history) > 0:
-            self.result_ready.emit([]) 
+        if self.has_overlay_work():
+            self.clear_overlay()
+            self.last_movement_time = time.time()
+            self.logger.info(f"Active Input: {reason}. Overlay cleared.")
+
+    def clear_overlay(self):
+        with self.state_lock:
+            self.generation += 1 # Everything queued or in flight is now stale
+            self.ocr_job = None
+            self.translate_job = None
+            self.result_ready.emit([])
             self.stabilizer.reset()
             self.is_translated = False
             self.masked_regions = []
-            self.anchor_frame = None
-            self.last_movement_time = time.time()
-            self.logger.info(f"Active Input: {reason}. Overlay cleared.")
+            self.translations = []
+            self.unanchored = []
+            if self.pending_tiles is not None:
+                self.pending_tiles[:] = False
+        for queue in (self.ocr_queue, self.lookup_queue, self.translate_queue):
+            queue.clear()
 
-    def get_image_diff(self, img1, img2, ignore_rects=[]):
-        if img1 is None or img2 is None: return 100.0
-        
-        # Create copies to apply masks
-        # work_img1 = img1.copy()
-        # work_img2 = img2.copy()
-        # Optimization: We can just draw black rectangles on the PIL images before resizing
-        # But we don't want to modify the source images if they are used elsewhere.
-        # Since we resize immediately, masking the full image is expensive? 
-        # Actually masking the thumbnail is inaccurate because rects are in full resolution.
-        # So we must mask full image or translate rects. 
-        # Improved: Mask full image copies (or draw on them if they are throwaway).
-        # img1 is self.last_raw_img, img2 is current img. We should not modify them in-place.
-        
-        # To avoid copying full images (slow), let's resize first, then mask?
-        # No, rects are absolute.
-        # Let's try drawing on copies.
-        
-        i1 = img1.copy()
-        i2 = img2.copy()
-        
-        if ignore_rects:
-            from PIL import ImageDraw
-            draw1 = ImageDraw.Draw(i1)
-            draw2 = ImageDraw.Draw(i2)
-            for (x, y, w, h) in ignore_rects:
-                draw1.rectangle([x, y, x+w, y+h], fill=(0,0,0))
-                draw2.rectangle([x, y, x+w, y+h], fill=(0,0,0))
-        
-        thumb1 = i1.resize((64, 64), Image.Resampling.NEAREST).convert('L')
-        thumb2 = i2.resize((64, 64), Image.Resampling.NEAREST).convert('L')
-        arr1 = np.array(thumb1)
-        arr2 = np.array(thumb2)
-        return np.mean((arr1 - arr2) ** 2)
+    def get_image_diff(self, thumb1, thumb2, ignore_rects=()):
+        return self.motion.diff(thumb1, thumb2, ignore_rects)
 
     def get_layout_boxes(self, pil_image):
-        import cv2
-        img_np = np.array(pil_image)
-        gray = cv2.cvtColor(img_np, cv2.COLOR_RGB2GRAY)
-        
-        thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                     cv2.THRESH_BINARY_INV, 11, 2)
-        
-        # Kernel (15, 12): 
-        # 15px Horizontal merge (Words -> Lines)
-        # 12px Vertical merge (Lines -> Paragraphs)
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (15, 12))
-        dilated = cv2.dilate(thresh, kernel, iterations=2)
-        
-        contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        blocks = []
-        img_h, img_w = img_np.shape[:2]
-        min_area = 200 
-        
-        for cnt in contours:
-            x, y, w, h = cv2.boundingRect(cnt)
-            if w * h > min_area:
-                pad = 10 
-                x_pad = max(0, x - pad)
-                y_pad = max(0, y - pad)
-                w_pad = min(img_w - x_pad, w + 2*pad)
-                h_pad = min(img_h - y_pad, h + 2*pad)
-                
-                crop = pil_image.crop((x_pad, y_pad, x_pad+w_pad, y_pad+h_pad))
-                
-                blocks.append({
-                    'crop': crop,
-                    'rect': (x, y, w, h)
-                })
-        
-        return blocks
+        return get_layout_boxes(pil_image)
+
+    def ocr_blocks(self, layout_blocks, image):
+        """
+        OCRs the layout blocks of `image`. Cache hits skip tesseract; the misses go
+        crop by crop across the OCR pool, through one pass over the region they
+        span, or packed into one mosaic, whichever the planner expects to be cheapest.
+        Missed crops are rescaled to tesseract's preferred x-height and get a PSM
+        from their geometry; a region pass is read back per missed block, so cache
+        hits inside the region are not read twice and every result is cached. Low-confidence and non-alphabetic blocks are dropped before returning.
+        """
+        # PSM None: chosen per block by plan_block, which depends only on the crop
+        keys = [self.ocr_cache.key(item['crop'], self.source_lang, None) for item in layout_blocks]
+        results = [self.ocr_cache.get(key) for key in keys] # (text, conf)
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        strategy = None
+        if missing:
+            # The estimate needs the rescaled sizes, but only crops/mosaic need the rescaled crops
+            plans = [plan_block(layout_blocks[i]['crop']) for i in missing]
+            sizes = [prepared_size(layout_blocks[i]['crop'], plan) for i, plan in zip(missing, plans)]
+            region = bounding_region([layout_blocks[i]['rect'] for i in missing], image.size)
+            strategy = self.ocr_planner.plan(sizes, region)
+
+            if strategy == PAGE:
+                x, y, w, h = region
+                recognized = ocr_page_rects(image.crop((x, y, x + w, y + h)),
+                                            [layout_blocks[i]['rect'] for i in missing],
+                                            lang=self.source_lang, offset=(x, y))
+            else:
+                crops = [prepare_block(layout_blocks[i]['crop'], plan) for i, plan in zip(missing, plans)]
+                if strategy == MOSAIC:
+                    recognized = ocr_mosaic(crops, lang=self.source_lang)
+                else:
+                    recognized = ocr_images(crops, lang=self.source_lang, psm=[plan['psm'] for plan in plans],
+                                            executor=self.ocr_pool, with_confidence=True)
+            for i, result in zip(missing, recognized):
+                results[i] = result
+                if result is not None: # Don't cache failures
+                    self.ocr_cache.put(keys[i], result)
+
+        raw_blocks = []
+        for item, result in zip(layout_blocks, results):
+            if result and result[0].strip():
+                x, y, w, h = item['rect']
+                raw_blocks.append({'text': result[0].strip(), 'conf': result[1], 'x': x, 'y': y, 'w': w, 'h': h})
+        raw_blocks = self.ocr_filter.filter(raw_blocks)
+        self.logger.debug(f"OCR: {len(missing)}/{len(layout_blocks)} crops recognized ({strategy}), "
+                          f"cache {self.ocr_cache.stats()}, filter {self.ocr_filter.stats()}")
+        return raw_blocks
+
+    def lookup_blocks(self, blocks):
+        """Translation-cache pass: [(text, rect) or None per block], and the indices still to translate."""
+        translations = []
+        misses = []
+        for i, line in enumerate(blocks):
+            cached = self.db_manager.get_cached_text(line['text'], self.source_lang, self.target_lang)
+            translations.append((cached, (line['x'], line['y'], line['w'], line['h'])) if cached else None)
+            if not cached:
+                misses.append(i)
+        return translations, misses
+
+    def translate_misses(self, blocks, translations, misses, is_current=lambda: True, on_translated=None):
+        """
+        Translates the cache misses in place, handing each (text, rect) to
+        `on_translated` as it arrives; stops early once the job goes stale.
+        """
+        for i in misses:
+            if self.stop_event.is_set() or not is_current():
+                return False
+
+            text = blocks[i]['text']
+            rect = (blocks[i]['x'], blocks[i]['y'], blocks[i]['w'], blocks[i]['h'])
+            try:
+                translated = self.translator.translate(
+                    text,
+                    target_lang=self.target_lang,
+                    source_lang=self.source_lang
+                )
+                translations[i] = (translated, rect)
+                self.db_manager.cache_text_translation(text, self.source_lang, self.target_lang, translated)
+            except Exception as e:
+                self.logger.error(f"Translation error: {e}")
+                translations[i] = (text, rect)
+            if on_translated:
+                on_translated(translations[i])
+        return True
+
+    # --- Pipeline plumbing ---
+
+    def is_current(self, job):
+        return job['generation'] == self.generation
+
+    def submit(self, sct_img, kind, tiles=None):
+        """Snapshots the frame into a held ring slot and queues it for the OCR stage."""
+        try:
+            self.frames.snapshot(sct_img.raw)
+        except RuntimeError: # Every slot still held by in-flight jobs; retry on a later frame
+            return
+        job = {'kind': kind, 'generation': self.generation, 'slot': self.frames.hold(),
+               'size': sct_img.size, 'tiles': tiles, 'submitted': time.time(), 'timings': {}}
+        with self.state_lock:
+            # The tiles' OCR reference is the frame being OCR'd, so later changes still show as dirty
+            if kind == JOB_FULL:
+                self.tiles.update(sct_img.raw, time.time())
+                self.tiles.set_anchor()
+            else:
+                self.tiles.set_anchor(tiles)
+                self.pending_tiles &= ~tiles
+            self.ocr_job = job
+        self.ocr_queue.put(job)
+
+    def release_frame(self, job):
+        if job.get('slot') is not None:
+            self.frames.release(job['slot'])
+            job['slot'] = None
+
+    def drop_job(self, job):
+        """A queue evicted `job` unprocessed: free its frame and let its work be redone."""
+        self.release_frame(job)
+        with self.state_lock:
+            if self.ocr_job is job:
+                self.ocr_job = None
+            if self.translate_job is job:
+                self.translate_job = None
+            if job['kind'] == JOB_TILES and self.is_current(job):
+                self.pending_tiles |= job['tiles']
+
+    def ocr_done(self, job):
+        self.release_frame(job)
+        with self.state_lock:
+            if self.ocr_job is job:
+                self.ocr_job = None
+
+    def lookup_done(self, job):
+        # Unless it went on to the translation stage, the job ends here (finished, stale or failed)
+        if not job.get('translating'):
+            self.translate_done(job)
+
+    def translate_done(self, job):
+        with self.state_lock:
+            if self.translate_job is job:
+                self.translate_job = None
+
+    # --- Stages ---
+
+    def ocr_stage(self, job):
+        """Layout + OCR (+ stabilizer for full frames) on the held snapshot."""
+        start = time.time()
+        frame = self.frames.frames[job['slot']]
+        img = Image.frombuffer("RGB", job['size'], frame, "raw", "BGRX", 0, 1)
+        layout_blocks = self.get_layout_boxes(img)
+        if job['kind'] == JOB_TILES:
+            layout_blocks = [b for b in layout_blocks if self.tiles.intersects(b['rect'], job['tiles'])]
+        blocks = self.ocr_blocks(layout_blocks, img)
+        self.release_frame(job) # Crops are copies; the slot can be reused now
+        job['timings']['ocr'] = time.time() - start
+
+        with self.state_lock:
+            if not self.is_current(job):
+                return
+            if job['kind'] == JOB_FULL:
+                # Stabilize (Filter out noise); nothing stable yet means the capture loop sends another frame
+                self.stabilizer.add_frame(blocks)
+                blocks = self.stabilizer.get_stable_blocks()
+                if not blocks:
+                    return
+                self.translate_job = job
+        job['blocks'] = blocks
+        self.lookup_queue.put(job)
+
+    def lookup_stage(self, job):
+        start = time.time()
+        job['translations'], job['misses'] = self.lookup_blocks(job['blocks'])
+        job['timings']['lookup'] = time.time() - start
+        # Cache hits go on screen now; a full frame starts from a clean overlay
+        cached = [t for t in job['translations'] if t is not None]
+        if not self.show(job, cached, replace=job['kind'] == JOB_FULL):
+            return
+        if job['misses']:
+            job['translating'] = True
+            self.translate_queue.put(job)
+        else:
+            self.finish(job)
+
+    def translate_stage(self, job):
+        start = time.time()
+        if not self.translate_misses(job['blocks'], job['translations'], job['misses'],
+                                     is_current=lambda: self.is_current(job),
+                                     on_translated=lambda entry: self.show(job, [entry])):
+            return
+        job['timings']['translate'] = time.time() - start
+        self.finish(job)
+
+    def show(self, job, entries, replace=False):
+        """
+        Puts `entries` on screen, replacing the overlay or the entries of earlier
+        jobs they overlap (a job's own blocks may overlap and all stay), unless an
+        invalidation got there first. Returns False for a stale job.
+        """
+        with self.state_lock:
+            if not self.is_current(job) or self.stop_event.is_set():
+                return False
+            shown = job.setdefault('shown', [])
+            if replace:
+                self.translations = list(entries)
+                self.result_ready.emit(list(entries))
+            elif entries:
+                new_rects = [r for t, r in entries]
+                removed = [(t, r) for t, r in self.translations
+                           if (t, r) not in shown and any(rects_overlap(r, n) for n in new_rects)]
+                self.translations = [entry for entry in self.translations if entry not in removed] + list(entries)
+                self.result_merged.emit(list(entries), removed)
+            shown.extend(entries)
+            # Update Masked Regions for next frame
+            self.masked_regions = [r for t, r in self.translations]
+            now = time.time()
+            self.unanchored = [(r, t) for r, t in self.unanchored if r in self.masked_regions]
+            self.unanchored += [(r, now) for t, r in entries]
+            if entries and 'first_shown' not in job:
+                job['first_shown'] = time.time()
+        return True
+
+    def finish(self, job):
+        """The job's last translation is on screen."""
+        with self.state_lock:
+            if not self.is_current(job) or self.stop_event.is_set():
+                return
+            if job['kind'] == JOB_FULL:
+                self.is_translated = True # Done. Wait for movement to reset.
+                self.pending_tiles[:] = False
+
+        now = time.time()
+        first = f"first {job['first_shown'] - job['submitted']:.2f}s, " if 'first_shown' in job else ""
+        stages = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in job['timings'].items())
+        self.logger.info(f"{job['kind'].capitalize()} job: {sum(1 for t in job['translations'] if t)} blocks on screen "
+                         f"({first}last {now - job['submitted']:.2f}s after capture; {stages})")
+
+    def start_pipeline(self):
+        for name, inbox, handler, on_done in (
+                ("ocr", self.ocr_queue, self.ocr_stage, self.ocr_done),
+                ("lookup", self.lookup_queue, self.lookup_stage, self.lookup_done),
+                ("translate", self.translate_queue, self.translate_stage, self.translate_done)):
+            stage = PipelineStage(name, inbox, handler, self.is_current, self.stop_event, self.logger, on_done)
+            stage.start()
+            self.stages.append(stage)
+
+    # --- Capture / diff (this thread) ---
+
+    def update_dirty_tiles(self, sct_img):
+        """
+        Invalidates overlay entries whose tiles changed since the OCR and, once
+        those tiles have settled, queues a job that re-OCRs just the blocks touching them.
+        A block is only masked until the overlay has painted it; then the frame
+        with the paint becomes its reference, so a change under it still counts.
+        Returns True when too much changed and the overlay was cleared instead.
+        """
+        now = time.time()
+        self.tiles.update(sct_img.raw, now) # The overlay's paint stamps its tiles too, so re-anchoring waits for it
+        with self.state_lock:
+            unanchored = list(self.unanchored)
+        dirty = self.tiles.dirty([r for r, t in unanchored])
+
+        if dirty.any():
+            if dirty.mean() > FULL_REFRESH_FRACTION:
+                self.clear_overlay()
+                self.logger.info(f"Anchor Drift ({dirty.mean():.0%} of tiles changed). Overlay cleared.")
+                return True
+
+            with self.state_lock:
+                kept = [(t, r) for t, r in self.translations if not self.tiles.intersects(r, dirty)]
+                if len(kept) != len(self.translations):
+                    self.logger.info(f"{len(self.translations) - len(kept)} overlay blocks invalidated by dirty tiles")
+                    self.translations = kept
+                    self.masked_regions = [r for t, r in kept]
+                    self.unanchored = [(r, t) for r, t in self.unanchored if r in self.masked_regions]
+                    self.result_ready.emit(list(kept))
+                self.pending_tiles |= dirty
+
+        with self.state_lock:
+            if self.unanchored:
+                still = self.tiles.settled(now, OVERLAY_SETTLE_SECONDS)
+                painted = [(r, t) for r, t in self.unanchored
+                           if now - t >= OVERLAY_SETTLE_SECONDS and still[self.tiles.tile_slices(r)].all()]
+                if painted:
+                    self.tiles.set_anchor_rects([r for r, t in painted])
+                    self.unanchored = [entry for entry in self.unanchored if entry not in painted]
+            ready = self.pending_tiles & self.tiles.settled(now, TILE_SETTLE_SECONDS)
+        if ready.any() and self.ocr_job is None:
+            self.submit(sct_img, JOB_TILES, tiles=ready)
+            self.logger.info(f"Queued re-OCR of {int(ready.sum())} dirty tiles")
+        return False
 
     def run(self):
         try:
@@ -189,26 +478,14 @@ class TranslationWorker(QThread):
             self.logger.error(f"Failed to init services: {e}")
             return
 
-        # 1. Try default system path (if added to PATH)
-        pytesseract.pytesseract.tesseract_cmd = "tesseract"
-
-        # 2. If that fails, check common Windows paths
-        default_paths = [
-            r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-            r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-            os.path.join(os.getenv('LOCALAPPDATA'), r"Tesseract-OCR\tesseract.exe")
-        ]
-        
-        for path in default_paths:
-            if os.path.exists(path):
-                pytesseract.pytesseract.tesseract_cmd = path
-                break
+        configure_tesseract()
+        workers = os.cpu_count() or 1
+        self.ocr_pool = create_ocr_pool(workers)
+        self.ocr_planner = OcrPlanner.for_backend(get_ocr_backend().name, workers)
         
-        # Init timing to current time so we don't wait immediately on startup
         # Init timing to current time so we don't wait immediately on startup
         self.last_movement_time = time.time()
         
-        # Start Input Listeners
         # Start Input Listeners
         self.mouse_listener.start()
         self.key_listener.start()
@@ -219,42 +496,35 @@ class TranslationWorker(QThread):
                 try:
                     # 1. Capture Screen
                     sct_img = sct.grab(self.monitor)
-                    img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
+                    if self.motion is None:
+                        self.motion = MotionDetector(sct_img.width, sct_img.height)
+                        # Slots: current snapshot plus ones held by an in-flight and an invalidated job
+                        self.frames = FrameRing(self.motion, frame_slots=4)
+                        self.tiles = TileTracker(sct_img.width, sct_img.height)
+                        self.pending_tiles = np.zeros(self.tiles.grid_shape, dtype=bool)
+                        self.start_pipeline()
                     
                     if self.stop_event.is_set(): break
 
-                    # 2. Motion Detection
+                    # 2. Motion Detection (on a strided thumbnail of the raw buffer, no PIL image)
+                    # Keeps running while the stages work, so movement is noticed mid-translation.
+                    thumb = self.frames.push(sct_img.raw)
                     diff = 0.0
-                    if self.last_raw_img:
-                        diff = self.get_image_diff(self.last_raw_img, img, self.masked_regions)
-
-                    if self.is_translated and self.anchor_frame:
-                        anchor_diff = self.get_image_diff(self.anchor_frame, img, self.masked_regions)
-                        if anchor_diff > 10.0: # Moderate threshold for cumulative drift
-                             self.result_ready.emit([]) 
-                             self.stabilizer.reset()
-                             self.is_translated = False
-                             self.masked_regions = []
-                             self.anchor_frame = None
-                             self.logger.info(f"Anchor Drift (Diff: {anchor_diff:.1f}). Overlay cleared.")
-                             self.last_movement_time = time.time()
-                             continue
+                    if self.frames.previous is not None:
+                        diff = self.get_image_diff(self.frames.previous_thumb, thumb, self.masked_regions)
+
 
                     # LOGIC: HIGH MOVEMENT (SCROLLING / SCENE CHANGE)
                     # Reduced threshold from 30.0 to 15.0 for better responsiveness
                     if diff > 15.0: 
                         self.last_movement_time = time.time() # Reset timer
                         
-                        # If we were previously static/translated, CLEAR the overlay now.
-                        if self.is_translated or len(self.stabilizer.history) > 0:
-                            self.result_ready.emit([]) # Clear UI
-                            self.stabilizer.reset()
-                            self.is_translated = False
-                            self.masked_regions = [] # Clear masks
-                            self.anchor_frame = None
+                        # If we were previously static/translated (or still working on it), CLEAR now.
+                        if self.has_overlay_work():
+                            self.clear_overlay()
                             self.logger.info(f"Screen moving (Diff: {diff:.1f}). Overlay cleared.")
                         
-                        self.last_raw_img = img.copy()
+                        self.frames.keep_current_as_previous()
                         time.sleep(0.02) # Fast loop while moving
                         continue
 
@@ -262,79 +532,27 @@ class TranslationWorker(QThread):
                     # Even if diff is small (e.g. 5.0 - 29.0), we wait for it to settle for 1s.
                     # This lets animations play out without triggering constant re-OCR.
                     if time.time() - self.last_movement_time < 1.0:
-                        self.last_raw_img = img.copy()
+                        self.frames.keep_current_as_previous()
                         time.sleep(0.05) # Wait state
                         continue
 
                     # LOGIC: ALREADY TRANSLATED?
-                    # If stable for >1s and we already finished translating, do nothing.
+                    # Only tiles that changed since the OCR are invalidated and re-OCR'd.
                     if self.is_translated:
+                        if self.update_dirty_tiles(sct_img):
+                            self.last_movement_time = time.time()
+                            continue
+                        self.frames.keep_current_as_previous()
                         time.sleep(0.1)
                         continue
 
                     # --- TRANSLATION START ---
-                    # Screen is static for > 1.0s and needs translation.
-                    
-                    # 1. OCR
-                    layout_blocks = self.get_layout_boxes(img)
-                    raw_blocks = []
-                    
-                    for item in layout_blocks:
-                        try:
-                            text = pytesseract.image_to_string(item['crop'], lang=self.source_lang, config='--psm 6')
-                            text = text.strip()
-                            if text:
-                                x, y, w, h = item['rect']
-                                raw_blocks.append({'text': text, 'x': x, 'y': y, 'w': w, 'h': h})
-                        except:
-                            pass
-
-                    # 2. Stabilize (Filter out noise)
-                    self.stabilizer.add_frame(raw_blocks)
-                    stable_lines = self.stabilizer.get_stable_blocks()
-                    
-                    # If stabilizer returns nothing yet (needs 2 frames), loop again.
-                    if not stable_lines:
-                        self.last_raw_img = img.copy()
-                        continue
+                    # Screen is static for > 1.0s: hand the frame to the pipeline unless
+                    # a frame is already being OCR'd or stable blocks are being translated.
+                    if self.ocr_job is None and self.translate_job is None:
+                        self.submit(sct_img, JOB_FULL)
 
-                    translations = []
-                    
-                    for line in stable_lines:
-                        if self.stop_event.is_set(): break
-                        
-                        text = line['text']
-                        x, y, w, h = line['x'], line['y'], line['w'], line['h']
-                        
-                        # Cache Check
-                        cached = self.db_manager.get_cached_text(text, self.source_lang, self.target_lang)
-                        if cached:
-                            translations.append((cached, (x, y, w, h)))
-                            continue
-
-                        # Translate
-                        try:
-                            translated = self.translator.translate(
-                                text, 
-                                target_lang=self.target_lang, 
-                                source_lang=self.source_lang
-                            )
-                            translations.append((translated, (x, y, w, h)))
-                            self.db_manager.cache_text_translation(text, self.source_lang, self.target_lang, translated)
-                        except Exception as e:
-                            self.logger.error(f"Translation error: {e}")
-                            translations.append((text, (x, y, w, h)))
-                    
-                    # 3. Emit Results
-                    if not self.stop_event.is_set():
-                        self.result_ready.emit(translations)
-                        self.is_translated = True # Done. Wait for movement to reset.
-                        # Update Masked Regions for next frame
-                        self.masked_regions = [r for t, r in translations]
-                        # Set Anchor Frame (Snapshot of what we just translated)
-                        self.anchor_frame = img.copy()
-
-                    self.last_raw_img = img.copy()
+                    self.frames.keep_current_as_previous()
                     
                     # Cleanup
                     del sct_img
@@ -342,4 +560,8 @@ class TranslationWorker(QThread):
                         
                 except Exception as e:
                     self.logger.error(f"Worker loop error: {e}")
-                    time.sleep(1)
\ No newline at end of file
+                    time.sleep(1)
+
+        for stage in self.stages:
+            stage.join(timeout=1.0)
+        self.ocr_pool.shutdown(wait=False, cancel_futures=True)
@@ -6,7 +6,7 @@ from typing import Optional
 
 def get_app_data_path(filename):
     # Creates: C:\Users\Name\AppData\Roaming\FnTranslate\filename
-    app_dir = os.path.join(os.getenv('APPDATA'), 'FnTranslate')
+    app_dir = os.path.join(os.getenv('APPDATA') or os.path.expanduser('~'), 'FnTranslate')
     if not os.path.exists(app_dir):
         os.makedirs(app_dir)
     return os.path.join(app_dir, filename)
@@ -64,10 +64,12 @@ class DBManager:
                 file_hash TEXT,
                 source_lang TEXT,
                 target_lang TEXT,
+                output_format TEXT,
+                preserve_format INTEGER,
                 original_filename TEXT,
                 translated_file_path TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (file_hash, target_lang)
+                PRIMARY KEY (file_hash, target_lang, output_format, preserve_format)
             )
             """,
             # 3. SETTINGS (For API Keys, etc)
@@ -82,6 +84,10 @@ class DBManager:
         
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            # The file cache used to be keyed on (file_hash, target_lang) only; it is a cache, so drop it
+            columns = [row['name'] for row in cursor.execute("PRAGMA table_info(file_cache)")]
+            if columns and 'output_format' not in columns:
+                cursor.execute("DROP TABLE file_cache")
             for query in queries:
                 cursor.execute(query)
             conn.commit()
@@ -102,7 +108,8 @@ class DBManager:
             logger.error(f"Failed to hash file {file_path}: {e}")
             return ""
 
-    def get_cached_file(self, file_path: str, target_lang: str) -> Optional[str]:
+    def get_cached_file(self, file_path: str, target_lang: str,
+                        output_format: str = '', preserve_format: bool = True) -> Optional[str]:
         if not os.path.exists(file_path):
             return None
 
@@ -110,12 +117,12 @@ class DBManager:
         
         query = """
             SELECT translated_file_path FROM file_cache 
-            WHERE file_hash = ? AND target_lang = ?
+            WHERE file_hash = ? AND target_lang = ? AND output_format = ? AND preserve_format = ?
         """
         
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, (file_hash, target_lang))
+            cursor.execute(query, (file_hash, target_lang, output_format, int(preserve_format)))
             row = cursor.fetchone()
             
             if row:
@@ -125,31 +132,36 @@ class DBManager:
                     return cached_path
                 else:
                     logger.warning("Cached file missing from disk. Removing record.")
-                    self.remove_file_cache(file_hash, target_lang)
+                    self.remove_file_cache(file_hash, target_lang, output_format, preserve_format)
             
             return None
 
-    def cache_file_translation(self, original_path: str, translated_path: str, src_lang: str, target_lang: str):
+    def cache_file_translation(self, original_path: str, translated_path: str, src_lang: str, target_lang: str,
+                               output_format: str = '', preserve_format: bool = True):
         file_hash = self.compute_file_hash(original_path)
         filename = os.path.basename(original_path)
         
         query = """
             INSERT OR REPLACE INTO file_cache 
-            (file_hash, source_lang, target_lang, original_filename, translated_file_path)
-            VALUES (?, ?, ?, ?, ?)
+            (file_hash, source_lang, target_lang, output_format, preserve_format, original_filename, translated_file_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
         """
         
         try:
             with self._get_connection() as conn:
-                conn.execute(query, (file_hash, src_lang, target_lang, filename, translated_path))
+                conn.execute(query, (file_hash, src_lang, target_lang, output_format, int(preserve_format),
+                                     filename, translated_path))
                 conn.commit()
             logger.info(f"File cached successfully: {filename}")
         except Exception as e:
             logger.error(f"Failed to cache file: {e}")
 
-    def remove_file_cache(self, file_hash: str, target_lang: str):
+    def remove_file_cache(self, file_hash: str, target_lang: str,
+                          output_format: str = '', preserve_format: bool = True):
         with self._get_connection() as conn:
-            conn.execute("DELETE FROM file_cache WHERE file_hash = ? AND target_lang = ?", (file_hash, target_lang))
+            conn.execute("DELETE FROM file_cache WHERE file_hash = ? AND target_lang = ? "
+                         "AND output_format = ? AND preserve_format = ?",
+                         (file_hash, target_lang, output_format, int(preserve_format)))
             conn.commit()
 
     # =========================================================
@@ -236,5 +248,5 @@ class DBManager:
 
 # Helper function to get singleton
 def get_db_manager():
-    db_path = os.path.join(os.getenv('APPDATA'), 'FnTranslate', 'FnTranslate_database.db')
+    db_path = os.path.join(os.getenv('APPDATA') or os.path.expanduser('~'), 'FnTranslate', 'FnTranslate_database.db')
     return DBManager(db_path)
\ No newline at end of file
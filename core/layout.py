@@ -0,0 +1,212 @@
+# core/layout.py
+import logging
+import cv2
+import numpy as np
+
+logger = logging.getLogger("Layout")
+
+# Morphology at full resolution; scaled down with the pyramid level
+THRESH_BLOCK_SIZE = 11
+THRESH_C = 2
+# Kernel (15, 12):
+# 15px Horizontal merge (Words -> Lines)
+# 12px Vertical merge (Lines -> Paragraphs)
+MERGE_KERNEL = (15, 12)
+MERGE_ITERATIONS = 2
+MIN_BOX_AREA = 200
+CROP_PAD = 10
+LAYOUT_MAX_SIDE = 1600 # Layout runs on the first pyramid level (1/2, 1/4, ...) at or below this size
+
+# Text-likelihood thresholds, from rendered UI text vs photos, icons and charts
+MIN_EDGE_DENSITY = 0.02 # Below: flat or blurred region (photo, gradient); 90px text is still ~0.03
+MAX_EDGE_DENSITY = 0.25 # Above: texture or noise; dense small text stays near 0.16
+MAX_INK_RATIO = 0.35 # Text covers ~8-15% of its box; textured photos binarize to ~45%
+MAX_DOMINANT_SHARE = 0.85 # Ink in the largest component; icons/plots ~1.0, bordered buttons ~0.7
+MAX_GLYPH_ASPECT = 1.2 # Ink this narrow and no taller than MAX_GLYPH_HEIGHT may be one glyph ("I", "1"),
+MAX_GLYPH_HEIGHT = 64 # where dominant share and edge density say nothing
+MAX_GLYPH_HEIGHT_CV = 0.25 # Glyphs left after removing rules share a line height (~0.15); chart bars do not (~0.33)
+MAX_STROKE_CV = 0.5 # Stroke width variation; rendered glyphs stay under ~0.3
+
+def text_features(gray):
+    """
+    Cheap features of a grayscale box: edge density, ink ratio, share of ink in
+    the largest connected component, aspect of the ink extent and stroke-width
+    variation (coefficient of variation of the distance transform along stroke ridges).
+    The dominant share is measured with long horizontal strokes removed, so an
+    underline joining every glyph of a link does not make it look like one shape.
+    """
+    if gray.mean() < 128: # Light text on a dark background: normalize polarity
+        gray = 255 - gray
+    area = gray.size
+    ink = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
+    ink_pixels = cv2.countNonZero(ink)
+    features = {
+        'edge_density': cv2.countNonZero(cv2.Canny(gray, 80, 200)) / area,
+        'ink_ratio': ink_pixels / area,
+        'dominant_share': 0.0,
+        'ink_aspect': 0.0,
+        'ink_height': 0,
+        'stroke_cv': 0.0
+    }
+    if not ink_pixels:
+        return features
+
+    x, y, w, h = cv2.boundingRect(ink)
+    features['ink_aspect'] = w / h
+    features['ink_height'] = h
+    # Horizontal runs longer than the ink is tall are rules/underlines, not glyph strokes
+    rules = cv2.morphologyEx(ink, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (h + 1, 1)))
+    glyphs = cv2.subtract(ink, rules)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(glyphs, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    heights = heights[heights >= heights.max() / 3] if count > 1 else heights # Skip dots and commas
+    if not (count > 1 and heights.std() <= MAX_GLYPH_HEIGHT_CV * heights.mean()):
+        # Nothing glyph-like under the rules (e.g. bars on a chart axis): judge the ink as it is
+        glyphs = ink
+        count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    if count > 1:
+        features['dominant_share'] = float(stats[1:, cv2.CC_STAT_AREA].max() / cv2.countNonZero(glyphs))
+
+    dist = cv2.distanceTransform(glyphs, cv2.DIST_L2, 3)
+    ridge = (dist >= cv2.dilate(dist, np.ones((3, 3), np.uint8))) & (glyphs > 0)
+    widths = dist[ridge]
+    if widths.size:
+        features['stroke_cv'] = float(widths.std() / widths.mean())
+    return features
+
+def looks_like_text(gray) -> bool:
+    """False for boxes that are clearly photos, icons, charts or texture."""
+    f = text_features(gray)
+    # A lone glyph is one component with little edge in a box sized by the merge margins
+    single_glyph = f['ink_aspect'] <= MAX_GLYPH_ASPECT and f['ink_height'] <= MAX_GLYPH_HEIGHT
+    return ((MIN_EDGE_DENSITY <= f['edge_density'] or single_glyph)
+            and f['edge_density'] <= MAX_EDGE_DENSITY
+            and f['ink_ratio'] <= MAX_INK_RATIO
+            and (f['dominant_share'] <= MAX_DOMINANT_SHARE or single_glyph)
+            and f['stroke_cv'] <= MAX_STROKE_CV)
+
+def pyramid_factor(width: int, height: int, max_side: int = LAYOUT_MAX_SIDE) -> int:
+    """Power-of-two downscale that brings the longer side to `max_side` or below."""
+    factor = 1
+    while max(width, height) > max_side * factor:
+        factor *= 2
+    return factor
+
+def dilation_growth(kernel, iterations: int):
+    """How far (left, top, right, bottom) a dilation pushes a box past its ink."""
+    kw, kh = kernel
+    ax, ay = kw // 2, kh // 2 # OpenCV's default (centre) anchor
+    return ((kw - 1 - ax) * iterations, (kh - 1 - ay) * iterations, ax * iterations, ay * iterations)
+
+def threshold(gray, block_size: int = THRESH_BLOCK_SIZE):
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                 cv2.THRESH_BINARY_INV, block_size, THRESH_C)
+
+def find_ink_boxes(gray, factor: int = 1):
+    """
+    Threshold + merge-dilation + contours on `gray` downscaled by `factor`, with
+    block size and kernel scaled to match. Returns the ink extent of every merged
+    region as full-resolution (x1, y1, x2, y2), accurate to about `factor` pixels.
+    """
+    if factor > 1:
+        small = cv2.resize(gray, (-(-gray.shape[1] // factor), -(-gray.shape[0] // factor)),
+                           interpolation=cv2.INTER_AREA)
+    else:
+        small = gray
+    block_size = max(3, int(THRESH_BLOCK_SIZE / factor) | 1)
+    kernel = (max(1, round(MERGE_KERNEL[0] / factor)), max(1, round(MERGE_KERNEL[1] / factor)))
+    left, top, right, bottom = dilation_growth(kernel, MERGE_ITERATIONS)
+
+    dilated = cv2.dilate(threshold(small, block_size), cv2.getStructuringElement(cv2.MORPH_RECT, kernel),
+                         iterations=MERGE_ITERATIONS)
+    contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    boxes = []
+    min_area = MIN_BOX_AREA / (2 * factor * factor) # Slack: the final area check runs at full resolution
+    for cnt in contours:
+        x, y, w, h = cv2.boundingRect(cnt)
+        if w * h > min_area:
+            boxes.append(((x + left) * factor, (y + top) * factor,
+                          (x + w - right) * factor, (y + h - bottom) * factor))
+    return boxes
+
+def refine_ink_box(gray, box, margin: int):
+    """
+    Snaps each edge of a coarse ink box to the outermost full-resolution ink
+    within `margin` pixels of it. Only thin bands along the four edges are
+    thresholded (with enough context for the adaptive threshold window).
+    Returns plain ints, or None for an empty box.
+    """
+    img_h, img_w = gray.shape
+    ctx = THRESH_BLOCK_SIZE // 2
+    x1, y1, x2, y2 = (max(0, min(v, lim)) for v, lim in zip(box, (img_w, img_h, img_w, img_h)))
+    if x2 <= x1 or y2 <= y1:
+        return None
+
+    def band_ink(bx1, by1, bx2, by2):
+        """Thresholded band [by1:by2, bx1:bx2] (clipped) and its origin."""
+        bx1, by1, bx2, by2 = max(0, bx1), max(0, by1), min(img_w, bx2), min(img_h, by2)
+        cx1, cy1 = max(0, bx1 - ctx), max(0, by1 - ctx)
+        ink = threshold(gray[cy1:min(img_h, by2 + ctx), cx1:min(img_w, bx2 + ctx)])
+        return ink[by1 - cy1:by2 - cy1, bx1 - cx1:bx2 - cx1], bx1, by1
+
+    cols, ox, _ = band_ink(x1 - margin, y1, x1 + margin, y2)
+    hits = np.flatnonzero(cols.any(axis=0))
+    x1 = int(ox + hits[0]) if hits.size else x1
+    cols, ox, _ = band_ink(x2 - margin, y1, x2 + margin, y2)
+    hits = np.flatnonzero(cols.any(axis=0))
+    x2 = int(ox + hits[-1] + 1) if hits.size else x2
+    rows, _, oy = band_ink(x1, y1 - margin, x2, y1 + margin)
+    hits = np.flatnonzero(rows.any(axis=1))
+    y1 = int(oy + hits[0]) if hits.size else y1
+    rows, _, oy = band_ink(x1, y2 - margin, x2, y2 + margin)
+    hits = np.flatnonzero(rows.any(axis=1))
+    y2 = int(oy + hits[-1] + 1) if hits.size else y2
+    return x1, y1, x2, y2
+
+def get_layout_boxes(pil_image, text_only: bool = True, max_side: int = LAYOUT_MAX_SIDE):
+    """
+    Finds text-like regions with OpenCV morphology.
+    Returns [{'crop': PIL.Image (padded), 'rect': (x, y, w, h)}, ...].
+    Large captures are analysed on a downscaled pyramid level and the boxes
+    are mapped back and refined at their edges at full resolution, so rects
+    match the full-resolution path to within a pixel or two.
+    With `text_only`, boxes that look like images (see looks_like_text) are
+    dropped before anyone OCRs them.
+    Shared by the live worker and offline image translation.
+    """
+    gray = np.asarray(pil_image.convert("L")) # Cheaper than copying RGB out and converting in OpenCV
+    img_h, img_w = gray.shape
+    factor = pyramid_factor(img_w, img_h, max_side)
+    # Rects keep the full-resolution dilation margin around the ink
+    left, top, right, bottom = dilation_growth(MERGE_KERNEL, MERGE_ITERATIONS)
+
+    blocks = []
+    rejected = 0
+    for box in find_ink_boxes(gray, factor):
+        if factor > 1:
+            box = refine_ink_box(gray, box, margin=2 * factor)
+            if box is None:
+                continue
+        x = max(0, box[0] - left)
+        y = max(0, box[1] - top)
+        w = min(img_w, box[2] + right) - x
+        h = min(img_h, box[3] + bottom) - y
+        if w * h <= MIN_BOX_AREA:
+            continue
+        if text_only and not looks_like_text(gray[y:y+h, x:x+w]):
+            rejected += 1
+            continue
+
+        x_pad = max(0, x - CROP_PAD)
+        y_pad = max(0, y - CROP_PAD)
+        w_pad = min(img_w - x_pad, w + 2 * CROP_PAD)
+        h_pad = min(img_h - y_pad, h + 2 * CROP_PAD)
+        blocks.append({
+            'crop': pil_image.crop((x_pad, y_pad, x_pad + w_pad, y_pad + h_pad)),
+            'rect': (x, y, w, h)
+        })
+
+    if rejected:
+        logger.debug(f"Layout: {len(blocks)} text boxes, {rejected} image regions skipped")
+    return blocks
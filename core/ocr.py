@@ -0,0 +1,276 @@
+# core/ocr.py
+import os
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# import pytesseract / tesserocr - Lazy loaded (keeps headless/parsing imports light)
+
+logger = logging.getLogger("OCR")
+
+# Common Windows install locations, tried when tesseract is not on PATH
+TESSERACT_PATHS = [
+    r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+    r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+]
+
+OCR_BACKEND_ENV = "FNTRANSLATE_OCR_BACKEND" # auto | tesserocr | pytesseract
+
+_configured = False
+_backend = None
+_backend_lock = threading.Lock()
+
+# Tesseract's own OpenMP threads would fight the OCR pool for the same cores
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+def configure_tesseract():
+    """Point pytesseract at the tesseract executable (once per process)."""
+    global _configured
+    if _configured:
+        return
+    import pytesseract
+
+    # 1. Try default system path (if added to PATH)
+    pytesseract.pytesseract.tesseract_cmd = "tesseract"
+
+    # 2. If that fails, check common Windows paths
+    default_paths = list(TESSERACT_PATHS)
+    if os.getenv('LOCALAPPDATA'):
+        default_paths.append(os.path.join(os.getenv('LOCALAPPDATA'), r"Tesseract-OCR\tesseract.exe"))
+
+    for path in default_paths:
+        if os.path.exists(path):
+            pytesseract.pytesseract.tesseract_cmd = path
+            break
+
+    logger.debug(f"Using tesseract at {pytesseract.pytesseract.tesseract_cmd}")
+    _configured = True
+
+def to_tesseract_lang(lang: str) -> str:
+    """Maps UI language values to a tesseract language code ('auto' -> 'eng')."""
+    if not lang or lang == "auto":
+        return "eng"
+    return lang
+
+class PytesseractBackend:
+    """Spawns the tesseract executable per call (temp files, models reloaded every time)."""
+    name = "pytesseract"
+
+    def __init__(self):
+        configure_tesseract()
+
+    def recognize(self, image, lang: str, psm: int) -> str:
+        import pytesseract
+        return pytesseract.image_to_string(image, lang=lang, config=f'--psm {psm}')
+
+    def recognize_tsv(self, image, lang: str, psm: int) -> str:
+        import pytesseract
+        return pytesseract.image_to_data(image, lang=lang, config=f'--psm {psm}')
+
+class TesserocrBackend:
+    """
+    In-process libtesseract through tesserocr. Each thread keeps one engine
+    per language, so models load once per session and crops never touch disk.
+    tesserocr releases the GIL while recognizing, so the OCR pool still scales.
+    """
+    name = "tesserocr"
+
+    def __init__(self):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self._local = threading.local()
+        self._tessdata = self._find_tessdata()
+
+    @staticmethod
+    def _find_tessdata() -> Optional[str]:
+        """tessdata next to a Windows install of the executable, else libtesseract's default."""
+        configure_tesseract()
+        import pytesseract
+        cmd = pytesseract.pytesseract.tesseract_cmd
+        tessdata = os.path.join(os.path.dirname(cmd), "tessdata") if os.path.dirname(cmd) else None
+        return tessdata if tessdata and os.path.isdir(tessdata) else None
+
+    def _engine(self, lang: str):
+        engines = getattr(self._local, 'engines', None)
+        if engines is None:
+            engines = self._local.engines = {}
+        engine = engines.get(lang)
+        if engine is None:
+            kwargs = {'lang': lang}
+            if self._tessdata:
+                kwargs['path'] = self._tessdata
+            engine = engines[lang] = self._tesserocr.PyTessBaseAPI(**kwargs)
+            logger.debug(f"Loaded tesserocr engine for '{lang}' in {threading.current_thread().name}")
+        return engine
+
+    def recognize(self, image, lang: str, psm: int) -> str:
+        engine = self._engine(lang)
+        engine.SetPageSegMode(psm)
+        engine.SetImage(image)
+        return engine.GetUTF8Text()
+
+    def recognize_tsv(self, image, lang: str, psm: int) -> str:
+        engine = self._engine(lang)
+        engine.SetPageSegMode(psm)
+        engine.SetImage(image)
+        engine.Recognize()
+        return engine.GetTSVText(0)
+
+OCR_BACKENDS = {
+    'tesserocr': TesserocrBackend,
+    'pytesseract': PytesseractBackend,
+}
+
+def get_ocr_backend():
+    """
+    The process-wide OCR backend. FNTRANSLATE_OCR_BACKEND picks one explicitly;
+    'auto' (default) prefers tesserocr and falls back to pytesseract.
+    """
+    global _backend
+    if _backend is not None:
+        return _backend
+    with _backend_lock:
+        if _backend is None:
+            choice = os.getenv(OCR_BACKEND_ENV, "auto").lower()
+            names = list(OCR_BACKENDS) if choice == "auto" else [choice]
+            for name in names:
+                try:
+                    _backend = OCR_BACKENDS[name]()
+                    break
+                except Exception as e: # ImportError, missing tessdata, unknown name
+                    logger.info(f"OCR backend '{name}' unavailable: {e}")
+            if _backend is None:
+                _backend = PytesseractBackend()
+            logger.info(f"Using OCR backend: {_backend.name}")
+    return _backend
+
+def ocr_image(image, lang: str = "eng", psm: int = 6) -> str:
+    """Runs tesseract on a PIL image and returns the stripped text."""
+    text = get_ocr_backend().recognize(image, to_tesseract_lang(lang), psm)
+    return text.strip()
+
+def parse_tsv(tsv: str) -> List[Dict]:
+    """Word rows of tesseract TSV output: [{'text', 'conf', 'rect', 'block', 'par', 'line'}, ...]."""
+    words = []
+    for row in tsv.splitlines():
+        cols = row.split('\t')
+        # level page block par line word left top width height conf text; level 5 = word
+        if len(cols) < 12 or cols[0] != '5' or not cols[11].strip():
+            continue
+        try:
+            left, top, width, height = (int(c) for c in cols[6:10])
+            words.append({
+                'text': cols[11].strip(),
+                'conf': float(cols[10]),
+                'rect': (left, top, width, height),
+                'block': int(cols[2]),
+                'par': int(cols[3]),
+                'line': int(cols[4])
+            })
+        except ValueError:
+            continue
+    return words
+
+def join_lines(words: List[Dict]) -> str:
+    """Words joined by spaces, tesseract lines by newlines, in reading order."""
+    lines = {}
+    for word in words:
+        lines.setdefault((word['block'], word['par'], word['line']), []).append(word['text'])
+    return '\n'.join(' '.join(line) for line in lines.values())
+
+def mean_confidence(words: List[Dict]) -> float:
+    """Mean word confidence (0-100), -1 when tesseract reported none."""
+    confs = [w['conf'] for w in words if w['conf'] >= 0]
+    return sum(confs) / len(confs) if confs else -1.0
+
+def group_words(words: List[Dict], offset=(0, 0)) -> List[Dict]:
+    """
+    Groups words into paragraph blocks like per-crop OCR returns them,
+    with the union of word boxes shifted by `offset`.
+    Returns [{'text', 'x', 'y', 'w', 'h', 'conf'}, ...].
+    """
+    paragraphs = {}
+    for word in words:
+        paragraphs.setdefault((word['block'], word['par']), []).append(word)
+
+    blocks = []
+    for para in paragraphs.values():
+        x1 = min(w['rect'][0] for w in para)
+        y1 = min(w['rect'][1] for w in para)
+        x2 = max(w['rect'][0] + w['rect'][2] for w in para)
+        y2 = max(w['rect'][1] + w['rect'][3] for w in para)
+        blocks.append({
+            'text': join_lines(para),
+            'x': x1 + offset[0], 'y': y1 + offset[1], 'w': x2 - x1, 'h': y2 - y1,
+            'conf': mean_confidence(para)
+        })
+    return blocks
+
+def assign_words(words: List[Dict], rects, offset=(0, 0)) -> List[List[Dict]]:
+    """Words per (x, y, w, h) rect, by where each word's centre (shifted by `offset`) falls; the rest are dropped."""
+    assigned = [[] for _ in rects]
+    for word in words:
+        left, top, w, h = word['rect']
+        cx, cy = left + w / 2 + offset[0], top + h / 2 + offset[1]
+        for i, (x, y, bw, bh) in enumerate(rects):
+            if x <= cx < x + bw and y <= cy < y + bh:
+                assigned[i].append(word)
+                break
+    return assigned
+
+def ocr_image_data(image, lang: str = "eng", psm: int = 6) -> Tuple[str, float]:
+    """Like ocr_image, but also returns the mean word confidence (0-100, -1 if none)."""
+    words = parse_tsv(get_ocr_backend().recognize_tsv(image, to_tesseract_lang(lang), psm))
+    return join_lines(words), mean_confidence(words)
+
+def ocr_page(image, lang: str = "eng", psm: int = 3, offset=(0, 0)) -> List[Dict]:
+    """
+    One OCR pass over a whole region (tesseract does its own page layout),
+    returned as paragraph blocks in the coordinates of `offset`.
+    """
+    tsv = get_ocr_backend().recognize_tsv(image, to_tesseract_lang(lang), psm)
+    return group_words(parse_tsv(tsv), offset)
+
+def ocr_page_rects(image, rects, lang: str = "eng", psm: int = 3, offset=(0, 0)) -> List[Optional[Tuple[str, float]]]:
+    """
+    One OCR pass over a region, read back per layout rect (in the coordinates of
+    `offset`) so each block can be cached like a crop. Returns (text, mean
+    confidence) per rect, in order; words outside every rect are dropped and
+    all entries are None if the call failed.
+    """
+    try:
+        words = parse_tsv(get_ocr_backend().recognize_tsv(image, to_tesseract_lang(lang), psm))
+    except Exception as e:
+        logger.error(f"Page OCR failed: {e}")
+        return [None] * len(rects)
+    return [(join_lines(found), mean_confidence(found)) for found in assign_words(words, rects, offset)]
+
+def create_ocr_pool(max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """
+    Pool for parallel OCR, one worker per core. Threads are enough: each call
+    either blocks on its own tesseract process (pytesseract) or runs in
+    libtesseract with the GIL released (tesserocr).
+    """
+    return ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, thread_name_prefix="ocr")
+
+def ocr_images(images, lang: str = "eng", psm: Union[int, Sequence[int]] = 6, executor: Optional[Executor] = None,
+               with_confidence: bool = False) -> List:
+    """
+    OCRs many images across `executor`; results come back in input order (None on failure).
+    `psm` is one mode for all images or one per image.
+    Each result is the text, or (text, confidence) with `with_confidence`.
+    """
+    ocr = ocr_image_data if with_confidence else ocr_image
+    psms = [psm] * len(images) if isinstance(psm, int) else list(psm)
+
+    def recognize(image, image_psm):
+        try:
+            return ocr(image, lang=lang, psm=image_psm)
+        except Exception as e:
+            logger.error(f"OCR failed: {e}")
+            return None
+
+    if executor is None or len(images) < 2:
+        return [recognize(image, image_psm) for image, image_psm in zip(images, psms)]
+    return list(executor.map(recognize, images, psms))
@@ -0,0 +1,96 @@
+# core/ocr_cache.py
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("OCRCache")
+
+class OcrCache:
+    """
+    Size-bounded LRU of OCR results (text or (text, confidence)) keyed by a
+    difference hash (dHash) of the crop, its size, the language and the PSM.
+    Unchanged blocks skip tesseract.
+
+    `max_distance` is the hash tolerance: 0 only accepts identical hashes,
+    higher values also accept crops whose hashes differ in that many bits
+    (checked against crops of the same size). Tune it with `stats()`.
+    """
+
+    def __init__(self, max_entries: int = 2048, hash_size: int = 16, max_distance: int = 0):
+        """
+        Args:
+            max_entries: Cached crops across all languages/PSMs.
+            hash_size: dHash grid edge; 16 -> 256-bit hash, fine enough for text.
+            max_distance: Max Hamming distance counted as the same crop.
+        """
+        self.max_entries = max_entries
+        self.hash_size = hash_size
+        self.max_distance = max_distance
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def dhash(self, image) -> int:
+        """Horizontal gradient hash of a grayscale thumbnail."""
+        from PIL import Image
+        small = image.convert("L").resize((self.hash_size + 1, self.hash_size), Image.Resampling.BILINEAR)
+        pixels = small.tobytes()
+        row = self.hash_size + 1
+        bits = 0
+        for y in range(self.hash_size):
+            offset = y * row
+            for x in range(self.hash_size):
+                bits = (bits << 1) | (pixels[offset + x] > pixels[offset + x + 1])
+        return bits
+
+    def key(self, image, lang: str, psm: Optional[int]) -> tuple:
+        """psm None means the PSM is planned per crop (so it is implied by the crop itself)."""
+        return (lang, psm, image.size, self.dhash(image))
+
+    def get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+
+            if self.max_distance:
+                lang, psm, size, bits = key
+                for (e_lang, e_psm, e_size, e_bits), e_text in self._entries.items():
+                    if (e_lang, e_psm, e_size) == (lang, psm, size) and \
+                            (e_bits ^ bits).bit_count() <= self.max_distance:
+                        self.near_hits += 1
+                        return e_text
+
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, text: Any):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.near_hits + self.misses
+        return (self.hits + self.near_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'near_hits': self.near_hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 3),
+            'max_distance': self.max_distance
+        }
@@ -0,0 +1,90 @@
+# core/ocr_filter.py
+import os
+import threading
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger("OCRFilter")
+
+# Defaults, overridable per process
+DEFAULT_MIN_CONFIDENCE = float(os.getenv("FNTRANSLATE_OCR_MIN_CONF", "55"))
+DEFAULT_MIN_ALPHA_RATIO = float(os.getenv("FNTRANSLATE_OCR_MIN_ALPHA", "0.5"))
+
+class OcrQualityFilter:
+    """
+    Drops OCR blocks that are almost certainly noise (icons, borders, partial
+    glyphs) before they reach the stabilizer and the paid translation API.
+    A block is rejected when its mean word confidence is below `min_confidence`
+    or when letters make up less than `min_alpha_ratio` of its non-space
+    characters (so pure numbers and symbol runs are skipped too).
+    """
+
+    def __init__(self, min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                 min_alpha_ratio: float = DEFAULT_MIN_ALPHA_RATIO, max_tracked: int = 4096):
+        """
+        Args:
+            min_confidence: Mean tesseract word confidence (0-100); 0 disables the check.
+            min_alpha_ratio: Share of letters among non-space characters; 0 disables the check.
+            max_tracked: Distinct rejected texts remembered for the API-call estimate.
+        """
+        self.min_confidence = min_confidence
+        self.min_alpha_ratio = min_alpha_ratio
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
+        self._rejected_texts = set()
+        self.checked = 0
+        self.low_confidence = 0
+        self.low_alpha = 0
+        self.api_calls_saved = 0
+
+    @staticmethod
+    def alpha_ratio(text: str) -> float:
+        chars = [c for c in text if not c.isspace()]
+        return sum(c.isalpha() for c in chars) / len(chars) if chars else 0.0
+
+    def reason(self, text: str, conf: float = -1.0):
+        """Why a block would be rejected ('confidence' / 'alpha'), or None to keep it."""
+        if self.min_confidence and 0 <= conf < self.min_confidence:
+            return 'confidence'
+        if self.min_alpha_ratio and self.alpha_ratio(text) < self.min_alpha_ratio:
+            return 'alpha'
+        return None
+
+    def filter(self, blocks: List[Dict]) -> List[Dict]:
+        """Keeps the blocks ({'text', 'conf', ...}) worth translating and counts the rest."""
+        kept = []
+        with self._lock:
+            for block in blocks:
+                self.checked += 1
+                reason = self.reason(block['text'], block.get('conf', -1.0))
+                if reason is None:
+                    kept.append(block)
+                    continue
+                if reason == 'confidence':
+                    self.low_confidence += 1
+                else:
+                    self.low_alpha += 1
+                # A text is translated (and cached) once, so only new noise costs an API call
+                if block['text'] not in self._rejected_texts:
+                    if len(self._rejected_texts) >= self.max_tracked:
+                        self._rejected_texts.clear()
+                    self._rejected_texts.add(block['text'])
+                    self.api_calls_saved += 1
+        if len(kept) != len(blocks):
+            logger.debug(f"Filtered {len(blocks) - len(kept)}/{len(blocks)} noise blocks")
+        return kept
+
+    @property
+    def rejected(self) -> int:
+        return self.low_confidence + self.low_alpha
+
+    def stats(self) -> Dict:
+        return {
+            'checked': self.checked,
+            'rejected': self.rejected,
+            'low_confidence': self.low_confidence,
+            'low_alpha': self.low_alpha,
+            'api_calls_saved': self.api_calls_saved,
+            'min_confidence': self.min_confidence,
+            'min_alpha_ratio': self.min_alpha_ratio
+        }
@@ -0,0 +1,73 @@
+# core/ocr_mosaic.py
+import logging
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from core.ocr import assign_words, get_ocr_backend, mean_confidence, parse_tsv, to_tesseract_lang
+
+# PIL - Lazy loaded
+
+logger = logging.getLogger("OCRMosaic")
+
+MOSAIC_GAP = 24 # Blank pixels between crops; wider than a word gap so lines never join across crops
+MOSAIC_MAX_WIDTH = 2048
+
+def pack_shelves(sizes: List[Tuple[int, int]], max_width: int = MOSAIC_MAX_WIDTH,
+                 gap: int = MOSAIC_GAP) -> Tuple[List[Tuple[int, int]], Tuple[int, int]]:
+    """
+    Shelf bin-packing, tallest first: crops fill rows left to right up to `max_width`.
+    Returns the (x, y) of each size in input order and the mosaic (width, height).
+    """
+    positions = [None] * len(sizes)
+    x = y = gap
+    shelf_height = 0
+    width = 0
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        w, h = sizes[i]
+        if x > gap and x + w + gap > max_width:
+            x = gap
+            y += shelf_height + gap
+            shelf_height = 0
+        positions[i] = (x, y)
+        x += w + gap
+        shelf_height = max(shelf_height, h)
+        width = max(width, x)
+    return positions, (width, y + shelf_height + gap)
+
+def build_mosaic(images):
+    """Pastes the crops onto one canvas in their background colour. Returns (mosaic, [(x, y, w, h), ...])."""
+    from PIL import Image
+    positions, size = pack_shelves([image.size for image in images])
+    background = Counter(image.convert("RGB").getpixel((0, 0)) for image in images).most_common(1)[0][0]
+    mosaic = Image.new("RGB", size, background)
+    for image, position in zip(images, positions):
+        mosaic.paste(image, position)
+    return mosaic, [(x, y, image.width, image.height) for image, (x, y) in zip(images, positions)]
+
+def ocr_mosaic(images, lang: str = "eng", psm: int = 11) -> List[Optional[Tuple[str, float]]]:
+    """
+    OCRs many small crops with one tesseract call and maps each recognized word
+    back to the crop its centre falls in. Returns (text, mean confidence) per
+    image, in order (('', -1) when nothing was read, all None if the call failed).
+    PSM 11 (sparse text) finds the scattered labels without assuming one column of prose.
+    """
+    if not images:
+        return []
+    mosaic, boxes = build_mosaic(images)
+    try:
+        words = parse_tsv(get_ocr_backend().recognize_tsv(mosaic, to_tesseract_lang(lang), psm))
+    except Exception as e:
+        logger.error(f"Mosaic OCR failed: {e}")
+        return [None] * len(images)
+
+    crop_words = assign_words(words, boxes)
+    results = []
+    for crop in crop_words:
+        lines = {} # (block, par, line) -> [(left, top, text), ...]
+        for word in crop:
+            lines.setdefault((word['block'], word['par'], word['line']), []).append(word['rect'][:2] + (word['text'],))
+        ordered = sorted(lines.values(), key=lambda line: (min(t for _, t, _ in line), line[0][0]))
+        text = '\n'.join(' '.join(text for _, _, text in sorted(line)) for line in ordered)
+        results.append((text, mean_confidence(crop)))
+    logger.debug(f"Mosaic {mosaic.size[0]}x{mosaic.size[1]}: {len(images)} crops, {len(words)} words")
+    return results
@@ -0,0 +1,167 @@
+# core/ocr_planner.py
+import os
+import logging
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from core.layout import threshold
+from core.ocr_mosaic import MOSAIC_GAP
+
+# PIL - Lazy loaded
+
+logger = logging.getLogger("OCRPlanner")
+
+STRATEGY_ENV = "FNTRANSLATE_OCR_STRATEGY" # auto | crops | page | mosaic
+
+CROPS = "crops" # One OCR call per padded layout crop, spread over the OCR pool
+PAGE = "page" # One OCR call over the region the crops span
+MOSAIC = "mosaic" # One OCR call over the crops packed into a single image
+STRATEGIES = (CROPS, PAGE, MOSAIC)
+
+# Starting cost estimates per backend: (ms per call, ms per Mpx of crop, ms per Mpx of page).
+# Page (and mosaic) pixels cost more because tesseract runs its own layout analysis on them.
+# Refit on real screens with benchmarks/bench_ocr_strategy.py.
+BACKEND_COSTS = {
+    'pytesseract': (120.0, 300.0, 450.0), # Process spawn, temp files and model load per call
+    'tesserocr': (4.0, 300.0, 450.0), # Engine already loaded, image passed in memory
+}
+
+class OcrPlanner:
+    """
+    Picks per frame between per-crop OCR, one pass over the crops' bounding
+    region, and one pass over a mosaic of the crops. Per-crop OCR pays a fixed
+    cost per call and re-reads overlapping padding but runs in parallel; the
+    region pass pays once, serially, for every pixel in the region, text or not;
+    the mosaic pays once for the crops' pixels plus the gaps between them.
+    All three are estimated from crop count and area.
+    """
+
+    def __init__(self, call_ms: float, crop_ms_per_mpx: float, page_ms_per_mpx: float, workers: int = 1):
+        self.call_ms = call_ms
+        self.crop_ms_per_mpx = crop_ms_per_mpx
+        self.page_ms_per_mpx = page_ms_per_mpx
+        self.workers = max(1, workers)
+        self.forced = os.getenv(STRATEGY_ENV, "auto").lower()
+        if self.forced not in STRATEGIES:
+            self.forced = None
+
+    @classmethod
+    def for_backend(cls, backend_name: str, workers: int = 1) -> "OcrPlanner":
+        return cls(*BACKEND_COSTS.get(backend_name, BACKEND_COSTS['pytesseract']), workers=workers)
+
+    def crops_cost(self, crop_sizes: List[Tuple[int, int]]) -> float:
+        if not crop_sizes:
+            return 0.0
+        mpx = sum(w * h for w, h in crop_sizes) / 1e6
+        serial = len(crop_sizes) * self.call_ms + mpx * self.crop_ms_per_mpx
+        return serial / min(self.workers, len(crop_sizes))
+
+    def page_cost(self, region: Tuple[int, int, int, int]) -> float:
+        return self.call_ms + region[2] * region[3] / 1e6 * self.page_ms_per_mpx
+
+    def mosaic_cost(self, crop_sizes: List[Tuple[int, int]]) -> float:
+        mpx = sum((w + MOSAIC_GAP) * (h + MOSAIC_GAP) for w, h in crop_sizes) / 1e6
+        return self.call_ms + mpx * self.page_ms_per_mpx
+
+    def plan(self, crop_sizes: List[Tuple[int, int]], region: Tuple[int, int, int, int]) -> str:
+        """CROPS, PAGE or MOSAIC for OCRing crops of `crop_sizes` that all lie inside `region` (x, y, w, h)."""
+        if self.forced:
+            return self.forced
+        if len(crop_sizes) < 2:
+            return CROPS
+        costs = {
+            CROPS: self.crops_cost(crop_sizes),
+            PAGE: self.page_cost(region),
+            MOSAIC: self.mosaic_cost(crop_sizes)
+        }
+        strategy = min(costs, key=costs.get)
+        logger.debug(f"{len(crop_sizes)} crops: " + ", ".join(f"{k} ~{v:.0f} ms" for k, v in costs.items())
+                     + f" -> {strategy}")
+        return strategy
+
+def bounding_region(rects, image_size, pad: int = 10) -> Tuple[int, int, int, int]:
+    """Padded (x, y, w, h) spanning all `rects`, clipped to the image."""
+    x1 = max(0, min(r[0] for r in rects) - pad)
+    y1 = max(0, min(r[1] for r in rects) - pad)
+    x2 = min(image_size[0], max(r[0] + r[2] for r in rects) + pad)
+    y2 = min(image_size[1], max(r[1] + r[3] for r in rects) + pad)
+    return (x1, y1, x2 - x1, y2 - y1)
+
+# Per-block preprocessing: x-heights are clamped into the range tesseract reads well.
+# Small UI text is upscaled to the lower bound (accuracy), big headings are shrunk
+# to the upper bound (their extra pixels only cost time).
+MIN_X_HEIGHT = 16
+MAX_X_HEIGHT = 32
+MAX_UPSCALE = 3.0
+
+PSM_BLOCK = 6 # Uniform block of text
+PSM_LINE = 7 # Single text line
+PSM_WORD = 8 # Single word
+
+def text_geometry(gray) -> Dict:
+    """
+    Estimates x-height, line count and (for one line) word count of a grayscale
+    crop from its ink components. x-height is the lower quartile of glyph
+    heights, which skips ascenders, capitals and punctuation.
+    """
+    if gray.mean() < 128: # Light text on a dark background
+        gray = 255 - gray
+    count, _, stats, _ = cv2.connectedComponentsWithStats(threshold(gray), connectivity=8)
+    stats = stats[1:]
+    heights = stats[:, cv2.CC_STAT_HEIGHT]
+    # Drop specks and anything spanning the crop (borders, underlines of the whole box)
+    glyphs = stats[(stats[:, cv2.CC_STAT_AREA] >= 4) & (heights >= 3) & (heights < 0.9 * gray.shape[0])]
+    if not len(glyphs):
+        return {'x_height': 0.0, 'lines': 0, 'words': 0}
+    x_height = float(np.percentile(glyphs[:, cv2.CC_STAT_HEIGHT], 25))
+
+    rows = np.zeros(gray.shape[0] + 1, dtype=np.int32) # Row occupancy via a difference array
+    np.add.at(rows, glyphs[:, cv2.CC_STAT_TOP], 1)
+    np.add.at(rows, glyphs[:, cv2.CC_STAT_TOP] + glyphs[:, cv2.CC_STAT_HEIGHT], -1)
+    occupied = np.concatenate(([False], np.cumsum(rows[:-1]) > 0, [False]))
+    edges = np.flatnonzero(np.diff(occupied.astype(np.int8)))
+    runs = edges[1::2] - edges[::2]
+    lines = max(1, int((runs >= 0.6 * x_height).sum()))
+
+    words = 0
+    if lines == 1:
+        order = np.argsort(glyphs[:, cv2.CC_STAT_LEFT])
+        lefts = glyphs[order, cv2.CC_STAT_LEFT]
+        rights = np.maximum.accumulate(lefts + glyphs[order, cv2.CC_STAT_WIDTH])
+        words = 1 + int((lefts[1:] - rights[:-1] > 0.6 * x_height).sum())
+    return {'x_height': x_height, 'lines': lines, 'words': words}
+
+def plan_block(crop) -> Dict:
+    """
+    OCR settings for one layout crop: the rescale factor that brings its
+    x-height into tesseract's preferred range and a PSM from its geometry
+    (single word, single line or block).
+    """
+    geometry = text_geometry(np.asarray(crop.convert("L")))
+    x_height = geometry['x_height']
+    scale = 1.0
+    if x_height and x_height < MIN_X_HEIGHT:
+        scale = min(MAX_UPSCALE, MIN_X_HEIGHT / x_height)
+    elif x_height > MAX_X_HEIGHT:
+        scale = MAX_X_HEIGHT / x_height
+
+    if geometry['lines'] == 1:
+        psm = PSM_WORD if geometry['words'] == 1 else PSM_LINE
+    else:
+        psm = PSM_BLOCK
+    return {'psm': psm, 'scale': scale, **geometry}
+
+def prepared_size(crop, plan: Dict) -> Tuple[int, int]:
+    """(w, h) prepare_block will give the crop, without resizing it."""
+    if plan['scale'] == 1.0:
+        return crop.size
+    return (max(1, round(crop.width * plan['scale'])), max(1, round(crop.height * plan['scale'])))
+
+def prepare_block(crop, plan: Dict):
+    """The crop resized by the plan's scale (as is when no rescale is needed)."""
+    from PIL import Image
+    if plan['scale'] == 1.0:
+        return crop
+    return crop.resize(prepared_size(crop, plan), Image.Resampling.LANCZOS if plan['scale'] > 1 else Image.Resampling.BOX)
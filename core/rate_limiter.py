@@ -0,0 +1,104 @@
+# core/rate_limiter.py
+import threading
+import time
+import logging
+
+logger = logging.getLogger("RateLimiter")
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting both requests and tokens per minute.
+    Shared by every worker that talks to the translation API so a whole
+    batch stays inside the account quota instead of tripping 429s.
+    """
+
+    def __init__(self, requests_per_minute: int = 60, tokens_per_minute: int = 0):
+        """
+        Args:
+            requests_per_minute: Max API calls per minute (0 = unlimited).
+            tokens_per_minute: Max estimated tokens per minute (0 = unlimited).
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_allowance = float(requests_per_minute)
+        self._token_allowance = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._request_allowance = min(
+                float(self.requests_per_minute),
+                self._request_allowance + elapsed * self.requests_per_minute / 60.0
+            )
+        if self.tokens_per_minute:
+            self._token_allowance = min(
+                float(self.tokens_per_minute),
+                self._token_allowance + elapsed * self.tokens_per_minute / 60.0
+            )
+
+    def acquire(self, tokens: int = 0):
+        """Block until one request (and `tokens` tokens) fit in the budget."""
+        if self.tokens_per_minute:
+            # A single oversized request must still be able to go through
+            tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            with self._lock:
+                self._refill()
+                wait = 0.0
+                if self.requests_per_minute and self._request_allowance < 1:
+                    wait = (1 - self._request_allowance) * 60.0 / self.requests_per_minute
+                if self.tokens_per_minute and self._token_allowance < tokens:
+                    wait = max(wait, (tokens - self._token_allowance) * 60.0 / self.tokens_per_minute)
+
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self._request_allowance -= 1
+                    if self.tokens_per_minute:
+                        self._token_allowance -= tokens
+                    return
+
+            logger.debug(f"Rate limit reached, waiting {wait:.2f}s")
+            time.sleep(wait)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 chars per token) used for budgeting and stats."""
+    return max(1, len(text) // 4) if text else 0
+
+class RateLimitedTranslator:
+    """
+    Wraps a translation service so every call goes through a shared RateLimiter.
+    Also counts requests and estimated tokens for throughput reporting.
+    """
+
+    def __init__(self, translator, rate_limiter: RateLimiter):
+        self.translator = translator
+        self.rate_limiter = rate_limiter
+        self.requests = 0
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def _record(self, source: str, translated: str):
+        with self._lock:
+            self.requests += 1
+            self.tokens += estimate_tokens(source) + estimate_tokens(translated or "")
+
+    def translate(self, text: str, target_lang: str = "English", source_lang: str = "auto", **kwargs) -> str:
+        self.rate_limiter.acquire(estimate_tokens(text) * 2) # prompt + completion
+        translated = self.translator.translate(text=text, target_lang=target_lang, source_lang=source_lang, **kwargs)
+        self._record(text, translated)
+        return translated
+
+    def translate_batch(self, texts, target_lang: str = "English", source_lang: str = "auto", **kwargs):
+        if not hasattr(self.translator, 'translate_batch'):
+            return [self.translate(text, target_lang, source_lang, **kwargs) for text in texts]
+
+        joined = "\n".join(texts)
+        self.rate_limiter.acquire(estimate_tokens(joined) * 2)
+        translated = self.translator.translate_batch(texts, target_lang=target_lang, source_lang=source_lang, **kwargs)
+        self._record(joined, "\n".join(translated))
+        return translated
@@ -1,15 +1,13 @@
 # core/translate_core.py
 import os
+import re
 import time
 import logging
-from typing import Optional
-from openai import OpenAI
+from typing import List, Optional
+
+# from openai import OpenAI - Lazy loaded, the client is only built once a key exists
+# Logging is configured by the entry point (gui/ui.py or cli.py), not on import
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, # Changed to INFO as requested
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger("TranslationService")
 
 class TranslationService:
@@ -26,6 +24,7 @@ class TranslationService:
         """Try to initialize the OpenAI client if key exists."""
         api_key = os.getenv("DEEPSEEK_API_KEY")
         if api_key:
+            from openai import OpenAI
             self.client = OpenAI(
                 api_key=api_key,
                 base_url=os.getenv("DEEPSEEK_API_URL", "https://api.deepseek.com")
@@ -62,6 +61,54 @@ class TranslationService:
             f"{text}"
         )
         
+        return self._complete(prompt, model)
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        target_lang: str = "English",
+        source_lang: str = "auto",
+        model: Optional[str] = None,
+        formal: bool = True
+    ) -> List[str]:
+        """
+        Translate many short segments in one request, keeping their order.
+        Segments are numbered with <<n>> markers so the reply can be split back;
+        raises TranslationError if the model drops or merges a marker.
+        """
+        if len(texts) == 1:
+            return [self.translate(texts[0], target_lang, source_lang, model, formal)]
+
+        if not self.client:
+            self._initialize_client()
+            if not self.client:
+                raise TranslationError("API Key is missing. Please set it in Settings.")
+
+        tone = "formal" if formal else "informal"
+        numbered = "\n".join(f"<<{i + 1}>> {text}" for i, text in enumerate(texts))
+        prompt = (
+            f"Translate the following numbered segments from {source_lang} to {target_lang} "
+            f"in a {tone} tone. The segments are consecutive parts of the same document, "
+            f"so use the surrounding segments as context. Keep every <<n>> marker exactly "
+            f"as given, one per segment and in the same order. "
+            f"Only return the translated segments without additional commentary:\n\n"
+            f"{numbered}"
+        )
+
+        response = self._complete(prompt, model)
+        parts = re.split(r"<<(\d+)>>", response)
+        translated = {}
+        for number, segment in zip(parts[1::2], parts[2::2]):
+            translated[int(number)] = segment.strip()
+
+        if sorted(translated) != list(range(1, len(texts) + 1)):
+            raise TranslationError(
+                f"Batch response returned {len(translated)} of {len(texts)} segments"
+            )
+        return [translated[i + 1] for i in range(len(texts))]
+
+    def _complete(self, prompt: str, model: Optional[str] = None) -> str:
+        """Send a single prompt and return the stripped reply."""
         start_time = time.perf_counter()
         
         try:
@@ -4,6 +4,8 @@ def file_upload_module_js():
     return """
     // File Upload Module JS
     let fileModuleInitialized = false;
+    const SUPPORTED_EXTENSIONS = ['docx', 'txt', 'pdf', 'srt', 'vtt', 'png', 'jpg', 'jpeg'];
+    const UPLOAD_CHUNK_SIZE = 1024 * 1024; // 1 MB slices keep each bridge call small
 
     function setupFileUpload() {
         const uploadArea = document.getElementById('upload-area');
@@ -12,7 +14,7 @@ def file_upload_module_js():
 
         const fileInput = document.createElement('input');
         fileInput.type = 'file';
-        fileInput.accept = '.docx,.txt'; // Remove PDF
+        fileInput.accept = SUPPORTED_EXTENSIONS.map(ext => '.' + ext).join(',');
         fileInput.style.display = 'none';
         document.body.appendChild(fileInput);
 
@@ -45,7 +47,7 @@ def file_upload_module_js():
         uploadArea.addEventListener('click', (e) => {
             // Only trigger if clicking the area itself, not children buttons
             if (e.target.closest('.action-btn')) return;
-            fileInput.click();
+            openNativeDialog();
         });
 
         fileInput.addEventListener('change', () => {
@@ -85,45 +87,76 @@ def file_upload_module_js():
         async function handleFileSelection(file) {
             // Check extension
             const ext = file.name.split('.').pop().toLowerCase();
-            if (ext !== 'docx' && ext !== 'txt') {
-                alert('Only DOCX and TXT files are supported.');
+            if (!SUPPORTED_EXTENSIONS.includes(ext)) {
+                alert('Only DOCX, TXT, PDF, SRT, VTT and PNG/JPEG files are supported.');
                 return;
             }
 
             try {
-                uploadArea.innerHTML = '<div class="loading-spinner"></div><p>Uploading & Processing...</p>';
-                
-                const fileContent = await readFileAsBase64(file);
-                
-                // Upload to temp storage
-                const filePath = await pywebview.api.save_temp_file({
-                    name: file.name,
-                    content: fileContent
+                uploadArea.innerHTML = '<div class="loading-spinner"></div><p id="upload-progress">Uploading... 0%</p>';
+
+                // Stream the file to disk in slices instead of one base64 blob
+                const filePath = await uploadInChunks(file, (sent) => {
+                    const progress = document.getElementById('upload-progress');
+                    if (progress) progress.textContent = `Uploading... ${Math.floor(sent * 100 / Math.max(file.size, 1))}%`;
                 });
-                
-                currentFile = {
+
+                setCurrentFile({
                     name: file.name,
                     path: filePath,
                     size: file.size
-                };
-                
-                translatedFileResult = null;
-                if (saveBtn) saveBtn.disabled = true;
-                
-                renderFileInfo(currentFile);
-                
+                });
+
             } catch (error) {
                 console.error('Upload error:', error);
                 renderError('Upload Failed', error.message);
             }
         }
 
-        function readFileAsBase64(file) {
+        async function openNativeDialog() {
+            // Native dialog hands over the real path: nothing is read or copied
+            try {
+                const selection = await pywebview.api.select_file();
+                if (selection.status === 'success') {
+                    setCurrentFile({ name: selection.name, path: selection.path, size: selection.size });
+                    return;
+                }
+                if (selection.status === 'cancelled') return;
+                console.warn('Native dialog unavailable:', selection.message);
+            } catch (e) {
+                console.warn('Native dialog failed, using browser picker:', e);
+            }
+            fileInput.click();
+        }
+
+        function setCurrentFile(file) {
+            currentFile = file;
+            translatedFileResult = null;
+            if (saveBtn) saveBtn.disabled = true;
+            renderFileInfo(currentFile);
+        }
+
+        async function uploadInChunks(file, onProgress) {
+            const uploadId = await pywebview.api.begin_upload(file.name, file.size);
+            try {
+                for (let offset = 0; offset < file.size; offset += UPLOAD_CHUNK_SIZE) {
+                    const chunk = await readBlobAsBase64(file.slice(offset, offset + UPLOAD_CHUNK_SIZE));
+                    const received = await pywebview.api.append_upload_chunk(uploadId, chunk);
+                    onProgress(received);
+                }
+                return await pywebview.api.finish_upload(uploadId);
+            } catch (error) {
+                pywebview.api.abort_upload(uploadId);
+                throw error;
+            }
+        }
+
+        function readBlobAsBase64(blob) {
             return new Promise((resolve, reject) => {
                 const reader = new FileReader();
-                reader.onload = (e) => resolve(e.target.result.split(',')[1]);
+                reader.onload = (e) => resolve(e.target.result.split(',')[1] || '');
                 reader.onerror = reject;
-                reader.readAsDataURL(file);
+                reader.readAsDataURL(blob);
             });
         }
 
@@ -223,7 +256,7 @@ def file_upload_module_js():
                 <div class="upload-placeholder">
                     <i class="fas fa-file-word fa-3x"></i>
                     <p>Drag & Drop files here or click to upload</p>
-                    <span class="file-types">Supports DOCX, TXT</span>
+                    <span class="file-types">Supports DOCX, TXT, PDF, SRT, VTT, PNG, JPEG</span>
                 </div>
             `;
         }
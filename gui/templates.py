@@ -74,7 +74,7 @@ def get_html_template():
                         <div class="upload-area" id="upload-area">
                             <i class="fas fa-file-word"></i>
                             <h3>Upload File to Translate</h3>
-                            <p>Supported formats: DOCX, TXT (Max file size: 10MB)</p>
+                            <p>Supported formats: DOCX, TXT, PDF, SRT, VTT, PNG, JPEG (Max file size: 10MB)</p>
                         </div>
                     </div>
                 </div>
@@ -230,6 +230,35 @@ def save_temp_file(file_data):
     api, _ = initialize_components()
     return api.save_temp_file(file_data)
 
+def select_file():
+    """Wrapper for the native open dialog (path handover, no upload)"""
+    logger.debug("select_file called")
+    api, _ = initialize_components()
+    return api.select_file()
+
+def begin_upload(file_name, file_size):
+    """Wrapper to start a chunked upload"""
+    logger.debug(f"begin_upload called for {file_name} ({file_size} bytes)")
+    api, _ = initialize_components()
+    return api.begin_upload(file_name, file_size)
+
+def append_upload_chunk(upload_id, chunk):
+    """Wrapper to append one chunk of an upload"""
+    api, _ = initialize_components()
+    return api.append_upload_chunk(upload_id, chunk)
+
+def finish_upload(upload_id):
+    """Wrapper to complete a chunked upload"""
+    logger.debug(f"finish_upload called for {upload_id}")
+    api, _ = initialize_components()
+    return api.finish_upload(upload_id)
+
+def abort_upload(upload_id):
+    """Wrapper to drop a partial upload"""
+    logger.debug(f"abort_upload called for {upload_id}")
+    api, _ = initialize_components()
+    return api.abort_upload(upload_id)
+
 def translate_file(file_path, source_lang, target_lang):
     """Wrapper for file translation"""
     logger.debug(f"translate_file called for {file_path}")
@@ -305,6 +334,11 @@ class FnTranslateUI:
                 is_api_key_set,
                 save_api_key,
                 save_temp_file,
+                select_file,
+                begin_upload,
+                append_upload_chunk,
+                finish_upload,
+                abort_upload,
                 translate_file,
                 download_file,
                 save_translated_file
@@ -1,6 +1,12 @@
 # main.py
-from gui.ui import FnTranslateUI
+import sys
 
 if __name__ == '__main__':
+    # Any arguments mean headless use (see cli.py); the GUI is only imported when needed
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
+
+    from gui.ui import FnTranslateUI
     app = FnTranslateUI()
     app.show()
@@ -0,0 +1,236 @@
+import os
+import glob
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from pathlib import Path
+
+from services.parser import FileParser
+from services.file_handler import FileTranslationHandler, resolve_output_format
+from services.docx_stream import collect_docx_segments, write_translated_docx
+from services.subtitles import SUBTITLE_FORMATS
+from services.image_translator import IMAGE_FORMATS
+from core.rate_limiter import RateLimiter, RateLimitedTranslator
+from core.ocr import to_tesseract_lang
+
+logger = logging.getLogger(__name__)
+
+# --- Process pool entry points (must be module level to be picklable) ---
+
+def _parse_file(file_path: str, ocr_lang: str) -> Dict:
+    # Already inside a pool worker, so PDFs are extracted in-process
+    return FileParser(pdf_workers=1).extract_text(file_path, ocr_lang=ocr_lang)
+
+def _write_file(file_path: str, translated_text: str, target_format: str) -> str:
+    return FileTranslationHandler._create_output(Path(file_path), translated_text, target_format)
+
+def _write_docx_in_place(file_path: str, layout: Dict, translations: List[str]) -> str:
+    path = Path(file_path)
+    return write_translated_docx(file_path, str(path.with_name(f"{path.stem}_translated.docx")), layout, translations)
+
+
+class BatchTranslationHandler:
+    """
+    Translates every supported file in a folder (or glob) in one run.
+    Parsing and writing run in a process pool (python-docx is CPU bound),
+    while all chunks from all files share one rate-limited translation pool.
+    """
+
+    def __init__(self, translation_service, file_handler: Optional[FileTranslationHandler] = None,
+                 max_processes: Optional[int] = None, max_translation_workers: int = 8,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Args:
+            translation_service: An object with a .translate(text, src_lang, tgt_lang) method.
+            file_handler: Optional, reused for chunking, formats and the file cache.
+                Its translator should already be a RateLimitedTranslator.
+            max_processes: Parser/writer processes (defaults to CPU count).
+            max_translation_workers: Concurrent API requests across all files.
+            rate_limiter: Optional shared limiter (defaults to 60 requests/min).
+        """
+        self.rate_limiter = rate_limiter or RateLimiter(requests_per_minute=60)
+        self.translator = RateLimitedTranslator(translation_service, self.rate_limiter)
+        self.file_handler = file_handler or FileTranslationHandler(self.translator)
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self.max_translation_workers = max_translation_workers
+        logger.info(
+            f"Batch handler initialized ({self.max_processes} processes, "
+            f"{self.max_translation_workers} translation workers)"
+        )
+
+    def collect_files(self, source: str) -> List[Path]:
+        """Expands a directory or glob pattern into the list of supported files."""
+        if os.path.isdir(source):
+            candidates = [str(p) for p in Path(source).iterdir()]
+        else:
+            candidates = glob.glob(source, recursive=True)
+
+        files = []
+        for candidate in sorted(candidates):
+            path = Path(candidate)
+            if not path.is_file() or path.stem.endswith('_translated'):
+                continue
+            if path.suffix.lower() in self.file_handler.supported_formats:
+                files.append(path)
+        return files
+
+    def process_batch(self, source: str, source_lang: str, target_lang: str,
+                      output_format: Optional[str] = None, preserve_format: bool = True) -> Dict:
+        """
+        Translates all files matched by `source`.
+        With preserve_format, DOCX -> DOCX is translated inside the original
+        package (styles, tables, headers and images kept), as in single-file mode.
+        Returns per-file results plus aggregate throughput stats.
+        """
+        files = self.collect_files(source)
+        if not files:
+            return {'status': 'error', 'message': f"No supported files found in {source}", 'results': []}
+
+        logger.info(f"Batch translation started for {len(files)} files")
+        start_time = time.perf_counter()
+        results = []
+        pending = {} # file -> {'chunks': [...], 'remaining': n, 'is_ocr': ...} ('layout' for in-place DOCX)
+        chunk_futures = {}
+        write_futures = {}
+        file_futures = {}
+        requests_before = self.translator.requests
+        tokens_before = self.translator.tokens
+
+        with ProcessPoolExecutor(max_workers=self.max_processes) as process_pool, \
+             ThreadPoolExecutor(max_workers=self.max_translation_workers) as translate_pool:
+
+            # Step 0: Skip files already in the file cache
+            parse_futures = {}
+            images = []
+            for path in files:
+                cached_file = self.file_handler.db.get_cached_file(
+                    str(path), target_lang, resolve_output_format(path.suffix.lower(), output_format), preserve_format)
+                if cached_file:
+                    results.append({'status': 'success', 'original_file': str(path),
+                                    'translated_file': cached_file, 'cached': True})
+                    continue
+                if path.suffix.lower() in SUBTITLE_FORMATS:
+                    # Cue batching needs the whole file; run it as one job on the shared pool
+                    fut = translate_pool.submit(self.file_handler.process_uploaded_file,
+                                                str(path), source_lang, target_lang, output_format, preserve_format)
+                    file_futures[fut] = path
+                    continue
+                if path.suffix.lower() in IMAGE_FORMATS:
+                    images.append(path)
+                    continue
+                if preserve_format and path.suffix.lower() == '.docx' and (output_format or 'docx') == 'docx':
+                    fut = process_pool.submit(collect_docx_segments, str(path))
+                else:
+                    fut = process_pool.submit(_parse_file, str(path), to_tesseract_lang(source_lang))
+                parse_futures[fut] = path
+
+            # Images: OCR/render in the same process pool, driven from one pool thread
+            image_job = None
+            if images:
+                image_job = translate_pool.submit(self.file_handler._translate_images,
+                                                  images, source_lang, target_lang, process_pool)
+
+            # Step 1: Parse in parallel, feeding chunks to the shared pool as files finish
+            for future in as_completed(parse_futures):
+                path = parse_futures[future]
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    logger.error(f"Parsing failed for {path}: {e}")
+                    results.append({'status': 'error', 'file': path.name, 'message': str(e)})
+                    continue
+
+                if isinstance(parsed, tuple):
+                    # In-place DOCX: all segments go out as one job so batching keeps their context
+                    segments, layout = parsed
+                    if not segments:
+                        results.append({'status': 'error', 'file': path.name,
+                                        'message': "No text could be extracted from the file."})
+                        continue
+                    pending[path] = {'layout': layout, 'remaining': 1, 'is_ocr': False}
+                    fut = translate_pool.submit(self.file_handler._translate_segments, segments, source_lang, target_lang)
+                    chunk_futures[fut] = (path, None)
+                    logger.debug(f"Queued {len(segments)} DOCX segments from {path.name}")
+                    continue
+
+                chunks = self.file_handler._split_into_chunks(parsed['text'])
+                pending[path] = {'chunks': [None] * len(chunks), 'remaining': len(chunks),
+                                 'is_ocr': parsed.get('is_ocr', False)}
+                for i, chunk in enumerate(chunks):
+                    fut = translate_pool.submit(self.file_handler._translate_chunk, chunk, source_lang, target_lang, i)
+                    chunk_futures[fut] = (path, i)
+                logger.debug(f"Queued {len(chunks)} chunks from {path.name}")
+
+            # Step 2: Hand each file to a writer process once its last chunk is back
+            for future in as_completed(chunk_futures):
+                path, i = chunk_futures[future]
+                state = pending[path]
+                if i is None:
+                    try:
+                        translations = future.result()
+                    except Exception as e:
+                        logger.error(f"Translating {path} failed: {e}")
+                        results.append({'status': 'error', 'file': path.name, 'message': str(e)})
+                        continue
+                    fut = process_pool.submit(_write_docx_in_place, str(path), state['layout'], translations)
+                    write_futures[fut] = path
+                    continue
+
+                state['chunks'][i] = future.result() # _translate_chunk never raises
+                state['remaining'] -= 1
+
+                if state['remaining'] == 0:
+                    fmt = resolve_output_format(path.suffix.lower(), output_format)
+                    text = "\n\n".join(state['chunks'])
+                    write_futures[process_pool.submit(_write_file, str(path), text, fmt)] = path
+
+            # Step 3: Collect outputs and populate the file cache
+            for future in as_completed(write_futures):
+                path = write_futures[future]
+                try:
+                    output_file = future.result()
+                    self.file_handler.db.cache_file_translation(
+                        str(path), output_file, source_lang, target_lang,
+                        resolve_output_format(path.suffix.lower(), output_format), preserve_format)
+                    results.append({'status': 'success', 'original_file': str(path),
+                                    'translated_file': output_file, 'used_ocr': pending[path]['is_ocr']})
+                except Exception as e:
+                    logger.error(f"Writing output failed for {path}: {e}")
+                    results.append({'status': 'error', 'file': path.name, 'message': str(e)})
+
+            for future in as_completed(file_futures):
+                result = future.result() # process_uploaded_file reports errors in the dict
+                if result['status'] == 'success':
+                    results.append({'status': 'success', 'original_file': result['original_file'],
+                                    'translated_file': result['translated_file']})
+                else:
+                    results.append(result)
+
+            if image_job:
+                for result in image_job.result():
+                    if result['status'] == 'success':
+                        ext = Path(result['original_file']).suffix.lower()
+                        self.file_handler.db.cache_file_translation(result['original_file'], result['translated_file'],
+                                                                    source_lang, target_lang,
+                                                                    resolve_output_format(ext), preserve_format)
+                    results.append(result)
+
+        total_chunks = self.translator.requests - requests_before
+        total_tokens = self.translator.tokens - tokens_before
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            'files': len(files),
+            'succeeded': sum(1 for r in results if r['status'] == 'success'),
+            'failed': sum(1 for r in results if r['status'] == 'error'),
+            'chunks': total_chunks,
+            'tokens': total_tokens,
+            'elapsed_seconds': round(elapsed, 3),
+            'chunks_per_second': round(total_chunks / elapsed, 2) if elapsed else 0.0,
+            'tokens_per_second': round(total_tokens / elapsed, 2) if elapsed else 0.0,
+        }
+        logger.info(
+            f"Batch finished: {stats['succeeded']}/{stats['files']} files, "
+            f"{stats['chunks_per_second']} chunks/s, {stats['tokens_per_second']} tokens/s"
+        )
+        return {'status': 'success', 'results': results, 'stats': stats}
@@ -0,0 +1,327 @@
+import re
+import shutil
+import zipfile
+import logging
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+from html import escape # xml.sax.saxutils would pull in urllib at import
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+W_P = f"{{{W_NS}}}p"
+W_T = f"{{{W_NS}}}t"
+W_TAB = f"{{{W_NS}}}tab"
+W_BR = f"{{{W_NS}}}br"
+W_CR = f"{{{W_NS}}}cr"
+W_BODY = f"{{{W_NS}}}body"
+MC_FALLBACK = f"{{{MC_NS}}}Fallback"
+
+HEADER_PART = re.compile(r"^word/header\d*\.xml$")
+FOOTER_PART = re.compile(r"^word/footer\d*\.xml$")
+DOCUMENT_PART = "word/document.xml"
+
+# Characters that are not allowed in XML 1.0 documents
+INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+PACKAGE_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def get_text_parts(zf: zipfile.ZipFile) -> List[str]:
+    """Returns the XML parts holding visible text: headers, body, footers."""
+    names = zf.namelist()
+    headers = sorted(n for n in names if HEADER_PART.match(n))
+    footers = sorted(n for n in names if FOOTER_PART.match(n))
+    body = [DOCUMENT_PART] if DOCUMENT_PART in names else []
+    return headers + body + footers
+
+
+def iter_part_paragraphs(stream) -> Iterator[str]:
+    """
+    Iterparses one WordprocessingML part and yields the text of each paragraph.
+    Table cells are plain w:p elements, so they come out in reading order.
+    Finished elements are cleared as we go so memory stays bounded.
+    """
+    open_paragraphs = []  # Text runs of every w:p we are inside (text boxes nest)
+    fallback_depth = 0    # Inside mc:Fallback, which duplicates mc:Choice content
+    container = None
+    depth = 0
+    container_depth = 0
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            depth += 1
+            if container is None and (depth == 1 and tag != f"{{{W_NS}}}document" or tag == W_BODY):
+                # w:body for the document, the root for headers/footers
+                container = elem
+                container_depth = depth
+            elif tag == W_P:
+                open_paragraphs.append([])
+            elif tag == MC_FALLBACK:
+                fallback_depth += 1
+            continue
+
+        # "end" event
+        depth -= 1
+        if fallback_depth and tag != MC_FALLBACK:
+            pass
+        elif tag == W_T and open_paragraphs:
+            if elem.text:
+                open_paragraphs[-1].append(elem.text)
+        elif tag == W_TAB and open_paragraphs:
+            open_paragraphs[-1].append("\t")
+        elif tag in (W_BR, W_CR) and open_paragraphs:
+            open_paragraphs[-1].append("\n")
+
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+        elif tag == W_P and open_paragraphs:
+            text = "".join(open_paragraphs.pop())
+            if text.strip():
+                yield text
+
+        # Drop finished top-level blocks (paragraphs, tables) from the tree
+        if container is not None and depth == container_depth:
+            container.clear()
+
+
+def iter_docx_paragraphs(path: str) -> Iterator[str]:
+    """Lazily yields paragraph text from headers, body (incl. tables) and footers."""
+    with zipfile.ZipFile(path) as zf:
+        for part in get_text_parts(zf):
+            logger.debug(f"Streaming paragraphs from {part}")
+            with zf.open(part) as stream:
+                yield from iter_part_paragraphs(stream)
+
+
+# =========================================================
+#  STREAMING WRITER (New documents)
+# =========================================================
+
+class DocxStreamWriter:
+    """
+    Writes a minimal DOCX whose document.xml is streamed into the zip one
+    paragraph at a time, so memory use does not grow with the document.
+
+        with DocxStreamWriter(path) as writer:
+            for paragraph in paragraphs:
+                writer.add_paragraph(paragraph)
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.paragraph_count = 0
+        self._zip = zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED)
+        # Everything else must be written before document.xml is opened for streaming
+        self._zip.writestr("[Content_Types].xml", CONTENT_TYPES_XML)
+        self._zip.writestr("_rels/.rels", PACKAGE_RELS_XML)
+        self._document = self._zip.open(DOCUMENT_PART, "w", force_zip64=True)
+        self._document.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<w:document xmlns:w="' + W_NS.encode() + b'"><w:body>'
+        )
+
+    def add_paragraph(self, text: str):
+        """Appends one paragraph; \\n becomes a line break and \\t a tab, as in python-docx."""
+        runs = []
+        for i, line in enumerate(INVALID_XML_CHARS.sub("", text).split("\n")):
+            if i:
+                runs.append("<w:br/>")
+            for j, piece in enumerate(line.split("\t")):
+                if j:
+                    runs.append("<w:tab/>")
+                if piece:
+                    runs.append(f'<w:t xml:space="preserve">{escape(piece, quote=False)}</w:t>')
+        self._document.write(f"<w:p><w:r>{''.join(runs)}</w:r></w:p>".encode("utf-8"))
+        self.paragraph_count += 1
+
+    def close(self):
+        if self._document is None:
+            return
+        self._document.write(b"<w:sectPr/></w:body></w:document>")
+        self._document.close()
+        self._document = None
+        self._zip.close()
+        logger.info(f"Streamed {self.paragraph_count} paragraphs to {self.output_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# =========================================================
+#  IN-PLACE TRANSLATION (Rewrite only w:t nodes)
+# =========================================================
+
+TAG_PREFIX = re.compile(rb"<([\w.-]+:)?t[\s/>]")
+ZIP64_THRESHOLD = 1 << 30
+
+
+def _collect_part_segments(stream) -> List[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    Single expat pass over one part. For every paragraph with text returns
+    (text, [(t_start, t_end_tag_start), ...]) with byte offsets of its w:t nodes.
+    """
+    parser = expat.ParserCreate(namespace_separator=" ")
+    w_p, w_t = f"{W_NS} p", f"{W_NS} t"
+    mc_fallback = f"{MC_NS} Fallback"
+    paragraphs = []
+    open_paragraphs = []  # [(texts, spans)] for each w:p we are inside
+    state = {'t_start': None, 't_text': [], 'fallback': 0}
+
+    def start(name, attrs):
+        if name == mc_fallback:
+            state['fallback'] += 1
+        elif name == w_p:
+            open_paragraphs.append(([], []))
+        elif name == w_t and open_paragraphs and not state['fallback']:
+            state['t_start'] = parser.CurrentByteIndex
+            state['t_text'] = []
+
+    def chars(data):
+        if state['t_start'] is not None:
+            state['t_text'].append(data)
+
+    def end(name):
+        if name == mc_fallback:
+            state['fallback'] -= 1
+        elif name == w_t and state['t_start'] is not None:
+            texts, spans = open_paragraphs[-1]
+            texts.append("".join(state['t_text']))
+            spans.append((state['t_start'], parser.CurrentByteIndex))
+            state['t_start'] = None
+        elif name == w_p and open_paragraphs:
+            texts, spans = open_paragraphs.pop()
+            text = "".join(texts)
+            if text.strip():
+                paragraphs.append((text, spans))
+
+    parser.StartElementHandler = start
+    parser.CharacterDataHandler = chars
+    parser.EndElementHandler = end
+    parser.ParseFile(stream)
+    return paragraphs
+
+
+def collect_docx_segments(path: str) -> Tuple[List[str], Dict[str, List[List[Tuple[int, int]]]]]:
+    """
+    Collects translatable paragraph/table-cell text from body, headers and footers.
+    Returns the segment texts plus, per part, the w:t byte spans of each segment
+    (in the same order) so write_translated_docx can patch them later.
+    """
+    segments = []
+    layout = {}
+    with zipfile.ZipFile(path) as zf:
+        for part in get_text_parts(zf):
+            with zf.open(part) as stream:
+                paragraphs = _collect_part_segments(stream)
+            layout[part] = [spans for _, spans in paragraphs]
+            segments.extend(text for text, _ in paragraphs)
+    return segments, layout
+
+
+def _splice_part(src, dst, edits: List[Tuple[int, int, str]], chunk_size: int = 1 << 20):
+    """
+    Streams `src` to `dst`, replacing each w:t element in `edits` (sorted by offset).
+    Text is escaped here; None means "empty the node".
+    """
+    buf = b""
+    base = 0  # Absolute offset of buf[0]
+
+    def fill(upto: int) -> bool:
+        nonlocal buf
+        while base + len(buf) <= upto:
+            data = src.read(chunk_size)
+            if not data:
+                return False
+            buf += data
+        return True
+
+    for start, end_tag_start, text in edits:
+        fill(start + 64) # Enough to read the tag prefix
+        dst.write(buf[:start - base])
+        buf = buf[start - base:]
+        base = start
+
+        match = TAG_PREFIX.match(buf)
+        prefix = match.group(1).decode() if match and match.group(1) else ""
+
+        # Skip past the closing '>' of </w:t> (or of <w:t/> when it is empty)
+        fill(end_tag_start)
+        close = buf.find(b">", end_tag_start - base)
+        while close == -1 and fill(base + len(buf)):
+            close = buf.find(b">", end_tag_start - base)
+        buf = buf[close + 1:]
+        base += close + 1
+
+        if text:
+            text = escape(INVALID_XML_CHARS.sub("", text), quote=False)
+            dst.write(f'<{prefix}t xml:space="preserve">{text}</{prefix}t>'.encode("utf-8"))
+        else:
+            dst.write(f"<{prefix}t/>".encode("utf-8"))
+
+    dst.write(buf)
+    shutil.copyfileobj(src, dst, chunk_size)
+
+
+def write_translated_docx(path: str, output_path: str,
+                          layout: Dict[str, List[List[Tuple[int, int]]]],
+                          translations: List[str]) -> str:
+    """
+    Streams the original package to `output_path`, copying every part untouched
+    except the w:t nodes of translated paragraphs. Each paragraph's translation
+    goes into its first text node and the remaining nodes are emptied, so run,
+    paragraph and table formatting, images and sections all survive.
+    """
+    # Segments were collected part by part in layout order; split them back up
+    translations = iter(translations)
+    part_translations = {
+        part: [next(translations) for _ in paragraphs] for part, paragraphs in layout.items()
+    }
+
+    with zipfile.ZipFile(path) as zin, \
+         zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            out_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+            out_info.compress_type = zipfile.ZIP_DEFLATED
+            out_info.external_attr = info.external_attr
+
+            # Translations can grow a part, so allow zip64 well before the 2 GB limit
+            force_zip64 = info.file_size > ZIP64_THRESHOLD
+            with zin.open(info) as src, zout.open(out_info, "w", force_zip64=force_zip64) as dst:
+                if info.filename not in layout:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                    continue
+
+                edits = []
+                for spans, text in zip(layout[info.filename], part_translations[info.filename]):
+                    edits.append((spans[0][0], spans[0][1], text))
+                    edits.extend((start, end, None) for start, end in spans[1:])
+                edits.sort(key=lambda edit: edit[0])
+                _splice_part(src, dst, edits)
+
+    logger.info(f"In-place DOCX written to {output_path}")
+    return output_path
@@ -1,15 +1,29 @@
 import os
-import tempfile
+import itertools
 import logging
-from typing import Dict, Optional, List
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Dict, Optional, List, Iterable, Iterator
 from pathlib import Path
 
 # Import our own modules cleanly
 from services.parser import FileParser
+from services.docx_stream import DocxStreamWriter, collect_docx_segments, write_translated_docx
+from services.subtitles import SUBTITLE_FORMATS, parse_subtitles, write_subtitles
+from services.image_translator import IMAGE_FORMATS, ocr_image_file, render_translated_image, write_sidecar
 from core.dbmanager import get_db_manager
+from core.ocr import to_tesseract_lang
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_FORMATS = ['.docx', '.txt', '.pdf'] + SUBTITLE_FORMATS + IMAGE_FORMATS
+
+
+def resolve_output_format(ext: str, output_format: Optional[str] = None) -> str:
+    """The format a file is written in: PDFs come back as DOCX, images as themselves."""
+    if ext in IMAGE_FORMATS:
+        return ext.lstrip('.')
+    return output_format or ('docx' if ext == '.pdf' else ext.lstrip('.'))
+
 class FileTranslationHandler:
     """Handles the complete file translation workflow from upload to output."""
 
@@ -22,13 +36,18 @@ class FileTranslationHandler:
         self.parser = parser or FileParser()
         self.translator = translation_service
         self.db = get_db_manager()
-        self.supported_formats = ['.docx', '.txt']
+        self.supported_formats = list(SUPPORTED_FORMATS)
         self.CHUNK_SIZE = 3000  # Conservative char limit per chunk (adjust based on API limits)
         logger.info("File translation handler initialized")
 
-    def process_uploaded_file(self, file_path: str, source_lang: str, target_lang: str, output_format: Optional[str] = None) -> Dict:
+    def process_uploaded_file(self, file_path: str, source_lang: str, target_lang: str,
+                              output_format: Optional[str] = None, preserve_format: bool = True,
+                              output_dir: Optional[str] = None) -> Dict:
         """
         Complete processing pipeline with chunking support.
+        With preserve_format, DOCX -> DOCX is translated in place so styles,
+        tables and images of the original survive.
+        Outputs go next to the original unless `output_dir` is given.
         """
         try:
             # Validate input
@@ -38,14 +57,12 @@ class FileTranslationHandler:
 
             ext = file_path.suffix.lower()
             if ext not in self.supported_formats:
-                raise ValueError(f"Unsupported file type: {ext}. Only DOCX and TXT are supported.")
+                raise ValueError(f"Unsupported file type: {ext}. Only DOCX, TXT, PDF, SRT, VTT and PNG/JPEG are supported.")
 
-            # Determine output format if not specified
-            if output_format is None:
-                output_format = ext.lstrip('.')
+            output_format = resolve_output_format(ext, output_format)
 
             # Step 0: Check Cache
-            cached_file = self.db.get_cached_file(str(file_path), target_lang)
+            cached_file = self.db.get_cached_file(str(file_path), target_lang, output_format, preserve_format)
             if cached_file:
                 logger.info(f"Returning cached translation for {file_path}")
                 return {
@@ -61,31 +78,39 @@ class FileTranslationHandler:
                     }
                 }
 
-            # Step 1: Parse/Extract text
-            parsed_data = self.parser.extract_text(str(file_path))
-            full_text = parsed_data['text']
-            
-            if not full_text.strip():
-                raise ValueError("No text could be extracted from the file.")
-
-            logger.info(f"Extracted {len(full_text)} chars from {file_path}")
-
-            # Step 2: Translate content (using Chunking)
-            translated_text = self._chunk_and_translate(
-                text=full_text,
-                source_lang=source_lang,
-                target_lang=target_lang
-            )
-
-            # Step 3: Convert to Output
-            output_file = self._create_output(
-                original_path=file_path,
-                translated_text=translated_text,
-                target_format=output_format
-            )
+            parse_info = {'is_ocr': False}
+            extra_metadata = {}
+            if ext in IMAGE_FORMATS:
+                image_result = self._translate_images([file_path], source_lang, target_lang, output_dir=output_dir)[0]
+                if image_result['status'] != 'success':
+                    raise RuntimeError(image_result['message'])
+                output_file = image_result['translated_file']
+                extra_metadata['sidecar_file'] = image_result['sidecar_file']
+                parse_info['is_ocr'] = True
+            elif preserve_format and ext == '.docx' and output_format == 'docx':
+                output_file = self._translate_docx_in_place(file_path, source_lang, target_lang, output_dir)
+            elif ext in SUBTITLE_FORMATS and output_format == ext.lstrip('.'):
+                output_file = self._translate_subtitles(file_path, source_lang, target_lang, output_dir)
+            else:
+                # Steps 1-3: parser -> chunker -> translator -> writer, one chunk at a time
+                paragraphs = self.parser.iter_paragraphs(
+                    str(file_path), info=parse_info, ocr_lang=to_tesseract_lang(source_lang)
+                )
+                translated_chunks = self._iter_translated_chunks(
+                    paragraphs,
+                    source_lang=source_lang,
+                    target_lang=target_lang
+                )
+                output_file = self._write_output_stream(
+                    original_path=file_path,
+                    translated_chunks=translated_chunks,
+                    target_format=output_format,
+                    output_dir=output_dir
+                )
 
             # Step 4: Cache Result
-            self.db.cache_file_translation(str(file_path), output_file, source_lang, target_lang)
+            self.db.cache_file_translation(str(file_path), output_file, source_lang, target_lang,
+                                           output_format, preserve_format)
 
             return {
                 'status': 'success',
@@ -94,9 +119,10 @@ class FileTranslationHandler:
                 'metadata': {
                     'original_format': ext,
                     'output_format': Path(output_file).suffix,
-                    'used_ocr': parsed_data.get('is_ocr', False),
+                    'used_ocr': parse_info['is_ocr'],
                     'source_lang': source_lang,
-                    'target_lang': target_lang
+                    'target_lang': target_lang,
+                    **extra_metadata
                 }
             }
 
@@ -110,32 +136,54 @@ class FileTranslationHandler:
 
     def _chunk_and_translate(self, text: str, source_lang: str, target_lang: str) -> str:
         """Splits text into chunks, translates them, and rejoins them."""
-        
-        # 1. Split by paragraphs to preserve structure
+        chunks = self._split_into_chunks(text)
+        logger.info(f"Split document into {len(chunks)} chunks for translation.")
+
+        # Translate each chunk
+        translated_chunks = []
+        for i, chunk in enumerate(chunks):
+            if not chunk.strip():
+                continue
+            logger.debug(f"Translating chunk {i+1}/{len(chunks)} ({len(chunk)} chars)")
+            translated_chunks.append(self._translate_chunk(chunk, source_lang, target_lang, index=i))
+
+        final_text = "\n\n".join(translated_chunks)
+        if not final_text.strip():
+            logger.error("Final translated text is empty!")
+            return text # Fallback to original text if everything failed
+            
+        return final_text
+
+    def _split_into_chunks(self, text: str) -> List[str]:
+        """Groups paragraphs into chunks of at most CHUNK_SIZE chars."""
+        # Split by paragraphs to preserve structure
         # We also look for \r\n vs \n
         text = text.replace('\r\n', '\n')
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        
-        chunks = []
+        return list(self._iter_chunks(p.strip() for p in text.split('\n\n')))
+
+    def _iter_chunks(self, paragraphs: Iterable[str]) -> Iterator[str]:
+        """Lazily groups a stream of paragraphs into chunks of at most CHUNK_SIZE chars."""
         current_chunk = []
         current_length = 0
 
-        # 2. Group paragraphs into chunks
         for para in paragraphs:
+            if not para:
+                continue
+
             if len(para) > self.CHUNK_SIZE:
                 # If current chunk has data, save it first
                 if current_chunk:
-                    chunks.append("\n\n".join(current_chunk))
+                    yield "\n\n".join(current_chunk)
                     current_chunk = []
                     current_length = 0
                 
                 # Split large paragraph into smaller sentences or parts if possible
                 # For now, just add it (API might handle it or we should refine this)
-                chunks.append(para)
+                yield para
                 continue
 
-            if current_length + len(para) + 2 > self.CHUNK_SIZE:
-                chunks.append("\n\n".join(current_chunk))
+            if current_chunk and current_length + len(para) + 2 > self.CHUNK_SIZE:
+                yield "\n\n".join(current_chunk)
                 current_chunk = [para]
                 current_length = len(para)
             else:
@@ -144,81 +192,240 @@ class FileTranslationHandler:
         
         # Add the final chunk
         if current_chunk:
-            chunks.append("\n\n".join(current_chunk))
+            yield "\n\n".join(current_chunk)
 
-        logger.info(f"Split document into {len(chunks)} chunks for translation.")
+    def _iter_translated_chunks(self, paragraphs: Iterable[str], source_lang: str, target_lang: str) -> Iterator[str]:
+        """Chunks and translates a lazily produced paragraph stream, yielding as it goes."""
+        chunks = self._iter_chunks(paragraphs)
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError("No text could be extracted from the file.")
 
-        # 3. Translate each chunk
-        translated_chunks = []
-        for i, chunk in enumerate(chunks):
-            if not chunk.strip():
+        total_chars = 0
+        count = 0
+        for i, chunk in enumerate(itertools.chain([first], chunks)):
+            total_chars += len(chunk)
+            count += 1
+            logger.debug(f"Translating chunk {i+1} ({len(chunk)} chars)")
+            yield self._translate_chunk(chunk, source_lang, target_lang, index=i)
+
+        logger.info(f"Translated {total_chars} chars in {count} chunks.")
+
+    def _translate_chunk(self, chunk: str, source_lang: str, target_lang: str, index: int = 0) -> str:
+        """Translates a single chunk, falling back to the original text on failure."""
+        try:
+            # IMPORTANT: ensure translate accepts source/target in this order
+            translated_part = self.translator.translate(
+                text=chunk,
+                source_lang=source_lang,
+                target_lang=target_lang
+            )
+            if translated_part:
+                return translated_part
+            logger.warning(f"Empty translation for chunk {index+1}, using original")
+        except Exception as e:
+            logger.error(f"Failed to translate chunk {index+1}: {e}")
+        return chunk # Fallback: keep original text
+
+    def _translate_segments(self, segments: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """Translates many short segments (paragraphs, cells, cues) keeping their order."""
+        return list(self._iter_translated_segments(segments, source_lang, target_lang))
+
+    def _iter_translated_segments(self, segments: List[str], source_lang: str, target_lang: str) -> Iterator[str]:
+        """
+        Yields translations of `segments` in order, one batch at a time.
+        Cached segments are reused; the rest are grouped into consecutive
+        CHUNK_SIZE batches (so each request keeps its context) and sent
+        through the translator's batch API when it has one.
+        """
+        translate_batch = getattr(self.translator, 'translate_batch', None)
+        batch_start = 0
+        results: Dict[int, str] = {}
+        misses: List[int] = []
+        miss_length = 0
+        cache_hits = 0
+
+        def flush(end: int) -> Iterator[str]:
+            nonlocal batch_start, misses, miss_length
+            texts = [segments[i] for i in misses]
+            translated = None
+            if translate_batch and len(texts) > 1:
+                try:
+                    translated = translate_batch(texts, target_lang=target_lang, source_lang=source_lang)
+                except Exception as e:
+                    logger.warning(f"Batch of {len(texts)} segments failed ({e}), translating one by one")
+            if translated is None:
+                translated = [self._translate_chunk(text, source_lang, target_lang, index=i)
+                              for i, text in zip(misses, texts)]
+
+            for i, text, result in zip(misses, texts, translated):
+                results[i] = result or text
+                if result and result != text:
+                    self.db.cache_text_translation(text, source_lang, target_lang, result)
+
+            for i in range(batch_start, end):
+                yield results.pop(i)
+            batch_start, misses, miss_length = end, [], 0
+
+        for i, segment in enumerate(segments):
+            cached = self.db.get_cached_text(segment, source_lang, target_lang)
+            if cached:
+                results[i] = cached
+                cache_hits += 1
                 continue
-            
-            logger.debug(f"Translating chunk {i+1}/{len(chunks)} ({len(chunk)} chars)")
-            try:
-                # IMPORTANT: ensure translate accepts source/target in this order
-                translated_part = self.translator.translate(
-                    text=chunk,
-                    source_lang=source_lang,
-                    target_lang=target_lang
-                )
-                if translated_part:
-                    translated_chunks.append(translated_part)
-                else:
-                    logger.warning(f"Empty translation for chunk {i+1}, using original")
-                    translated_chunks.append(chunk)
-            except Exception as e:
-                logger.error(f"Failed to translate chunk {i+1}: {e}")
-                translated_chunks.append(chunk) # Fallback: keep original text
 
-        final_text = "\n\n".join(translated_chunks)
-        if not final_text.strip():
-            logger.error("Final translated text is empty!")
-            return text # Fallback to original text if everything failed
-            
-        return final_text
+            if misses and miss_length + len(segment) > self.CHUNK_SIZE:
+                yield from flush(i)
+            misses.append(i)
+            miss_length += len(segment) + 8 # Marker overhead
+
+        yield from flush(len(segments))
+        logger.info(f"{cache_hits}/{len(segments)} segments served from cache.")
 
-    def _create_output(self, original_path: Path, translated_text: str, target_format: str) -> str:
+    def _translate_docx_in_place(self, original_path: Path, source_lang: str, target_lang: str,
+                                 output_dir: Optional[str] = None) -> str:
+        """Translates paragraph and table-cell text inside the original DOCX package."""
+        segments, layout = collect_docx_segments(str(original_path))
+        if not segments:
+            raise ValueError("No text could be extracted from the file.")
+
+        logger.info(f"Collected {len(segments)} segments from {original_path.name}")
+        translations = self._translate_segments(segments, source_lang, target_lang)
+
+        output_path = self._get_output_path(original_path, '.docx', output_dir)
+        return write_translated_docx(str(original_path), output_path, layout, translations)
+
+    def _translate_subtitles(self, original_path: Path, source_lang: str, target_lang: str,
+                             output_dir: Optional[str] = None) -> str:
+        """Translates SRT/VTT cues in context batches, keeping ids and timecodes exactly."""
+        blocks = parse_subtitles(str(original_path))
+        cues = [block for block in blocks if 'raw' not in block]
+        texts = [cue['text'] for cue in cues if cue['text'].strip()]
+        if not texts:
+            raise ValueError("No subtitle text could be extracted from the file.")
+
+        logger.info(f"Parsed {len(cues)} cues from {original_path.name}")
+        translated = self._iter_translated_segments(texts, source_lang, target_lang)
+
+        # Cues without text keep their (empty) original; the writer pulls lazily
+        translations = (next(translated) if cue['text'].strip() else None for cue in cues)
+        output_path = self._get_output_path(original_path, original_path.suffix.lower(), output_dir)
+        return write_subtitles(output_path, blocks, translations)
+
+    def _translate_images(self, paths: List[Path], source_lang: str, target_lang: str,
+                          executor: Optional[Executor] = None, output_dir: Optional[str] = None) -> List[Dict]:
+        """
+        Screenshot/scan translation: layout + OCR and overlay rendering run in a
+        process pool, block texts are batch-translated here as each image finishes.
+        Produces <stem>_translated.<ext> plus a <stem>_translated.txt sidecar per image.
+        """
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1))
+
+        ocr_lang = to_tesseract_lang(source_lang)
+        results = []
+        try:
+            ocr_futures = {executor.submit(ocr_image_file, str(path), ocr_lang): Path(path) for path in paths}
+            render_futures = {}
+            for future in as_completed(ocr_futures):
+                path = ocr_futures[future]
+                try:
+                    ocr = future.result()
+                    blocks = ocr['blocks']
+                    if not blocks:
+                        raise ValueError("No text could be recognized in the image.")
+                    logger.info(f"Recognized {len(blocks)} text blocks in {path.name} "
+                                f"({ocr['rejected']} noise blocks skipped)")
+
+                    translations = self._translate_segments([b['text'] for b in blocks], source_lang, target_lang)
+                    for block, translated in zip(blocks, translations):
+                        block['translated'] = translated
+
+                    sidecar = write_sidecar(blocks, self._get_output_path(path, '.txt', output_dir))
+                    output_path = self._get_output_path(path, path.suffix.lower(), output_dir)
+                    render_futures[executor.submit(render_translated_image, str(path), blocks, output_path)] = (path, sidecar)
+                except Exception as e:
+                    logger.error(f"Image translation failed for {path}: {e}")
+                    results.append({'status': 'error', 'file': path.name, 'message': str(e)})
+
+            for future in as_completed(render_futures):
+                path, sidecar = render_futures[future]
+                try:
+                    results.append({'status': 'success', 'original_file': str(path),
+                                    'translated_file': future.result(), 'sidecar_file': sidecar})
+                except Exception as e:
+                    logger.error(f"Rendering failed for {path}: {e}")
+                    results.append({'status': 'error', 'file': path.name, 'message': str(e)})
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        return results
+
+    def _write_output_stream(self, original_path: Path, translated_chunks: Iterator[str], target_format: str,
+                             output_dir: Optional[str] = None) -> str:
+        """Writes translated chunks to the output file as they arrive (DOCX or TXT)."""
+        output_path = self._get_output_path(original_path, target_format, output_dir)
+        # Pull the first chunk before creating the file so parse errors leave nothing behind
+        first = next(translated_chunks)
+        chunks = itertools.chain([first], translated_chunks)
+
+        if target_format == 'docx':
+            with DocxStreamWriter(output_path) as writer:
+                for chunk in chunks:
+                    for paragraph in chunk.split('\n\n'):
+                        if paragraph.strip():
+                            writer.add_paragraph(paragraph.strip())
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                for i, chunk in enumerate(chunks):
+                    f.write(chunk if i == 0 else f"\n\n{chunk}")
+
+        logger.info(f"Output written to {output_path}")
+        return output_path
+
+    @staticmethod
+    def _create_output(original_path: Path, translated_text: str, target_format: str,
+                       output_dir: Optional[str] = None) -> str:
         """Creates the output file in the requested format (DOCX or TXT)."""
-        output_path = str(original_path.with_name(f"{original_path.stem}_translated.{target_format}"))
+        # Static so batch mode can run it inside worker processes
+        output_path = FileTranslationHandler._get_output_path(original_path, target_format, output_dir)
         
         if target_format == 'docx':
-            return self._create_simple_docx(translated_text, output_path)
+            return FileTranslationHandler._create_simple_docx(translated_text, output_path)
         else:
-            return self._save_text_file(translated_text, output_path)
+            return FileTranslationHandler._save_text_file(translated_text, output_path)
 
-    def _create_simple_docx(self, text: str, output_path: str) -> str:
+    @staticmethod
+    def _create_simple_docx(text: str, output_path: str) -> str:
         """Creates a DOCX file."""
         logger.info(f"Starting DOCX creation at {output_path} with {len(text)} characters.")
         try:
-            from docx import Document
-            doc = Document()
-            
-            # Simple paragraph split and add
-            for paragraph in text.split('\n\n'):
-                if paragraph.strip():
-                    doc.add_paragraph(paragraph.strip())
+            with DocxStreamWriter(output_path) as writer:
+                # Simple paragraph split and add
+                for paragraph in text.split('\n\n'):
+                    if paragraph.strip():
+                        writer.add_paragraph(paragraph.strip())
             
-            doc.save(output_path)
             logger.info(f"DOCX creation successful: {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"DOCX creation failed: {e}", exc_info=True)
-            return self._save_text_file(text, output_path.replace('.docx', '.txt'))
+            return FileTranslationHandler._save_text_file(text, output_path.replace('.docx', '.txt'))
 
-    def _save_text_file(self, text: str, output_path: str) -> str:
+    @staticmethod
+    def _save_text_file(text: str, output_path: str) -> str:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(text)
         return output_path
 
-    def _get_output_path(self, original_path: Path, ext: str) -> str:
-        """Generates output path in system temp directory with correct extension."""
+    @staticmethod
+    def _get_output_path(original_path: Path, ext: str, output_dir: Optional[str] = None) -> str:
+        """<stem>_translated<ext>, next to the original or in `output_dir`."""
         if not ext.startswith('.'):
             ext = f".{ext}"
-        return str(
-            Path(tempfile.gettempdir()) /
-            f"{original_path.stem}_translated{ext}"
-        )
+        return str(Path(output_dir or original_path.parent) / f"{original_path.stem}_translated{ext}")
 
     def cleanup(self, file_path: str):
         try:
@@ -0,0 +1,107 @@
+import logging
+import textwrap
+from typing import Dict, List
+
+# PIL, numpy (core.layout) and the OCR backend - Lazy loaded, only needed once an image is processed
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FORMATS = [".png", ".jpg", ".jpeg"]
+
+# Same look as the live OverlayWindow
+MAX_FONT_SIZE = 22
+MIN_FONT_SIZE = 7
+FONT_CANDIDATES = ["arialbd.ttf", "arial.ttf", "DejaVuSans-Bold.ttf", "DejaVuSans.ttf"]
+
+# --- Process pool entry points (must be module level to be picklable) ---
+
+def ocr_image_file(path: str, ocr_lang: str) -> Dict:
+    """
+    Runs the live layout + OCR engine on an image file. Returns text blocks with
+    rects; noise blocks are dropped and counted in 'rejected'.
+    """
+    from PIL import Image
+    from core.layout import get_layout_boxes
+    from core.ocr import ocr_image_data
+    from core.ocr_filter import OcrQualityFilter
+    from core.ocr_planner import plan_block, prepare_block
+
+    with Image.open(path) as img:
+        image = img.convert("RGB")
+
+    blocks = []
+    for item in get_layout_boxes(image):
+        try:
+            plan = plan_block(item['crop'])
+            text, conf = ocr_image_data(prepare_block(item['crop'], plan), lang=ocr_lang, psm=plan['psm'])
+        except Exception as e:
+            logger.error(f"OCR failed for block {item['rect']} in {path}: {e}")
+            continue
+        if text.strip():
+            blocks.append({'text': text.strip(), 'conf': conf, 'rect': item['rect']})
+
+    ocr_filter = OcrQualityFilter()
+    blocks = ocr_filter.filter(blocks)
+
+    # Reading order: top to bottom, then left to right
+    blocks.sort(key=lambda b: (b['rect'][1], b['rect'][0]))
+    return {'path': path, 'size': image.size, 'blocks': blocks, 'rejected': ocr_filter.rejected}
+
+
+def _load_font(size: int):
+    from PIL import ImageFont
+    for name in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def _fit_text(draw, text: str, w: int, h: int):
+    """Shrinks the font until the word-wrapped text fits the block, like OverlayWindow."""
+    padding = 12
+    for size in range(MAX_FONT_SIZE, MIN_FONT_SIZE - 1, -1):
+        font = _load_font(size)
+        avg_char = max(1, draw.textlength("x", font=font))
+        wrapped = "\n".join(textwrap.wrap(text, width=max(1, int((w - 2 * padding) / avg_char))))
+        left, top, right, bottom = draw.multiline_textbbox((0, 0), wrapped, font=font, align="center")
+        if right - left <= w - 2 * padding and bottom - top <= h - 2 * padding:
+            break
+    return font, wrapped
+
+
+def render_translated_image(path: str, blocks: List[Dict], output_path: str) -> str:
+    """Draws each block's translation over its source region and saves the result."""
+    from PIL import Image, ImageDraw
+
+    with Image.open(path) as img:
+        base = img.convert("RGBA")
+
+    overlay = Image.new("RGBA", base.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    for block in blocks:
+        text = block.get('translated') or block['text']
+        x, y, w, h = block['rect']
+        if not text.strip() or w < 15 or h < 15:
+            continue
+
+        font, wrapped = _fit_text(draw, text, w, h)
+        # Unlike the live overlay, cover the whole block so the source text is hidden
+        draw.rounded_rectangle([x, y, x + w, y + h], radius=4,
+                               fill=(0, 0, 0, 255), outline=(255, 255, 255, 60))
+        draw.multiline_text((x + w // 2, y + h // 2), wrapped, font=font,
+                            fill=(255, 255, 255, 255), anchor="mm", align="center")
+
+    result = Image.alpha_composite(base, overlay)
+    if output_path.lower().endswith((".jpg", ".jpeg")):
+        result = result.convert("RGB")
+    result.save(output_path)
+    return output_path
+
+
+def write_sidecar(blocks: List[Dict], output_path: str) -> str:
+    """Writes the translated blocks (reading order) as plain text next to the image."""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write("\n\n".join(block.get('translated') or block['text'] for block in blocks))
+    return output_path
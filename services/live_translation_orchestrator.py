@@ -163,13 +163,18 @@ class OverlayWindow(QWidget):
         self.last_update_time = 0
         self.show()
 
-    def update_translations(self, translations):
+    @staticmethod
+    def drop_noise(translations):
         # Filter out "noise" (tiny blocks)
         filtered = []
         for text, rect in translations:
             if rect[2] < 15 or rect[3] < 15: # Discard blocks smaller than 15x15
                 continue
             filtered.append((text, rect))
+        return filtered
+
+    def update_translations(self, translations):
+        filtered = self.drop_noise(translations)
             
         if self.translations == filtered:
             return
@@ -178,6 +183,16 @@ class OverlayWindow(QWidget):
         self.last_update_time = time.time()
         self.update()
 
+    def merge_translations(self, translations, replaced):
+        # Incremental update: the worker says which shown blocks the new ones replace
+        filtered = self.drop_noise(translations)
+        if not filtered and not replaced:
+            return
+
+        self.translations = [entry for entry in self.translations if entry not in replaced] + filtered
+        self.last_update_time = time.time()
+        self.update()
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -293,6 +308,7 @@ class LiveTranslationProcess(multiprocessing.Process):
         
         worker = TranslationWorker(monitor, self.source_lang, self.target_lang, logger, self.stop_event)
         worker.result_ready.connect(overlay.update_translations)
+        worker.result_merged.connect(overlay.merge_translations)
         
         # We no longer connect request_hide to overlay visibility.
         # The overlay stays visible for a smooth experience.
@@ -1,15 +1,22 @@
-from typing import Dict, Union
+from typing import Dict, Iterator, Optional, Union
 import os
 import logging
-from docx import Document
+from services.docx_stream import iter_docx_paragraphs
+from services.subtitles import SUBTITLE_FORMATS, iter_subtitle_blocks
+from services.pdf_extractor import iter_pdf_paragraphs
 
 logger = logging.getLogger("FileParser")
 
 class FileParser:
-    def __init__(self):
-        self.supported_formats = [".docx", ".txt"]
+    def __init__(self, pdf_workers: Optional[int] = None):
+        """
+        Args:
+            pdf_workers: Processes used for PDF page extraction (None = CPU count, 1 = in-process).
+        """
+        self.supported_formats = [".docx", ".txt", ".pdf"] + SUBTITLE_FORMATS
+        self.pdf_workers = pdf_workers
 
-    def extract_text(self, file_path: str) -> Dict[str, Union[str, bool]]:
+    def extract_text(self, file_path: str, ocr_lang: str = "eng") -> Dict[str, Union[str, bool]]:
         """Extract text from a file.
         Returns:
             {
@@ -25,11 +32,14 @@ class FileParser:
         if ext not in self.supported_formats:
             raise ValueError(f"Unsupported file format: {ext}")
 
+        info = {'is_ocr': False}
         try:
             if ext == ".docx":
                 text = self._extract_docx(file_path)
             elif ext == ".txt":
                 text = self._extract_txt(file_path)
+            elif ext in SUBTITLE_FORMATS or ext == ".pdf":
+                text = "\n\n".join(self.iter_paragraphs(file_path, info=info, ocr_lang=ocr_lang))
             else:
                  raise ValueError("Unsupported format")
 
@@ -38,19 +48,44 @@ class FileParser:
             
             return {
                 "text": text,
-                "is_ocr": False,
-                "format_preserved": True
+                "is_ocr": info['is_ocr'],
+                "format_preserved": ext != ".pdf"
             }
 
         except Exception as e:
             logger.error(f"Parsing failed for {ext}: {e}")
             raise RuntimeError(f"Parsing failed: {e}")
 
+    def iter_paragraphs(self, file_path: str, info: Optional[Dict] = None, ocr_lang: str = "eng") -> Iterator[str]:
+        """
+        Lazily yield non-empty paragraphs, so large files never sit in memory whole.
+        If given, `info['is_ocr']` is set once any scanned PDF page had to be OCR'd.
+        """
+        if not os.path.exists(file_path):
+            raise ValueError("File not found.")
+
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext == ".docx":
+            yield from iter_docx_paragraphs(file_path)
+        elif ext == ".txt":
+            text = self._extract_txt(file_path).replace('\r\n', '\n')
+            for para in text.split('\n\n'):
+                if para.strip():
+                    yield para.strip()
+        elif ext in SUBTITLE_FORMATS:
+            # Cue text only; ids and timecodes are not translatable content
+            for block in iter_subtitle_blocks(file_path):
+                if block.get('text', '').strip():
+                    yield block['text']
+        elif ext == ".pdf":
+            yield from iter_pdf_paragraphs(file_path, ocr_lang=ocr_lang, max_workers=self.pdf_workers, info=info)
+        else:
+            raise ValueError(f"Unsupported file format: {ext}")
+
     def _extract_docx(self, path: str) -> str:
-        """Extract text from DOCX file using python-docx."""
-        doc = Document(path)
+        """Extract text from DOCX file by streaming its XML parts."""
         # Use paragraphs to preserve basic structure with double newlines
-        return "\n\n".join([p.text for p in doc.paragraphs if p.text.strip()])
+        return "\n\n".join(iter_docx_paragraphs(path))
 
     def _extract_txt(self, path: str) -> str:
         """Extract text from TXT file."""
@@ -0,0 +1,127 @@
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# import pymupdf - Lazy loaded, only needed for PDFs
+
+logger = logging.getLogger(__name__)
+
+OCR_DPI = 300
+MIN_TEXT_CHARS = 20 # Fewer chars than this on a page with images -> treat as scanned
+
+# Per-worker cache of open documents so each pool process opens a file once
+_open_documents = {}
+
+
+def _import_pymupdf():
+    try:
+        import pymupdf
+        return pymupdf
+    except ImportError:
+        pass
+    try:
+        import fitz # PyMuPDF < 1.24.3
+        return fitz
+    except ImportError as e:
+        raise RuntimeError("PDF support requires PyMuPDF (pip install PyMuPDF)") from e
+
+
+def _open_pdf(path: str):
+    fitz = _import_pymupdf()
+    doc = _open_documents.get(path)
+    if doc is None:
+        doc = fitz.open(path)
+        _open_documents[path] = doc
+    return doc
+
+
+def get_page_count(path: str) -> int:
+    fitz = _import_pymupdf()
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def _ocr_page(page, ocr_lang: str) -> List[str]:
+    """Rasterizes a page without a text layer and runs it through tesseract."""
+    from PIL import Image
+    from core.ocr import ocr_image
+    fitz = _import_pymupdf()
+
+    pix = page.get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY, alpha=False)
+    image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    text = ocr_image(image, lang=ocr_lang, psm=3) # psm 3: full page layout analysis
+    return [p.strip() for p in text.replace('\r\n', '\n').split('\n\n') if p.strip()]
+
+
+def extract_page(path: str, page_number: int, ocr_lang: str = "eng") -> Tuple[int, List[str], bool]:
+    """Pool worker entry point: returns (page_number, paragraphs, used_ocr)."""
+    return _extract_page(_open_pdf(path), path, page_number, ocr_lang)
+
+
+def _extract_page(doc, path: str, page_number: int, ocr_lang: str) -> Tuple[int, List[str], bool]:
+    """
+    Text-layer blocks become paragraphs; pages with no usable text layer
+    but with images are rasterized and OCR'd.
+    """
+    page = doc.load_page(page_number)
+
+    paragraphs = []
+    for block in page.get_text("blocks"):
+        # (x0, y0, x1, y1, text, block_no, block_type); type 1 is an image
+        if block[6] != 0:
+            continue
+        text = " ".join(line.strip() for line in block[4].splitlines() if line.strip())
+        if text:
+            paragraphs.append(text)
+
+    if sum(len(p) for p in paragraphs) < MIN_TEXT_CHARS and page.get_images(full=False):
+        try:
+            return page_number, _ocr_page(page, ocr_lang), True
+        except Exception as e:
+            logger.error(f"OCR failed for page {page_number + 1} of {path}: {e}")
+
+    return page_number, paragraphs, False
+
+
+def iter_pdf_paragraphs(path: str, ocr_lang: str = "eng", max_workers: Optional[int] = None,
+                        info: Optional[Dict] = None) -> Iterator[str]:
+    """
+    Extracts pages across a process pool and yields their paragraphs in page
+    order as soon as each page (and every page before it) has finished.
+    `info['is_ocr']` / `info['ocr_pages']` are filled in as scanned pages show up.
+    """
+    page_count = get_page_count(path)
+    max_workers = max_workers or os.cpu_count() or 1
+    info = info if info is not None else {}
+    info.setdefault('is_ocr', False)
+    info.setdefault('ocr_pages', 0)
+    logger.info(f"Extracting {page_count} PDF pages with {max_workers} workers")
+    if page_count == 0:
+        return
+
+    def record(used_ocr: bool):
+        if used_ocr:
+            info['is_ocr'] = True
+            info['ocr_pages'] += 1
+
+    if max_workers == 1 or page_count == 1:
+        with _import_pymupdf().open(path) as doc:
+            for n in range(page_count):
+                _, paragraphs, used_ocr = _extract_page(doc, path, n, ocr_lang)
+                record(used_ocr)
+                yield from paragraphs
+        return
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, page_count)) as pool:
+        futures = [pool.submit(extract_page, path, n, ocr_lang) for n in range(page_count)]
+        finished = {}
+        next_page = 0
+        for future in as_completed(futures):
+            page_number, paragraphs, used_ocr = future.result()
+            record(used_ocr)
+            finished[page_number] = paragraphs
+            # Release every page that is now contiguous with what we already yielded
+            while next_page in finished:
+                yield from finished.pop(next_page)
+                next_page += 1
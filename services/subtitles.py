@@ -0,0 +1,82 @@
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SUBTITLE_FORMATS = [".srt", ".vtt"]
+TIMING_ARROW = "-->"
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    """Yields lines without line endings; UTF-8 (with or without BOM), fallback latin-1."""
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            for line in f:
+                yield line.rstrip('\r\n')
+    except UnicodeDecodeError:
+        with open(path, 'r', encoding='latin-1') as f:
+            for line in f:
+                yield line.rstrip('\r\n')
+
+
+def _iter_raw_blocks(path: str) -> Iterator[List[str]]:
+    block = []
+    for line in _read_lines(path):
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def iter_subtitle_blocks(path: str) -> Iterator[Dict]:
+    """
+    Parses an SRT or WebVTT file into blocks.
+    Cues come out as {'id': str|None, 'timing': str, 'text': str}; the id and
+    timing lines are kept byte-for-byte. Anything else (the WEBVTT header,
+    NOTE, STYLE and REGION blocks) comes out as {'raw': str} and is written back unchanged.
+    """
+    for lines in _iter_raw_blocks(path):
+        # The timing line is the first line, or the second when the cue has an id
+        timing_index = next((i for i, line in enumerate(lines[:2]) if TIMING_ARROW in line), None)
+        if timing_index is None or lines[0].startswith(("NOTE", "STYLE", "REGION", "WEBVTT")):
+            yield {'raw': "\n".join(lines)}
+            continue
+
+        yield {
+            'id': lines[0] if timing_index == 1 else None,
+            'timing': lines[timing_index],
+            'text': "\n".join(lines[timing_index + 1:]),
+        }
+
+
+def parse_subtitles(path: str) -> List[Dict]:
+    """Returns every block of the file (see iter_subtitle_blocks)."""
+    return list(iter_subtitle_blocks(path))
+
+
+def write_subtitles(output_path: str, blocks: List[Dict], translations: Iterable[Optional[str]]) -> str:
+    """
+    Streams blocks back out, substituting each cue's text with the next item of
+    `translations` as it becomes available (None keeps the original text).
+    """
+    translations = iter(translations)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for i, block in enumerate(blocks):
+            if i:
+                f.write("\n\n")
+            if 'raw' in block:
+                f.write(block['raw'])
+                continue
+
+            text = next(translations) or block['text']
+            if block['id'] is not None:
+                f.write(f"{block['id']}\n")
+            # Blank lines would end the cue early, so squeeze them out of the translation
+            text = "\n".join(line for line in text.split("\n") if line.strip())
+            f.write(f"{block['timing']}\n{text}")
+        f.write("\n")
+    logger.info(f"Subtitles written to {output_path}")
+    return output_path
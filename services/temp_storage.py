@@ -0,0 +1,246 @@
+import os
+import uuid
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = int(os.getenv("FNTRANSLATE_TEMP_MAX_MB", "512")) * 1024 * 1024
+SESSION_PREFIX = "session-"
+LOCK_FILE = ".lock"
+HASH_BLOCK = 1024 * 1024
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if os.name == 'nt':
+        # os.kill(pid, 0) would terminate the process on Windows
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TempStorageManager:
+    """
+    Owns every upload and output of a session under one directory.
+    Keeps the total size under a byte cap by evicting the least recently
+    used files, dedupes identical uploads (same name and content hash) and sweeps
+    directories left behind by sessions that crashed.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            root: Parent directory shared by all sessions (default: <tmp>/FnTranslate).
+            max_bytes: Size cap for the files this session owns (0 = unlimited).
+        """
+        self.root = root or os.path.join(tempfile.gettempdir(), "FnTranslate")
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+        self.sweep_orphans()
+
+        self.session_dir = os.path.join(self.root, f"{SESSION_PREFIX}{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        os.makedirs(self.session_dir)
+        with open(os.path.join(self.session_dir, LOCK_FILE), 'w') as f:
+            f.write(str(os.getpid()))
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict() # id -> entry, oldest first
+        self._by_digest: Dict[str, str] = {}
+        self._by_path: Dict[str, str] = {}
+        self._pending: Dict[str, str] = {} # upload id -> path, not yet committed
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        logger.info(f"Temp storage at {self.session_dir} (cap {max_bytes} bytes)")
+
+    def sweep_orphans(self) -> int:
+        """Removes session directories whose owning process is gone. Returns how many."""
+        removed = 0
+        for name in os.listdir(self.root):
+            session_dir = os.path.join(self.root, name)
+            if not name.startswith(SESSION_PREFIX) or not os.path.isdir(session_dir):
+                continue
+            try:
+                with open(os.path.join(session_dir, LOCK_FILE)) as f:
+                    pid = int(f.read().strip() or 0)
+            except (OSError, ValueError):
+                pid = 0
+            if _pid_alive(pid):
+                continue
+            shutil.rmtree(session_dir, ignore_errors=True)
+            removed += 1
+        if removed:
+            logger.info(f"Swept {removed} orphaned temp sessions")
+        return removed
+
+    # --- Uploads ---
+
+    def new_upload(self, file_name: str) -> Tuple[str, str]:
+        """Reserves a unique path for an incoming file. Returns (upload_id, path)."""
+        upload_id = uuid.uuid4().hex
+        upload_dir = os.path.join(self.session_dir, upload_id)
+        os.makedirs(upload_dir)
+        path = os.path.join(upload_dir, os.path.basename(file_name) or 'uploaded_file')
+        open(path, 'wb').close()
+        with self._lock:
+            self._pending[upload_id] = path
+        return upload_id, path
+
+    def commit_upload(self, upload_id: str) -> str:
+        """
+        Registers a finished upload. If the same content was uploaded before
+        under the same file name, the new copy is dropped and the existing path
+        is returned instead. The name is part of the key because the path's
+        suffix picks the handler and its stem names the output.
+        """
+        with self._lock:
+            path = self._pending.pop(upload_id)
+        digest = f"{_file_digest(path)}:{os.path.basename(path)}"
+
+        with self._lock:
+            existing_id = self._by_digest.get(digest)
+            if existing_id and os.path.exists(self._entries[existing_id]['path']):
+                self._entries.move_to_end(existing_id)
+                existing_path = self._entries[existing_id]['path']
+                self._remove_file(path)
+                logger.debug(f"Upload {upload_id} deduplicated to {existing_path}")
+                return existing_path
+
+            self._add_entry(upload_id, path, 'upload', digest)
+        return path
+
+    def discard_upload(self, upload_id: str):
+        """Drops an upload that was never committed."""
+        with self._lock:
+            path = self._pending.pop(upload_id, None)
+        if path:
+            self._remove_file(path)
+
+    def store_bytes(self, file_name: str, data: bytes) -> str:
+        """Writes a complete upload in one go and registers it."""
+        upload_id, path = self.new_upload(file_name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return self.commit_upload(upload_id)
+
+    # --- Outputs ---
+
+    def new_output_dir(self) -> str:
+        """
+        Reserves a fresh directory for one translation's outputs. Deduped
+        uploads share a path, so a shared output dir would let a later job
+        overwrite the file an earlier one (and the file cache) points at.
+        """
+        path = os.path.join(self.session_dir, uuid.uuid4().hex)
+        os.makedirs(path) # Eviction removes it once empty
+        return path
+
+    def release_output_dir(self, path: str):
+        """Removes an output directory the job left empty (cache hit or failure)."""
+        if self._owns(path) and os.path.isdir(path) and not os.listdir(path):
+            os.rmdir(path)
+
+    def register(self, path: str, kind: str = 'output') -> str:
+        """
+        Tracks a file produced for this session and returns its id.
+        Files outside the session directory are only referenced, never deleted.
+        """
+        with self._lock:
+            entry_id = self._by_path.get(path)
+            if entry_id:
+                self._entries.move_to_end(entry_id)
+                return entry_id
+            entry_id = uuid.uuid4().hex
+            self._add_entry(entry_id, path, kind)
+            return entry_id
+
+    def get_path(self, entry_id: str) -> Optional[str]:
+        """Returns the path for an id (marking it recently used), or None if evicted."""
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(entry_id)
+            return entry['path']
+
+    def touch(self, path: str):
+        """Marks a file as recently used so it survives eviction."""
+        with self._lock:
+            entry_id = self._by_path.get(path)
+            if entry_id:
+                self._entries.move_to_end(entry_id)
+
+    def cleanup(self):
+        """Deletes everything this session owns."""
+        with self._lock:
+            self._entries.clear()
+            self._by_digest.clear()
+            self._by_path.clear()
+            self._pending.clear()
+            self.total_bytes = 0
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+
+    # --- Internals (call with the lock held) ---
+
+    def _owns(self, path: str) -> bool:
+        return os.path.abspath(path).startswith(os.path.abspath(self.session_dir) + os.sep)
+
+    def _add_entry(self, entry_id: str, path: str, kind: str, digest: Optional[str] = None):
+        size = os.path.getsize(path) if self._owns(path) and os.path.exists(path) else 0
+        self._entries[entry_id] = {'path': path, 'kind': kind, 'size': size, 'digest': digest}
+        self._by_path[path] = entry_id
+        if digest:
+            self._by_digest[digest] = entry_id
+        self.total_bytes += size
+        self._evict(keep=entry_id)
+
+    def _evict(self, keep: str):
+        if not self.max_bytes:
+            return
+        for entry_id in list(self._entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if entry_id == keep or not self._entries[entry_id]['size']:
+                continue
+            entry = self._entries.pop(entry_id)
+            self._by_path.pop(entry['path'], None)
+            if entry['digest']:
+                self._by_digest.pop(entry['digest'], None)
+            self.total_bytes -= entry['size']
+            self._remove_file(entry['path'])
+            logger.debug(f"Evicted {entry['kind']} {entry['path']} ({entry['size']} bytes)")
+
+    def _remove_file(self, path: str):
+        if not self._owns(path):
+            return
+        try:
+            os.remove(path)
+            parent = os.path.dirname(path)
+            if parent != self.session_dir and not os.listdir(parent):
+                os.rmdir(parent)
+        except OSError as e:
+            logger.warning(f"Could not delete temp file {path}: {e}")
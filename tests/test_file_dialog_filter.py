@@ -0,0 +1,23 @@
+# tests/test_file_dialog_filter.py
+import os
+import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from api.api import file_dialog_filter
+from services.file_handler import SUPPORTED_FORMATS
+
+# webview.util.parse_file_type (pywebview 6.x); create_file_dialog raises ValueError on anything else
+PYWEBVIEW_FILE_FILTER = r'^([\w ]+)\((\*(?:\.(?:\w+|\*))*(?:;\*(?:\.(?:\w+|\*))*)*)\)$'
+
+
+def test_filter_is_accepted_by_pywebview():
+    file_type = file_dialog_filter("Supported files", SUPPORTED_FORMATS)
+    match = re.search(PYWEBVIEW_FILE_FILTER, file_type)
+    assert match
+    assert match.group(2).split(';') == [f"*{ext}" for ext in SUPPORTED_FORMATS]
+
+
+def test_space_separated_filter_is_rejected():
+    assert not re.search(PYWEBVIEW_FILE_FILTER, "Supported files (*.txt *.docx)")